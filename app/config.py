@@ -12,6 +12,11 @@ class Config:
     WHATSAPP_APP_ID: str = os.getenv("WHATSAPP_APP_ID", "")
     WHATSAPP_APP_SECRET: str = os.getenv("WHATSAPP_APP_SECRET", "")
     WHATSAPP_API_VERSION: str = os.getenv("WHATSAPP_API_VERSION", "v21.0")
+    # Point at scripts/loadtest/fake_graph_api.py for load tests
+    WHATSAPP_GRAPH_API_BASE: str = os.getenv("WHATSAPP_GRAPH_API_BASE", "https://graph.facebook.com")
+    # When set, raw webhook bodies are appended here (JSON lines) for replay by scripts/loadtest
+    WEBHOOK_RECORD_PATH: str = os.getenv("WEBHOOK_RECORD_PATH", "")
+    CHANNEL_DEDUP_PRUNE_SECONDS: float = float(os.getenv("CHANNEL_DEDUP_PRUNE_SECONDS", "3600"))
 
     # Postgres
     # Cloud SQL: set CLOUD_SQL_CONNECTION_NAME (e.g. project:region:instance) for Unix socket
@@ -23,6 +28,31 @@ class Config:
     POSTGRES_PASSWORD: str = os.getenv("POSTGRES_PASSWORD", "Tomokilam3!")
     POSTGRES_DB_NAME: str = os.getenv("POSTGRES_DB_NAME", "postgres")
     SQL_COMMAND_ECHO: bool = os.getenv("SQL_COMMAND_ECHO", "false").lower() == "true"
+    POSTGRES_POOL_SIZE: int = int(os.getenv("POSTGRES_POOL_SIZE", "15"))
+    POSTGRES_MAX_OVERFLOW: int = int(os.getenv("POSTGRES_MAX_OVERFLOW", "5"))
+    # Sessions each workload may hold on the primary at once (0 = no cap). The pipeline is guaranteed
+    # whatever dashboard + background + writer leave of POSTGRES_POOL_SIZE + POSTGRES_MAX_OVERFLOW.
+    DB_BULKHEAD_PIPELINE: int = int(os.getenv("DB_BULKHEAD_PIPELINE", "0"))
+    DB_BULKHEAD_DASHBOARD: int = int(os.getenv("DB_BULKHEAD_DASHBOARD", "6"))
+    DB_BULKHEAD_BACKGROUND: int = int(os.getenv("DB_BULKHEAD_BACKGROUND", "4"))
+    # One per BufferedWriter (tool executions, LLM calls, turn traces); each flushes one batch at a time
+    DB_BULKHEAD_WRITER: int = int(os.getenv("DB_BULKHEAD_WRITER", "3"))
+    DB_BULKHEAD_TIMEOUT_SECONDS: float = float(os.getenv("DB_BULKHEAD_TIMEOUT_SECONDS", "5"))
+    # Optional read replica for dashboards and analytics: a host, or a /cloudsql/... socket directory.
+    # Reads fall back to the primary while the replica is more than POSTGRES_READ_MAX_LAG_SECONDS behind.
+    POSTGRES_READ_HOST: str = os.getenv("POSTGRES_READ_HOST", "")
+    POSTGRES_READ_PORT: int = int(os.getenv("POSTGRES_READ_PORT", os.getenv("POSTGRES_PORT", "5432")))
+    POSTGRES_READ_POOL_SIZE: int = int(os.getenv("POSTGRES_READ_POOL_SIZE", "10"))
+    POSTGRES_READ_MAX_OVERFLOW: int = int(os.getenv("POSTGRES_READ_MAX_OVERFLOW", "5"))
+    POSTGRES_READ_MAX_LAG_SECONDS: float = float(os.getenv("POSTGRES_READ_MAX_LAG_SECONDS", "30"))
+    POSTGRES_READ_LAG_CHECK_SECONDS: float = float(os.getenv("POSTGRES_READ_LAG_CHECK_SECONDS", "5"))
+    # messages / tool_executions are partitioned by month; retention 0 keeps every month
+    PARTITION_MAINTENANCE_SECONDS: float = float(os.getenv("PARTITION_MAINTENANCE_SECONDS", "3600"))
+    PARTITION_PREMAKE_MONTHS: int = int(os.getenv("PARTITION_PREMAKE_MONTHS", "2"))
+    MESSAGES_RETENTION_MONTHS: int = int(os.getenv("MESSAGES_RETENTION_MONTHS", "0"))
+    TOOL_EXECUTIONS_RETENTION_MONTHS: int = int(os.getenv("TOOL_EXECUTIONS_RETENTION_MONTHS", "0"))
+    # When set, expired partitions are written here as <partition>.csv.gz before being dropped
+    PARTITION_ARCHIVE_DIR: str = os.getenv("PARTITION_ARCHIVE_DIR", "")
 
     # Auth
     AUTH_SYNC_SECRET: str = os.getenv("AUTH_SYNC_SECRET", "HELLO")
@@ -32,3 +62,39 @@ class Config:
     OPENROUTER_API_KEY: str = os.getenv("OPENROUTER_API_KEY", "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")
     OPENROUTER_BASE_URL: str = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
     OPENROUTER_DEFAULT_MODEL: str = os.getenv("OPENROUTER_DEFAULT_MODEL", "openai/gpt-4o-mini")
+
+    # Bookings
+    BOOKING_COMPLETION_SWEEP_SECONDS: float = float(os.getenv("BOOKING_COMPLETION_SWEEP_SECONDS", "300"))
+
+    # Analytics
+    ANALYTICS_ROLLUP_ENABLED: bool = os.getenv("ANALYTICS_ROLLUP_ENABLED", "true").lower() == "true"
+    ANALYTICS_ROLLUP_SWEEP_SECONDS: float = float(os.getenv("ANALYTICS_ROLLUP_SWEEP_SECONDS", "60"))
+    ANALYTICS_ROLLUP_OVERLAP_SECONDS: float = float(os.getenv("ANALYTICS_ROLLUP_OVERLAP_SECONDS", "600"))
+    ANALYTICS_CACHE_TTL_SECONDS: float = float(os.getenv("ANALYTICS_CACHE_TTL_SECONDS", "30"))
+    ANALYTICS_CACHE_STALE_SECONDS: float = float(os.getenv("ANALYTICS_CACHE_STALE_SECONDS", "300"))
+    ANALYTICS_CACHE_MAX_ENTRIES: int = int(os.getenv("ANALYTICS_CACHE_MAX_ENTRIES", "2000"))
+
+    # Agent
+    KNOWLEDGE_TOP_K: int = int(os.getenv("KNOWLEDGE_TOP_K", "5"))
+    RESPONSE_CACHE_THRESHOLD: float = float(os.getenv("RESPONSE_CACHE_THRESHOLD", "0.8"))
+    RESPONSE_CACHE_TTL_SECONDS: int = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "86400"))
+    RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "200"))
+    # Content tokens (stopwords excluded) a question needs before LLM answers to it are cached
+    RESPONSE_CACHE_MIN_TOKENS: int = int(os.getenv("RESPONSE_CACHE_MIN_TOKENS", "3"))
+    LLM_TIMEOUT_SECONDS: float = float(os.getenv("LLM_TIMEOUT_SECONDS", "20"))
+    # Budget for one LLM call across all its retries and fallback models
+    LLM_DEADLINE_SECONDS: float = float(os.getenv("LLM_DEADLINE_SECONDS", "45"))
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "2"))
+    LLM_RETRY_BACKOFF_SECONDS: float = float(os.getenv("LLM_RETRY_BACKOFF_SECONDS", "0.5"))
+    LLM_HEDGE_ENABLED: bool = os.getenv("LLM_HEDGE_ENABLED", "true").lower() == "true"
+    LLM_HEDGE_MIN_SAMPLES: int = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("AUDIT_FLUSH_INTERVAL_SECONDS", "1.0"))
+    AUDIT_BATCH_SIZE: int = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+    AUDIT_MAX_BUFFER: int = int(os.getenv("AUDIT_MAX_BUFFER", "10000"))
+    TOOL_AUDIT_MAX_OUTPUT_BYTES: int = int(os.getenv("TOOL_AUDIT_MAX_OUTPUT_BYTES", "16384"))
+    TOOL_RESULT_BUDGET_TOKENS: int = int(os.getenv("TOOL_RESULT_BUDGET_TOKENS", "1500"))
+    TOOL_RESULT_KEEP_ROUNDS: int = int(os.getenv("TOOL_RESULT_KEEP_ROUNDS", "2"))
+    LLM_PRICING_JSON: str = os.getenv("LLM_PRICING_JSON", "")
+    AGENT_PREFETCH_ENABLED: bool = os.getenv("AGENT_PREFETCH_ENABLED", "false").lower() == "true"
+    AGENT_PREFETCH_DAYS: int = int(os.getenv("AGENT_PREFETCH_DAYS", "7"))
+    MODEL_POLICY_LONG_CONTEXT_CHARS: int = int(os.getenv("MODEL_POLICY_LONG_CONTEXT_CHARS", "24000"))
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from abc import ABC, abstractmethod
 from collections.abc import AsyncGenerator
 from typing import TYPE_CHECKING
 
+from fastapi import HTTPException, status
+
+from app import metrics
+from app.config import Config
+from app.db.bulkhead import BULKHEADS, BulkheadFull
+
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
@@ -12,6 +20,12 @@ logger = logging.getLogger(__name__)
 
 _db_instance: BaseDB | None = None
 _session_factory: async_sessionmaker[AsyncSession] | None = None
+# Optional read replica for dashboard reads; None routes them to the primary
+_read_db_instance: BaseDB | None = None
+_read_session_factory: async_sessionmaker[AsyncSession] | None = None
+_replica_lag: float | None = None
+_replica_lag_checked_at = float("-inf")
+_replica_lag_lock = asyncio.Lock()
 
 
 class BaseDB(ABC):
@@ -27,24 +41,38 @@ class BaseDB(ABC):
     async def dispose(self) -> None:
         pass
 
+    def pool_status(self) -> dict:
+        return {}
+
+    async def replication_lag(self) -> float:
+        """Seconds this database trails its primary; 0 for a primary."""
+        return 0.0
+
 
-def get_db(db_name: str) -> BaseDB:
+def get_db(db_name: str, read_replica: bool = False) -> BaseDB:
     if db_name == "postgres":
         from app.db.postgres import PostgresDB
 
-        return PostgresDB()
+        return PostgresDB(read_replica=read_replica)
     raise ValueError(f"Unsupported database: {db_name}")
 
 
 def init_db(db_name: str = "postgres") -> None:
-    global _db_instance, _session_factory
+    global _db_instance, _session_factory, _read_db_instance, _read_session_factory
     _db_instance = get_db(db_name)
     _session_factory = _db_instance.create_session_factory()
-    logger.info("Database initialized (engine=%s)", db_name)
+    if Config.POSTGRES_READ_HOST:
+        _read_db_instance = get_db(db_name, read_replica=True)
+        _read_session_factory = _read_db_instance.create_session_factory()
+    logger.info("Database initialized (engine=%s, read replica=%s)", db_name, _read_db_instance is not None)
 
 
 async def dispose_db() -> None:
-    global _db_instance, _session_factory
+    global _db_instance, _session_factory, _read_db_instance, _read_session_factory
+    if _read_db_instance is not None:
+        await _read_db_instance.dispose()
+        _read_db_instance = None
+        _read_session_factory = None
     if _db_instance is not None:
         await _db_instance.dispose()
         _db_instance = None
@@ -52,13 +80,83 @@ async def dispose_db() -> None:
         logger.info("Database disposed")
 
 
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Session factory for work that runs outside a request (background jobs, flushers)."""
+    if _session_factory is None:
+        raise RuntimeError("Database not initialized. Call init_db() first.")
+    return _session_factory
+
+
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     if _session_factory is None:
         raise RuntimeError("Database not initialized. Call init_db() first.")
-    async with _session_factory() as session:
-        try:
-            yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
+    try:
+        async with _session_factory() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+    except BulkheadFull as exc:
+        raise _unavailable(exc) from None
+
+
+async def get_read_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Session factory for read-only work that tolerates slightly stale data.
+
+    The replica when one is configured and no more than
+    POSTGRES_READ_MAX_LAG_SECONDS behind, otherwise the primary. Never use it
+    for anything that writes or must see the caller's own recent writes.
+    """
+    if _read_session_factory is not None and await _replica_fresh():
+        metrics.incr("db.read.replica")
+        return _read_session_factory
+    metrics.incr("db.read.primary")
+    return get_session_factory()
+
+
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """Request session for read-only endpoints (dashboards, lists); see get_read_session_factory."""
+    factory = await get_read_session_factory()
+    try:
+        async with factory() as session:
+            try:
+                yield session
+            finally:
+                await session.rollback()
+    except BulkheadFull as exc:
+        raise _unavailable(exc) from None
+
+
+def _unavailable(exc: BulkheadFull) -> HTTPException:
+    # The workload is at its share of connections; shed the request rather than queue it further
+    return HTTPException(status.HTTP_503_SERVICE_UNAVAILABLE, str(exc), headers={"Retry-After": "1"})
+
+
+async def _replica_fresh() -> bool:
+    # Lag is sampled at most every POSTGRES_READ_LAG_CHECK_SECONDS, not per request
+    global _replica_lag, _replica_lag_checked_at
+    replica = _read_db_instance
+    if replica is None:
+        return False
+    if time.monotonic() - _replica_lag_checked_at >= Config.POSTGRES_READ_LAG_CHECK_SECONDS:
+        async with _replica_lag_lock:
+            if time.monotonic() - _replica_lag_checked_at >= Config.POSTGRES_READ_LAG_CHECK_SECONDS:
+                try:
+                    _replica_lag = await replica.replication_lag()
+                except Exception:
+                    logger.exception("Read replica lag check failed; reading from the primary")
+                    _replica_lag = None
+                _replica_lag_checked_at = time.monotonic()
+    return _replica_lag is not None and _replica_lag <= Config.POSTGRES_READ_MAX_LAG_SECONDS
+
+
+def get_pool_status() -> dict:
+    """Connection pool usage of the current engines (empty before init_db)."""
+    if _db_instance is None:
+        return {}
+    pools = {**_db_instance.pool_status(), "bulkheads": {name: b.status() for name, b in BULKHEADS.items()}}
+    if _read_db_instance is not None:
+        pools["read_replica"] = {**_read_db_instance.pool_status(), "lag_seconds": _replica_lag}
+    return pools
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import cast
+
+from sqlalchemy import FromClause, Table, insert
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import metrics
+from app.db.base import get_session_factory
+from app.db.bulkhead import WRITER, BulkheadFull, current_workload
+
+logger = logging.getLogger(__name__)
+
+
+class BufferedWriter:
+    """Buffers rows in memory and writes them with multi-row INSERTs from a background task.
+
+    Meant for append-only audit data that must not add latency to the request path.
+    Rows are plain column dicts and should carry their own id/created_at so nothing
+    has to be read back after the insert. If the buffer fills up (e.g. the database
+    is down) the oldest rows are dropped and counted in metrics.
+
+    after_insert runs in the same transaction as each batch insert, e.g. to
+    maintain rollup tables incrementally.
+    """
+
+    def __init__(
+        self,
+        table: FromClause,
+        flush_interval: float,
+        batch_size: int,
+        max_buffer: int,
+        after_insert: Callable[[AsyncSession, list[dict]], Awaitable[None]] | None = None,
+    ) -> None:
+        # Model.__table__ is typed FromClause but is always a Table for a declarative model
+        self._table = cast(Table, table)
+        self._after_insert = after_insert
+        self._flush_interval = flush_interval
+        self._batch_size = batch_size
+        self._max_buffer = max_buffer
+        self._buffer: deque[dict] = deque(maxlen=max_buffer)
+        self._task: asyncio.Task | None = None
+        self._wakeup = asyncio.Event()
+
+    @property
+    def name(self) -> str:
+        return self._table.name
+
+    def add(self, row: dict) -> None:
+        if len(self._buffer) == self._buffer.maxlen:
+            metrics.incr(f"buffered_writer.{self.name}.dropped")
+        self._buffer.append(row)
+        if len(self._buffer) >= self._batch_size:
+            self._wakeup.set()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name=f"buffered-writer-{self.name}")
+
+    async def stop(self) -> None:
+        """Stop the flusher and write whatever is still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while self._buffer:
+            if not await self.flush():
+                break
+
+    async def flush(self) -> bool:
+        """Write up to one batch. Returns False if any of it could not be written."""
+        if not self._buffer:
+            return True
+        rows = [self._buffer.popleft() for _ in range(min(self._batch_size, len(self._buffer)))]
+        token = current_workload.set(WRITER)
+        try:
+            unwritten = await self._write(rows)
+        finally:
+            current_workload.reset(token)
+        if unwritten:
+            self._requeue(unwritten)
+        return unwritten == []
+
+    async def _write(self, rows: list[dict]) -> list[dict] | None:
+        """Insert rows in one transaction, halving the batch when the data is rejected.
+
+        A bad row then only loses itself rather than its whole batch. Returns
+        the rows to retry on the next flush (no connection was free), or None
+        if the database failed outright and the rows were dropped.
+        """
+        try:
+            async with get_session_factory()() as session:
+                await session.execute(insert(self._table), rows)
+                if self._after_insert is not None:
+                    await self._after_insert(session, rows)
+                await session.commit()
+        except BulkheadFull:
+            # Nothing was written, so keep the rows for the next flush
+            return rows
+        except (IntegrityError, DataError):
+            if len(rows) == 1:
+                logger.exception("Buffered writer %s dropped a row the database rejected", self.name)
+                metrics.incr(f"buffered_writer.{self.name}.dropped")
+                return []
+            middle = len(rows) // 2
+            unwritten = await self._write(rows[:middle])
+            if unwritten is None:
+                metrics.incr(f"buffered_writer.{self.name}.dropped", len(rows) - middle)
+                return None
+            if unwritten:
+                return unwritten + rows[middle:]
+            return await self._write(rows[middle:])
+        except Exception:
+            logger.exception("Buffered writer %s failed to insert %d rows", self.name, len(rows))
+            metrics.incr(f"buffered_writer.{self.name}.dropped", len(rows))
+            return None
+        metrics.incr(f"buffered_writer.{self.name}.written", len(rows))
+        return []
+
+    def _requeue(self, rows: list[dict]) -> None:
+        room = self._max_buffer - len(self._buffer)
+        if room < len(rows):
+            # Drop the oldest rows, as add() does when the buffer is full
+            metrics.incr(f"buffered_writer.{self.name}.dropped", len(rows) - room)
+            rows = rows[len(rows) - room:]
+        self._buffer.extendleft(reversed(rows))
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            while self._buffer:
+                if not await self.flush():
+                    break
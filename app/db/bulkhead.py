@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from contextvars import ContextVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import metrics
+from app.config import Config
+
+# Workload classes sharing the primary pool. Each has its own bulkhead, so a
+# burst in one can only use its share of connections: whatever the dashboard,
+# background and writer limits leave of pool_size + max_overflow stays free for the
+# inbound pipeline.
+PIPELINE = "pipeline"
+DASHBOARD = "dashboard"
+BACKGROUND = "background"
+# Audit/trace BufferedWriters: kept apart from background so long jobs can't stall their flushes
+WRITER = "writer"
+
+# Set per request by WorkloadMiddleware; tasks spawned from a request inherit it,
+# lifespan tasks (periodic jobs, buffered writers) keep the default.
+current_workload: ContextVar[str] = ContextVar("db_workload", default=BACKGROUND)
+
+
+class BulkheadFull(Exception):
+    def __init__(self, workload: str) -> None:
+        super().__init__(f"No database capacity left for {workload} work")
+        self.workload = workload
+
+
+class Bulkhead:
+    """Caps how many sessions one workload may hold open at once; 0 means no cap."""
+
+    def __init__(self, name: str, limit: int, timeout: float) -> None:
+        self.name = name
+        self.limit = limit
+        self._timeout = timeout
+        self._semaphore = asyncio.Semaphore(limit) if limit > 0 else None
+        self._in_use = 0
+        self._waiting = 0
+
+    async def acquire(self) -> None:
+        """Wait for a slot; raises BulkheadFull after the timeout."""
+        started = time.perf_counter()
+        if self._semaphore is not None:
+            self._waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self._timeout)
+            except asyncio.TimeoutError:
+                metrics.incr(f"db.bulkhead.{self.name}.rejected")
+                raise BulkheadFull(self.name) from None
+            finally:
+                self._waiting -= 1
+        metrics.observe(f"db.bulkhead.{self.name}.wait_ms", (time.perf_counter() - started) * 1000)
+        self._in_use += 1
+
+    def release(self) -> None:
+        self._in_use -= 1
+        if self._semaphore is not None:
+            self._semaphore.release()
+
+    def status(self) -> dict:
+        return {"limit": self.limit or None, "in_use": self._in_use, "waiting": self._waiting}
+
+
+BULKHEADS = {
+    PIPELINE: Bulkhead(PIPELINE, Config.DB_BULKHEAD_PIPELINE, Config.DB_BULKHEAD_TIMEOUT_SECONDS),
+    DASHBOARD: Bulkhead(DASHBOARD, Config.DB_BULKHEAD_DASHBOARD, Config.DB_BULKHEAD_TIMEOUT_SECONDS),
+    BACKGROUND: Bulkhead(BACKGROUND, Config.DB_BULKHEAD_BACKGROUND, Config.DB_BULKHEAD_TIMEOUT_SECONDS),
+    WRITER: Bulkhead(WRITER, Config.DB_BULKHEAD_WRITER, Config.DB_BULKHEAD_TIMEOUT_SECONDS),
+}
+
+
+class BulkheadSession(AsyncSession):
+    """AsyncSession that holds a slot in the current workload's bulkhead while open.
+
+    The slot is taken on `async with` and given back on exit, so every
+    session the app opens (request dependencies, jobs, writers) is counted.
+    """
+
+    _bulkhead: Bulkhead | None = None
+
+    async def __aenter__(self) -> BulkheadSession:
+        bulkhead = BULKHEADS[current_workload.get()]
+        await bulkhead.acquire()
+        self._bulkhead = bulkhead
+        return await super().__aenter__()
+
+    async def __aexit__(self, *exc_info) -> None:
+        try:
+            await super().__aexit__(*exc_info)
+        finally:
+            if self._bulkhead is not None:
+                self._bulkhead.release()
+                self._bulkhead = None
+
+
+class WorkloadMiddleware:
+    """ASGI middleware tagging each request with its workload class by path prefix."""
+
+    def __init__(self, app, prefixes: dict[str, str], default: str = DASHBOARD) -> None:
+        self.app = app
+        self._prefixes = prefixes
+        self._default = default
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        path = scope["path"]
+        workload = next(
+            (name for prefix, name in self._prefixes.items() if path.startswith(prefix)), self._default
+        )
+        token = current_workload.set(workload)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_workload.reset(token)
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import gzip
+import logging
+import os
+import re
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import metrics
+from app.config import Config
+from app.db.periodic import PeriodicJob
+
+logger = logging.getLogger(__name__)
+
+# Monthly partitions are named <table>_YYYY_MM; anything else (the default partition) is left alone
+_MONTH_SUFFIX = re.compile(r"_(\d{4})_(\d{2})$")
+
+
+@dataclass(frozen=True)
+class PartitionedTable:
+    """A table range-partitioned by month on created_at.
+
+    retention_months: whole months kept before the current one; 0 keeps everything.
+    """
+
+    name: str
+    retention_months: int = 0
+
+
+def month_start(day: datetime.date) -> datetime.date:
+    return day.replace(day=1)
+
+
+def add_months(month: datetime.date, months: int) -> datetime.date:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: datetime.date) -> str:
+    return f"{table}_{month:%Y_%m}"
+
+
+def create_partition_sql(table: str, month: datetime.date) -> str:
+    # Bounds in UTC, whatever the session's TimeZone
+    return (
+        f'CREATE TABLE IF NOT EXISTS "{partition_name(table, month)}" PARTITION OF "{table}" '
+        f"FOR VALUES FROM ('{month.isoformat()} 00:00+00') TO ('{add_months(month, 1).isoformat()} 00:00+00')"
+    )
+
+
+async def ensure_partitions(session: AsyncSession, table: str, months_ahead: int) -> list[str]:
+    """Create the monthly partitions from this month through `months_ahead` months out. Returns those created."""
+    existing = {name for name, _ in await list_partitions(session, table)}
+    current = month_start(datetime.date.today())
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        name = partition_name(table, month)
+        if name in existing:
+            continue
+        await session.execute(text(create_partition_sql(table, month)))
+        created.append(name)
+    return created
+
+
+async def list_partitions(session: AsyncSession, table: str) -> list[tuple[str, datetime.date]]:
+    """Monthly partitions of `table` as (name, month), oldest first."""
+    rows = (await session.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:table AS regclass)"
+        ),
+        {"table": table},
+    )).scalars()
+    partitions = []
+    for name in rows:
+        match = _MONTH_SUFFIX.search(name)
+        if match and name == partition_name(table, datetime.date(int(match[1]), int(match[2]), 1)):
+            partitions.append((name, datetime.date(int(match[1]), int(match[2]), 1)))
+    return sorted(partitions, key=lambda p: p[1])
+
+
+async def expire_partitions(
+    session: AsyncSession, table: PartitionedTable, archive_dir: str | None = None
+) -> list[str]:
+    """Drop partitions older than the table's retention, archiving each first when `archive_dir` is set.
+
+    Dropping a partition is a catalog operation, unlike DELETE it leaves no
+    dead tuples for vacuum. Returns the partitions dropped.
+    """
+    if table.retention_months <= 0:
+        return []
+    cutoff = add_months(month_start(datetime.date.today()), -table.retention_months)
+    dropped = []
+    for name, month in await list_partitions(session, table.name):
+        if add_months(month, 1) > cutoff:
+            break
+        if archive_dir:
+            await archive_partition(session, name, archive_dir)
+        await session.execute(text(f'DROP TABLE "{name}"'))
+        metrics.incr(f"partitions.{table.name}.dropped")
+        dropped.append(name)
+    return dropped
+
+
+async def archive_partition(session: AsyncSession, name: str, archive_dir: str) -> str:
+    """COPY a partition out to <archive_dir>/<name>.csv.gz. Returns the file path."""
+    os.makedirs(archive_dir, exist_ok=True)
+    path = os.path.join(archive_dir, f"{name}.csv.gz")
+    partial = f"{path}.partial"
+    connection = await session.connection()
+    raw = await connection.get_raw_connection()
+    driver = raw.driver_connection
+    if driver is None:
+        raise RuntimeError(f"No driver connection to archive partition {name} with")
+    with gzip.open(partial, "wb") as out:
+
+        async def write(chunk: bytes) -> None:
+            # Compression is CPU work; keep it off the event loop
+            await asyncio.to_thread(out.write, chunk)
+
+        await driver.copy_from_table(name, output=write, format="csv", header=True)
+    # Only a complete file gets the final name, so a crash never leaves a truncated archive behind
+    os.replace(partial, path)
+    logger.info("Archived partition %s to %s", name, path)
+    return path
+
+
+PARTITIONED_TABLES = [
+    PartitionedTable("messages", Config.MESSAGES_RETENTION_MONTHS),
+    PartitionedTable("tool_executions", Config.TOOL_EXECUTIONS_RETENTION_MONTHS),
+]
+
+
+def retained_since(table_name: str) -> datetime.datetime | None:
+    """Earliest created_at whose rows retention is guaranteed to have kept; None when it keeps everything.
+
+    Aggregates rebuilt from a partitioned table must keep their stored values
+    for anything older, since the source rows may already be dropped.
+    """
+    table = next((t for t in PARTITIONED_TABLES if t.name == table_name), None)
+    if table is None or table.retention_months <= 0:
+        return None
+    cutoff = add_months(month_start(datetime.date.today()), -table.retention_months)
+    return datetime.datetime.combine(cutoff, datetime.time(), datetime.timezone.utc)
+
+
+async def maintain_partitions(session: AsyncSession) -> None:
+    """Create upcoming monthly partitions and expire old ones for every partitioned table."""
+    # One instance at a time; the others skip this round
+    locked = (await session.execute(
+        text("SELECT pg_try_advisory_xact_lock(hashtext('partition_maintenance'))")
+    )).scalar_one()
+    if not locked:
+        return
+    for table in PARTITIONED_TABLES:
+        created = await ensure_partitions(session, table.name, Config.PARTITION_PREMAKE_MONTHS)
+        if created:
+            logger.info("Created partitions %s", ", ".join(created))
+        dropped = await expire_partitions(session, table, Config.PARTITION_ARCHIVE_DIR or None)
+        if dropped:
+            logger.info("Dropped expired partitions %s", ", ".join(dropped))
+
+
+partition_maintenance_job = PeriodicJob(
+    "partition_maintenance",
+    interval=Config.PARTITION_MAINTENANCE_SECONDS,
+    job=maintain_partitions,
+)
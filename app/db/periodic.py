@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import metrics
+from app.db.base import get_session_factory
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicJob:
+    """Runs a database job every `interval` seconds from a background task.
+
+    Each run gets its own session and commits on success. Jobs must be safe to
+    run concurrently from several processes (e.g. guarded by row locks or
+    idempotent upserts), since every app instance runs its own copy.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        interval: float,
+        job: Callable[[AsyncSession], Awaitable[None]],
+    ) -> None:
+        self.name = name
+        self._interval = interval
+        self._job = job
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name=f"periodic-{self.name}")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run_once(self) -> bool:
+        """Run the job once. Returns False if it failed."""
+        try:
+            async with get_session_factory()() as session:
+                await self._job(session)
+                await session.commit()
+        except Exception:
+            logger.exception("Periodic job %s failed", self.name)
+            metrics.incr(f"periodic.{self.name}.failed")
+            return False
+        metrics.incr(f"periodic.{self.name}.runs")
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            await self.run_once()
+            await asyncio.sleep(self._interval)
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import logging
+from typing import cast
 
 import sqlalchemy.engine.url
-from sqlalchemy import text
+from sqlalchemy import QueuePool, text
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
@@ -12,52 +13,105 @@ from sqlalchemy.ext.asyncio import (
 
 from app.config import Config
 from app.db.base import BaseDB
+from app.db.bulkhead import BulkheadSession
 
 logger = logging.getLogger(__name__)
 
 
 class PostgresDB(BaseDB):
-    def __init__(self) -> None:
+    def __init__(self, read_replica: bool = False) -> None:
         super().__init__()
+        self._read_replica = read_replica
+        if read_replica:
+            url = self._replica_url()
+            pool_size, max_overflow = Config.POSTGRES_READ_POOL_SIZE, Config.POSTGRES_READ_MAX_OVERFLOW
+        else:
+            url = self._primary_url()
+            pool_size, max_overflow = Config.POSTGRES_POOL_SIZE, Config.POSTGRES_MAX_OVERFLOW
+        self._async_engine = create_async_engine(
+            url,
+            echo=Config.SQL_COMMAND_ECHO,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=30,
+            pool_recycle=1800,
+            pool_pre_ping=True,
+        )
+
+    @staticmethod
+    def _primary_url() -> sqlalchemy.engine.url.URL:
         if Config.CLOUD_SQL_CONNECTION_NAME:
             # Unix socket (Cloud Run with --add-cloudsql-instances)
             socket_path = f"/cloudsql/{Config.CLOUD_SQL_CONNECTION_NAME}"
-            url = sqlalchemy.engine.url.URL.create(
+            logger.info("Creating DB Engine with unix_socket=%s db=%s", socket_path, Config.POSTGRES_DB_NAME)
+            return sqlalchemy.engine.url.URL.create(
                 drivername="postgresql+asyncpg",
                 username=Config.POSTGRES_USERNAME,
                 password=Config.POSTGRES_PASSWORD,
                 database=Config.POSTGRES_DB_NAME,
                 query={"host": socket_path},
             )
-            logger.info("Creating DB Engine with unix_socket=%s db=%s", socket_path, Config.POSTGRES_DB_NAME)
-        else:
-            # TCP (localhost, public IP, etc.)
-            url = sqlalchemy.engine.url.URL.create(
+        # TCP (localhost, public IP, etc.)
+        logger.info("Creating DB Engine with host=%s port=%s db=%s",
+                    Config.POSTGRES_HOST, Config.POSTGRES_PORT, Config.POSTGRES_DB_NAME)
+        return sqlalchemy.engine.url.URL.create(
+            drivername="postgresql+asyncpg",
+            username=Config.POSTGRES_USERNAME,
+            password=Config.POSTGRES_PASSWORD,
+            host=Config.POSTGRES_HOST,
+            port=Config.POSTGRES_PORT,
+            database=Config.POSTGRES_DB_NAME,
+        )
+
+    @staticmethod
+    def _replica_url() -> sqlalchemy.engine.url.URL:
+        logger.info("Creating read replica DB Engine with host=%s db=%s",
+                    Config.POSTGRES_READ_HOST, Config.POSTGRES_DB_NAME)
+        if Config.POSTGRES_READ_HOST.startswith("/"):
+            return sqlalchemy.engine.url.URL.create(
                 drivername="postgresql+asyncpg",
                 username=Config.POSTGRES_USERNAME,
                 password=Config.POSTGRES_PASSWORD,
-                host=Config.POSTGRES_HOST,
-                port=Config.POSTGRES_PORT,
                 database=Config.POSTGRES_DB_NAME,
+                query={"host": Config.POSTGRES_READ_HOST},
             )
-            logger.info("Creating DB Engine with host=%s port=%s db=%s",
-                        Config.POSTGRES_HOST, Config.POSTGRES_PORT, Config.POSTGRES_DB_NAME)
-        self._async_engine = create_async_engine(
-            url,
-            echo=Config.SQL_COMMAND_ECHO,
-            pool_size=15,
-            max_overflow=5,
-            pool_timeout=30,
-            pool_recycle=1800,
-            pool_pre_ping=True,
+        return sqlalchemy.engine.url.URL.create(
+            drivername="postgresql+asyncpg",
+            username=Config.POSTGRES_USERNAME,
+            password=Config.POSTGRES_PASSWORD,
+            host=Config.POSTGRES_READ_HOST,
+            port=Config.POSTGRES_READ_PORT,
+            database=Config.POSTGRES_DB_NAME,
         )
 
     def create_session_factory(self) -> async_sessionmaker[AsyncSession]:
-        return async_sessionmaker(self._async_engine, class_=AsyncSession, expire_on_commit=False)
+        # The replica has its own pool; bulkheads share out the primary's
+        session_class = AsyncSession if self._read_replica else BulkheadSession
+        return async_sessionmaker(self._async_engine, class_=session_class, expire_on_commit=False)
 
     async def dispose(self) -> None:
         await self._async_engine.dispose()
 
+    def pool_status(self) -> dict:
+        # pool_size/max_overflow above give every engine a QueuePool (the async adapted one)
+        pool = cast(QueuePool, self._async_engine.pool)
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "checked_in": pool.checkedin(),
+        }
+
+    async def replication_lag(self) -> float:
+        async with self._async_engine.connect() as conn:
+            # A standby that has replayed everything it received is current, however old its last transaction
+            lag = await conn.scalar(text(
+                "SELECT CASE WHEN NOT pg_is_in_recovery() "
+                "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+            ))
+        return float(lag)
+
     async def test_connection(self) -> bool:
         try:
             async with self._async_engine.connect() as conn:
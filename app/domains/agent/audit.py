@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import datetime
+import json
+from collections import defaultdict
+from decimal import Decimal
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import Config
+from app.db.buffered_writer import BufferedWriter
+from app.domains.agent.models import LlmCall, LlmUsageDaily, ToolExecution
+
+# Process-wide writers for agent audit rows (tool executions, LLM rounds).
+# Started and drained by the app lifespan.
+
+_USAGE_COLUMNS = ("calls", "prompt_tokens", "completion_tokens", "cached_tokens", "cost")
+
+
+def usage_day(timestamp: datetime.datetime) -> datetime.date:
+    """The llm_usage_daily day a call counts towards: its UTC date, the clock usage analytics reads with."""
+    return timestamp.astimezone(datetime.timezone.utc).date()
+
+
+def _empty_usage() -> dict[str, int | Decimal]:
+    return {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0, "cost": Decimal(0)}
+
+
+async def roll_up_llm_usage(session: AsyncSession, rows: list[dict]) -> None:
+    """Add a batch of llm_calls rows to llm_usage_daily with one upsert."""
+    totals: dict[tuple, dict[str, int | Decimal]] = defaultdict(_empty_usage)
+    for row in rows:
+        key = (usage_day(row["created_at"]), row["branch_id"], row["model"], row["company_id"])
+        bucket = totals[key]
+        bucket["calls"] += 1
+        bucket["prompt_tokens"] += row["prompt_tokens"] or 0
+        bucket["completion_tokens"] += row["completion_tokens"] or 0
+        bucket["cached_tokens"] += row["cached_tokens"] or 0
+        bucket["cost"] += row["cost"] or Decimal(0)
+
+    values = [
+        {"day": day, "branch_id": branch_id, "model": model, "company_id": company_id, **bucket}
+        for (day, branch_id, model, company_id), bucket in totals.items()
+    ]
+    stmt = pg_insert(LlmUsageDaily).values(values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[LlmUsageDaily.day, LlmUsageDaily.branch_id, LlmUsageDaily.model],
+        set_={col: getattr(LlmUsageDaily, col) + stmt.excluded[col] for col in _USAGE_COLUMNS},
+    )
+    await session.execute(stmt)
+
+
+tool_execution_writer = BufferedWriter(
+    ToolExecution.__table__,
+    flush_interval=Config.AUDIT_FLUSH_INTERVAL_SECONDS,
+    batch_size=Config.AUDIT_BATCH_SIZE,
+    max_buffer=Config.AUDIT_MAX_BUFFER,
+)
+
+llm_call_writer = BufferedWriter(
+    LlmCall.__table__,
+    flush_interval=Config.AUDIT_FLUSH_INTERVAL_SECONDS,
+    batch_size=Config.AUDIT_BATCH_SIZE,
+    max_buffer=Config.AUDIT_MAX_BUFFER,
+    after_insert=roll_up_llm_usage,
+)
+
+AUDIT_WRITERS = [tool_execution_writer, llm_call_writer]
+
+
+def truncate_output(output: dict, max_bytes: int = Config.TOOL_AUDIT_MAX_OUTPUT_BYTES) -> dict:
+    """Replace oversized tool outputs with a preview so audit rows stay small."""
+    encoded = json.dumps(output, default=str)
+    if len(encoded) <= max_bytes:
+        return output
+    return {"truncated": True, "size": len(encoded), "preview": encoded[:max_bytes]}
@@ -41,7 +41,7 @@ DEFAULT_REPLY_TEMPLATES: dict[str, dict[str, str]] = {
             "🔹 Therapist: [staff]\n"
             "🔹 Date: [date] at [time]\n"
             "🔹 Price: [price]\n\n"
-            "Please arrive 10 minutes early. See you then! 😊"
+            "Please arrive 10 minutes early. See you then! 😊[milestone]"
         ),
     },
     "booking_slot_unavailable": {
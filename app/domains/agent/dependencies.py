@@ -1,19 +1,31 @@
 from __future__ import annotations
 
+import functools
+
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import Config
 from app.db.base import get_session
+from app.domains.agent.audit import llm_call_writer, tool_execution_writer
+from app.domains.agent.prompt.builder import SystemPromptBuilder
 from app.domains.agent.repositories.agent import AgentRepository
 from app.domains.agent.repositories.knowledge_entry import KnowledgeEntryRepository
+from app.domains.agent.repositories.knowledge_index import KnowledgeIndexRepository
+from app.domains.agent.repositories.llm_call import LlmCallRepository
 from app.domains.agent.repositories.reply_template import ReplyTemplateRepository
-from app.domains.agent.repositories.tool_execution import ToolExecutionRepository
+from app.domains.agent.services.agent_context_loader import AgentContextLoader
 from app.domains.agent.services.agent_crud_service import AgentCrudService
 from app.domains.agent.services.agent_runner import AgentRunner
+from app.domains.agent.services.knowledge_index_service import KnowledgeIndexService
+from app.domains.agent.services.prefetch import SpeculativePrefetcher
+from app.domains.agent.services.tool_executor import ToolExecutor
+from app.domains.agent.tools.registry import ToolRegistry
 from app.domains.company.repositories.availability_override import AvailabilityOverrideRepository
 from app.domains.company.repositories.booking import BookingRepository
 from app.domains.company.repositories.branch import BranchRepository
 from app.domains.company.repositories.company import CompanyRepository
+from app.domains.company.repositories.customer_profile import CustomerProfileRepository
 from app.domains.company.repositories.service import ServiceRepository
 from app.domains.company.repositories.staff import StaffRepository
 from app.domains.company.repositories.staff_availability import StaffAvailabilityRepository
@@ -38,22 +50,37 @@ async def get_reply_template_repo(session: AsyncSession = Depends(get_session))
     return ReplyTemplateRepository(session)
 
 
-async def get_tool_execution_repo(session: AsyncSession = Depends(get_session)) -> ToolExecutionRepository:
-    return ToolExecutionRepository(session)
+async def get_knowledge_index_repo(session: AsyncSession = Depends(get_session)) -> KnowledgeIndexRepository:
+    return KnowledgeIndexRepository(session)
+
+
+async def get_llm_call_repo(session: AsyncSession = Depends(get_session)) -> LlmCallRepository:
+    return LlmCallRepository(session)
 
 
 # ── Services ─────────────────────────────────────────────────────────────
 
 
+async def get_knowledge_index_service(
+    index_repo: KnowledgeIndexRepository = Depends(get_knowledge_index_repo),
+    knowledge_repo: KnowledgeEntryRepository = Depends(get_knowledge_entry_repo),
+) -> KnowledgeIndexService:
+    return KnowledgeIndexService(index_repo=index_repo, knowledge_repo=knowledge_repo)
+
+
 async def get_agent_crud_service(
     agent_repo: AgentRepository = Depends(get_agent_repo),
     knowledge_repo: KnowledgeEntryRepository = Depends(get_knowledge_entry_repo),
     template_repo: ReplyTemplateRepository = Depends(get_reply_template_repo),
+    knowledge_index: KnowledgeIndexService = Depends(get_knowledge_index_service),
+    llm_call_repo: LlmCallRepository = Depends(get_llm_call_repo),
 ) -> AgentCrudService:
     return AgentCrudService(
         agent_repo=agent_repo,
         knowledge_repo=knowledge_repo,
         template_repo=template_repo,
+        knowledge_index=knowledge_index,
+        llm_call_repo=llm_call_repo,
     )
 
 
@@ -82,56 +109,37 @@ def _get_agent_booking_service(session: AsyncSession) -> BookingService:
     )
 
 
-async def get_agent_runner(
-    agent_repo: AgentRepository = Depends(get_agent_repo),
-    knowledge_repo: KnowledgeEntryRepository = Depends(get_knowledge_entry_repo),
-    template_repo: ReplyTemplateRepository = Depends(get_reply_template_repo),
-    tool_execution_repo: ToolExecutionRepository = Depends(get_tool_execution_repo),
-    message_repo: MessageRepository = Depends(_get_message_repo),
-    session: AsyncSession = Depends(get_session),
-) -> AgentRunner:
-    from app.domains.agent.prompt.builder import SystemPromptBuilder
-    from app.domains.agent.prompt.sections.business_context_section import BusinessContextSection
-    from app.domains.agent.prompt.sections.customer_profile_section import CustomerProfileSection
-    from app.domains.agent.prompt.sections.datetime_section import DateTimeSection
-    from app.domains.agent.prompt.sections.knowledge_base_section import KnowledgeBaseSection
-    from app.domains.agent.prompt.sections.reply_templates_section import ReplyTemplatesSection
-    from app.domains.agent.prompt.sections.tool_rules_section import ToolRulesSection
-    from app.domains.agent.services.agent_context_loader import AgentContextLoader
-    from app.domains.agent.services.tool_executor import ToolExecutor
+@functools.cache
+def get_tool_registry() -> ToolRegistry:
+    """Stateless tool singletons, built once per process and then frozen."""
     from app.domains.agent.tools.book_appointment import BookAppointmentTool
     from app.domains.agent.tools.cancel_booking import CancelBookingTool
     from app.domains.agent.tools.check_availability import CheckAvailabilityTool
     from app.domains.agent.tools.edit_booking import EditBookingTool
     from app.domains.agent.tools.escalate import EscalateTool
     from app.domains.agent.tools.list_bookings import ListBookingsTool
-    from app.domains.agent.tools.registry import ToolRegistry
-
-    scheduling_svc = _get_scheduling_service(session)
-    booking_svc = _get_agent_booking_service(session)
 
     # Tool registry — adding a new tool = one register() line here
     registry = ToolRegistry()
-    registry.register("check_availability", lambda: CheckAvailabilityTool(scheduling_svc))
-    registry.register("book_appointment", lambda: BookAppointmentTool(booking_svc, scheduling_svc))
-    registry.register("edit_booking", lambda: EditBookingTool(booking_svc, scheduling_svc))
-    registry.register("cancel_booking", lambda: CancelBookingTool(booking_svc))
-    registry.register("list_bookings", lambda: ListBookingsTool(booking_svc))
-    registry.register("escalate", lambda: EscalateTool())
+    registry.register(CheckAvailabilityTool())
+    registry.register(BookAppointmentTool())
+    registry.register(EditBookingTool())
+    registry.register(CancelBookingTool())
+    registry.register(ListBookingsTool())
+    registry.register(EscalateTool())
+    return registry.freeze()
 
-    context_loader = AgentContextLoader(
-        agent_repo=agent_repo,
-        knowledge_repo=knowledge_repo,
-        template_repo=template_repo,
-        message_repo=message_repo,
-        company_repo=CompanyRepository(session),
-        branch_repo=BranchRepository(session),
-        service_repo=ServiceRepository(session),
-        staff_repo=StaffRepository(session),
-        booking_repo=BookingRepository(session),
-    )
 
-    prompt_builder = SystemPromptBuilder(sections=[
+@functools.cache
+def get_prompt_builder() -> SystemPromptBuilder:
+    from app.domains.agent.prompt.sections.business_context_section import BusinessContextSection
+    from app.domains.agent.prompt.sections.customer_profile_section import CustomerProfileSection
+    from app.domains.agent.prompt.sections.datetime_section import DateTimeSection
+    from app.domains.agent.prompt.sections.knowledge_base_section import KnowledgeBaseSection
+    from app.domains.agent.prompt.sections.reply_templates_section import ReplyTemplatesSection
+    from app.domains.agent.prompt.sections.tool_rules_section import ToolRulesSection
+
+    return SystemPromptBuilder(sections=[
         DateTimeSection(),
         ToolRulesSection(),
         CustomerProfileSection(),
@@ -140,12 +148,53 @@ async def get_agent_runner(
         BusinessContextSection(),
     ])
 
-    tool_executor = ToolExecutor(tool_execution_repo)
+
+@functools.cache
+def _get_tool_executor() -> ToolExecutor:
+    return ToolExecutor(tool_execution_writer)
+
+
+def _bind_tool_services(session: AsyncSession) -> dict:
+    return {
+        "booking_service": _get_agent_booking_service(session),
+        "scheduling_service": _get_scheduling_service(session),
+    }
+
+
+@functools.cache
+def _get_prefetcher() -> SpeculativePrefetcher | None:
+    if not Config.AGENT_PREFETCH_ENABLED:
+        return None
+    return SpeculativePrefetcher(_bind_tool_services)
+
+
+async def get_agent_runner(
+    agent_repo: AgentRepository = Depends(get_agent_repo),
+    knowledge_index: KnowledgeIndexService = Depends(get_knowledge_index_service),
+    template_repo: ReplyTemplateRepository = Depends(get_reply_template_repo),
+    message_repo: MessageRepository = Depends(_get_message_repo),
+    session: AsyncSession = Depends(get_session),
+) -> AgentRunner:
+    context_loader = AgentContextLoader(
+        agent_repo=agent_repo,
+        knowledge_index=knowledge_index,
+        template_repo=template_repo,
+        message_repo=message_repo,
+        company_repo=CompanyRepository(session),
+        branch_repo=BranchRepository(session),
+        service_repo=ServiceRepository(session),
+        staff_repo=StaffRepository(session),
+        customer_profile_repo=CustomerProfileRepository(session),
+    )
 
     return AgentRunner(
         context_loader=context_loader,
-        prompt_builder=prompt_builder,
-        tool_registry=registry,
-        tool_executor=tool_executor,
+        prompt_builder=get_prompt_builder(),
+        tool_registry=get_tool_registry(),
+        tool_executor=_get_tool_executor(),
         template_repo=template_repo,
+        llm_call_writer=llm_call_writer,
+        booking_service=_get_agent_booking_service(session),
+        scheduling_service=_get_scheduling_service(session),
+        prefetcher=_get_prefetcher(),
     )
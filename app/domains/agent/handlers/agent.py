@@ -2,10 +2,10 @@ from __future__ import annotations
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from app.domains.agent.dependencies import get_agent_crud_service
-from app.domains.agent.schemas import AgentResponse, AgentUpsert
+from app.domains.agent.schemas import AgentResponse, AgentUpsert, LlmUsageRow, ResponseCacheStats
 from app.domains.agent.services.agent_crud_service import AgentCrudService
 
 router = APIRouter()
@@ -43,3 +43,31 @@ async def delete_agent(
     deleted = await svc.delete_agent(branch_id)
     if not deleted:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "No agent configured for this branch")
+
+
+@router.get("/response-cache", response_model=ResponseCacheStats)
+async def get_response_cache_stats(
+    company_id: UUID,
+    branch_id: UUID,
+    svc: AgentCrudService = Depends(get_agent_crud_service),
+):
+    return ResponseCacheStats(**await svc.get_response_cache_stats(branch_id))
+
+
+@router.delete("/response-cache", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_response_cache(
+    company_id: UUID,
+    branch_id: UUID,
+    svc: AgentCrudService = Depends(get_agent_crud_service),
+):
+    await svc.clear_response_cache(branch_id)
+
+
+@router.get("/llm-usage", response_model=list[LlmUsageRow])
+async def get_llm_usage(
+    company_id: UUID,
+    branch_id: UUID,
+    days: int = Query(7, ge=1, le=90),
+    svc: AgentCrudService = Depends(get_agent_crud_service),
+):
+    return await svc.get_llm_usage(branch_id, days)
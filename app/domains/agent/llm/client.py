@@ -11,12 +11,21 @@ from app.config import Config
 
 logger = logging.getLogger(__name__)
 
+_client: AsyncOpenAI | None = None
+
 
 def _get_client() -> AsyncOpenAI:
-    return AsyncOpenAI(
-        base_url=Config.OPENROUTER_BASE_URL,
-        api_key=Config.OPENROUTER_API_KEY,
-    )
+    # One client per process so connections are pooled across turns. Retries are
+    # handled by llm.resilience, not by the SDK.
+    global _client
+    if _client is None:
+        _client = AsyncOpenAI(
+            base_url=Config.OPENROUTER_BASE_URL,
+            api_key=Config.OPENROUTER_API_KEY,
+            timeout=Config.LLM_TIMEOUT_SECONDS,
+            max_retries=0,
+        )
+    return _client
 
 
 async def chat_completion(
@@ -24,6 +33,7 @@ async def chat_completion(
     messages: list[dict],
     tools: list[dict] | None = None,
     msg_id: str = "",
+    tool_choice: str = "auto",
 ) -> ChatCompletion:
     client = _get_client()
     kwargs: dict = {
@@ -32,7 +42,7 @@ async def chat_completion(
     }
     if tools:
         kwargs["tools"] = tools
-        kwargs["tool_choice"] = "auto"
+        kwargs["tool_choice"] = tool_choice
 
     prefix = f"Step 5 - msg={msg_id}: " if msg_id else ""
     logger.info("%sLLM request (model=%s messages=%d tools=%d)", prefix, model, len(messages), len(tools) if tools else 0)
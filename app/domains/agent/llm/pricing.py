@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import json
+from decimal import Decimal
+
+from app.config import Config
+
+_PER_MILLION = Decimal(1_000_000)
+
+# USD per 1M tokens: (prompt, completion, cached prompt). Override or extend with
+# LLM_PRICING_JSON, e.g. {"openai/gpt-4o-mini": [0.15, 0.6, 0.075]}.
+MODEL_PRICING: dict[str, tuple[Decimal, Decimal, Decimal]] = {
+    "openai/gpt-4o-mini": (Decimal("0.15"), Decimal("0.60"), Decimal("0.075")),
+    "openai/gpt-4o": (Decimal("2.50"), Decimal("10.00"), Decimal("1.25")),
+    "openai/gpt-4.1-mini": (Decimal("0.40"), Decimal("1.60"), Decimal("0.10")),
+    "openai/gpt-4.1": (Decimal("2.00"), Decimal("8.00"), Decimal("0.50")),
+    "anthropic/claude-3.5-haiku": (Decimal("0.80"), Decimal("4.00"), Decimal("0.08")),
+    "google/gemini-2.0-flash-001": (Decimal("0.10"), Decimal("0.40"), Decimal("0.025")),
+}
+
+if Config.LLM_PRICING_JSON:
+    MODEL_PRICING.update({
+        model: tuple(Decimal(str(v)) for v in prices)
+        for model, prices in json.loads(Config.LLM_PRICING_JSON).items()
+    })
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0) -> Decimal | None:
+    """USD cost of one call, or None for models without a known price."""
+    prices = MODEL_PRICING.get(model)
+    if prices is None:
+        return None
+    prompt_price, completion_price, cached_price = prices
+    uncached = max(prompt_tokens - cached_tokens, 0)
+    cost = uncached * prompt_price + cached_tokens * cached_price + completion_tokens * completion_price
+    return (cost / _PER_MILLION).quantize(Decimal("0.000001"))
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+
+import openai
+from openai.types.chat import ChatCompletion
+
+from app import metrics
+from app.config import Config
+from app.domains.agent.llm.client import chat_completion
+
+logger = logging.getLogger(__name__)
+
+# Errors worth retrying on the same model; anything else moves straight to the next fallback
+_RETRYABLE = (
+    asyncio.TimeoutError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+
+class LLMUnavailableError(Exception):
+    """Raised when the primary model and every fallback failed within their retry budget."""
+
+
+def latency_metric(model: str) -> str:
+    return f"llm.latency_ms.{model}"
+
+
+async def resilient_completion(
+    models: list[str],
+    messages: list[dict],
+    tools: list[dict] | None = None,
+    msg_id: str = "",
+    tool_choice: str = "auto",
+) -> tuple[ChatCompletion, str]:
+    """Call the first model that answers, returning (response, model_used).
+
+    Each attempt has a hard deadline (LLM_TIMEOUT_SECONDS). Retryable failures are
+    retried up to LLM_MAX_RETRIES times with exponential backoff and jitter before
+    falling back to the next model. The whole call, retries and fallbacks included,
+    gives up after LLM_DEADLINE_SECONDS. When hedging is enabled and the model has
+    enough latency samples, a duplicate request is fired once the attempt passes the
+    model's p95 and whichever returns first wins.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + Config.LLM_DEADLINE_SECONDS
+    last_exc: Exception | None = None
+    for index, model in enumerate(dict.fromkeys(models)):
+        if loop.time() >= deadline:
+            break
+        if index > 0:
+            logger.warning("Step 5 - msg=%s: Falling back to model %s", msg_id, model)
+            metrics.incr("llm.fallback")
+        for attempt in range(Config.LLM_MAX_RETRIES + 1):
+            if attempt > 0:
+                delay = Config.LLM_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1)
+                await asyncio.sleep(min(delay + random.uniform(0, delay), max(deadline - loop.time(), 0)))
+                metrics.incr("llm.retry")
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                logger.warning(
+                    "Step 5 - msg=%s: LLM deadline reached before attempt %d on %s", msg_id, attempt + 1, model,
+                )
+                metrics.incr("llm.deadline")
+                break
+            try:
+                response = await asyncio.wait_for(
+                    _hedged(model, messages, tools, msg_id, tool_choice),
+                    timeout=min(Config.LLM_TIMEOUT_SECONDS, remaining),
+                )
+                return response, model
+            except _RETRYABLE as exc:
+                if isinstance(exc, asyncio.TimeoutError):
+                    metrics.incr("llm.timeout")
+                logger.warning(
+                    "Step 5 - msg=%s: LLM attempt %d on %s failed: %r", msg_id, attempt + 1, model, exc,
+                )
+                last_exc = exc
+            except openai.APIError as exc:
+                logger.warning("Step 5 - msg=%s: LLM error on %s, not retrying: %r", msg_id, model, exc)
+                last_exc = exc
+                break
+
+    metrics.incr("llm.unavailable")
+    raise LLMUnavailableError(f"All models failed: {', '.join(models)}") from last_exc
+
+
+async def _hedged(
+    model: str, messages: list[dict], tools: list[dict] | None, msg_id: str, tool_choice: str,
+) -> ChatCompletion:
+    hedge_after = _hedge_delay(model)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    primary = asyncio.create_task(chat_completion(model, messages, tools, msg_id=msg_id, tool_choice=tool_choice))
+    if hedge_after is None:
+        response = await primary
+        metrics.observe(latency_metric(model), (loop.time() - start) * 1000)
+        return response
+
+    tasks = {primary}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+        if not done:
+            logger.info("Step 5 - msg=%s: %s slower than p95 (%.0fms), hedging", msg_id, model, hedge_after * 1000)
+            metrics.incr("llm.hedge")
+            tasks.add(asyncio.create_task(chat_completion(model, messages, tools, msg_id=msg_id, tool_choice=tool_choice)))
+
+        # First successful response wins; only fail once every request has failed
+        pending = set(tasks)
+        error: BaseException | None = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is not primary:
+                        metrics.incr("llm.hedge_won")
+                    metrics.observe(latency_metric(model), (loop.time() - start) * 1000)
+                    return task.result()
+                error = task.exception()
+        # The loop only ends once every task has failed, so error is always set here
+        raise error or RuntimeError(f"No response from {model}")
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+def _hedge_delay(model: str) -> float | None:
+    """Seconds to wait before hedging, or None when hedging is off or there is no reliable p95 yet."""
+    if not Config.LLM_HEDGE_ENABLED:
+        return None
+    name = latency_metric(model)
+    if metrics.sample_count(name) < Config.LLM_HEDGE_MIN_SAMPLES:
+        return None
+    p95 = metrics.percentile(name, 95)
+    return p95 / 1000 if p95 is not None else None
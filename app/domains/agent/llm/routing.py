@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import dataclasses
+
+from openai.types.chat import ChatCompletion
+
+from app.config import Config
+
+# Tools whose successful result only needs to be confirmed back to the customer
+WRITE_TOOLS = frozenset({"book_appointment", "edit_booking", "cancel_booking"})
+
+
+@dataclasses.dataclass(frozen=True)
+class ModelPolicy:
+    """Per-agent model cascade.
+
+    fast_model answers simple turns. strong_model takes over once a tool was
+    called, the conversation is long, or the fast model's answer looked unreliable.
+    compose_model (optional) writes the confirmation after a successful write tool.
+    """
+
+    fast_model: str
+    strong_model: str
+    compose_model: str | None = None
+    long_context_chars: int = Config.MODEL_POLICY_LONG_CONTEXT_CHARS
+
+    @classmethod
+    def for_agent(cls, agent) -> ModelPolicy:
+        """Build the policy from agent.model_policy, falling back to the single agent.model."""
+        default_model = agent.model or Config.OPENROUTER_DEFAULT_MODEL
+        data = agent.model_policy or {}
+        return cls(
+            fast_model=data.get("fast_model") or default_model,
+            strong_model=data.get("strong_model") or default_model,
+            compose_model=data.get("compose_model"),
+            long_context_chars=data.get("long_context_chars") or Config.MODEL_POLICY_LONG_CONTEXT_CHARS,
+        )
+
+    @property
+    def cascades(self) -> bool:
+        return self.fast_model != self.strong_model
+
+
+@dataclasses.dataclass
+class RoundState:
+    """What the runner knows about the turn before picking the next round's model."""
+
+    context_chars: int
+    used_tools: bool = False
+    last_tools: tuple[str, ...] = ()
+    last_tools_succeeded: bool = False
+
+
+def select_model(policy: ModelPolicy, state: RoundState) -> tuple[str, str]:
+    """Return (model, reason) for the next LLM round."""
+    if state.last_tools and policy.compose_model and state.last_tools_succeeded \
+            and all(name in WRITE_TOOLS for name in state.last_tools):
+        return policy.compose_model, "compose"
+    if state.used_tools:
+        return policy.strong_model, "tool_use"
+    if state.context_chars >= policy.long_context_chars:
+        return policy.strong_model, "long_context"
+    return policy.fast_model, "fast"
+
+
+def is_low_confidence(response: ChatCompletion) -> bool:
+    """A text reply that was cut off or came back empty is retried on the strong model."""
+    choice = response.choices[0]
+    if choice.message.tool_calls:
+        return False
+    return choice.finish_reason == "length" or not (choice.message.content or "").strip()
+
+
+def context_chars(messages: list[dict]) -> int:
+    return sum(len(m.get("content") or "") for m in messages)
@@ -2,9 +2,10 @@ from __future__ import annotations
 
 import enum
 import uuid
-from datetime import datetime
+from datetime import date, datetime
+from decimal import Decimal
 
-from sqlalchemy import DateTime, Enum, ForeignKey, Integer, String, Text, func
+from sqlalchemy import Boolean, Date, DateTime, Enum, ForeignKey, Integer, Numeric, String, Text, func
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -48,6 +49,18 @@ class Agent(TimestampMixin, Base):
     system_prompt: Mapped[str] = mapped_column(Text, nullable=False)
     model: Mapped[str] = mapped_column(String(127), nullable=False)
     tools_enabled: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    # Optional model cascade: fast_model / strong_model / compose_model / long_context_chars
+    model_policy: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    fallback_models: Mapped[list] = mapped_column(JSONB, nullable=False, default=list, server_default="[]")
+    # LLM rounds allowed per turn; None uses the runner default
+    max_tool_rounds: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    response_cache_enabled: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, default=False, server_default="false"
+    )
+    # Send booking confirmations straight from the reply template instead of an extra LLM round
+    template_replies_enabled: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, default=False, server_default="false"
+    )
     status: Mapped[AgentStatus] = mapped_column(
         Enum(AgentStatus, name="agent_status", create_type=False),
         nullable=False,
@@ -77,6 +90,20 @@ class KnowledgeEntry(TimestampMixin, Base):
     agent: Mapped[Agent] = relationship(back_populates="knowledge_entries")
 
 
+class KnowledgeIndex(Base):
+    """Persisted BM25 index over an agent's active knowledge entries (one row per agent)."""
+
+    __tablename__ = "knowledge_indexes"
+
+    agent_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("agents.id", ondelete="CASCADE"), primary_key=True
+    )
+    data: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+
+
 class ReplyTemplate(TimestampMixin, Base):
     __tablename__ = "reply_templates"
 
@@ -99,6 +126,8 @@ class ReplyTemplate(TimestampMixin, Base):
 
 class ToolExecution(Base):
     __tablename__ = "tool_executions"
+    # Monthly partitions on created_at, like messages
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, server_default=func.gen_random_uuid()
@@ -106,9 +135,8 @@ class ToolExecution(Base):
     conversation_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("conversations.id", ondelete="CASCADE"), nullable=False
     )
-    message_id: Mapped[uuid.UUID | None] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("messages.id", ondelete="SET NULL"), nullable=True
-    )
+    # No FK: messages is partitioned, and the message may be dropped by retention
+    message_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
     tool: Mapped[str] = mapped_column(String(63), nullable=False)
     input: Mapped[dict] = mapped_column(JSONB, nullable=False)
     output: Mapped[dict] = mapped_column(JSONB, nullable=False)
@@ -119,3 +147,53 @@ class ToolExecution(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
+
+
+class LlmCall(Base):
+    """One LLM round of an agent turn — which model the cascade picked and what it cost."""
+
+    __tablename__ = "llm_calls"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, server_default=func.gen_random_uuid()
+    )
+    conversation_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("conversations.id", ondelete="CASCADE"), nullable=False
+    )
+    branch_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("branches.id", ondelete="CASCADE"), nullable=False
+    )
+    company_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("companies.id", ondelete="CASCADE"), nullable=False
+    )
+    round: Mapped[int] = mapped_column(Integer, nullable=False)
+    model: Mapped[str] = mapped_column(String(127), nullable=False)
+    reason: Mapped[str] = mapped_column(String(31), nullable=False)
+    latency_ms: Mapped[int] = mapped_column(Integer, nullable=False)
+    prompt_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    completion_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    cached_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    cost: Mapped[Decimal | None] = mapped_column(Numeric(12, 6), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
+class LlmUsageDaily(Base):
+    """Daily token/cost totals per branch and model, incremented as llm_calls rows are flushed."""
+
+    __tablename__ = "llm_usage_daily"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    branch_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("branches.id", ondelete="CASCADE"), primary_key=True
+    )
+    model: Mapped[str] = mapped_column(String(127), primary_key=True)
+    company_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("companies.id", ondelete="CASCADE"), nullable=False
+    )
+    calls: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    prompt_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    completion_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    cached_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    cost: Mapped[Decimal] = mapped_column(Numeric(12, 6), nullable=False, default=0)
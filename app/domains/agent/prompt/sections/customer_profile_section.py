@@ -1,8 +1,7 @@
 from __future__ import annotations
 
 from app.domains.agent.services.agent_context_loader import AgentRunContext
-
-_MILESTONE_VISITS = {5, 10, 25, 50, 100}
+from app.domains.agent.templating import MILESTONE_VISITS
 
 
 class CustomerProfileSection:
@@ -48,7 +47,7 @@ class CustomerProfileSection:
                 rules.append(
                     f"- When they ask to book without specifying staff, proactively suggest {h.preferred_staff_name}."
                 )
-            if h.next_visit_number in _MILESTONE_VISITS:
+            if h.next_visit_number in MILESTONE_VISITS:
                 rules.append(
                     f"- Their next booking will be their {h.next_visit_number}th visit — celebrate this milestone in your booking confirmation message!"
                 )
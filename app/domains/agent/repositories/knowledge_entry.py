@@ -26,3 +26,14 @@ class KnowledgeEntryRepository(BaseRepository[KnowledgeEntry]):
         stmt = select(KnowledgeEntry).where(KnowledgeEntry.agent_id == agent_id).order_by(KnowledgeEntry.sort_order)
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
+
+    async def list_active_by_ids(self, agent_id: UUID, entry_ids: list[UUID]) -> list[KnowledgeEntry]:
+        if not entry_ids:
+            return []
+        stmt = select(KnowledgeEntry).where(
+            KnowledgeEntry.agent_id == agent_id,
+            KnowledgeEntry.id.in_(entry_ids),
+            KnowledgeEntry.status == KnowledgeEntryStatus.active,
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domains.agent.models import KnowledgeIndex
+
+
+class KnowledgeIndexRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def get_by_agent_id(self, agent_id: UUID, for_update: bool = False) -> KnowledgeIndex | None:
+        """The agent's index row; `for_update` locks it until the transaction ends."""
+        return await self.session.get(
+            KnowledgeIndex, agent_id, populate_existing=True, with_for_update=for_update
+        )
+
+    async def create(self, agent_id: UUID, data: dict) -> bool:
+        """Insert the agent's first index row. False if another transaction created it first."""
+        stmt = (
+            insert(KnowledgeIndex)
+            .values(agent_id=agent_id, data=data)
+            .on_conflict_do_nothing(index_elements=[KnowledgeIndex.agent_id])
+            .returning(KnowledgeIndex.agent_id)
+        )
+        return (await self.session.execute(stmt)).scalar_one_or_none() is not None
+
+    async def save(self, agent_id: UUID, data: dict) -> None:
+        stmt = (
+            insert(KnowledgeIndex)
+            .values(agent_id=agent_id, data=data)
+            .on_conflict_do_update(
+                index_elements=[KnowledgeIndex.agent_id],
+                set_={"data": data, "updated_at": func.now()},
+            )
+        )
+        await self.session.execute(stmt)
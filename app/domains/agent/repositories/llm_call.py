@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domains.agent.models import LlmCall
+from app.domains.company.repositories.base import BaseRepository
+
+
+class LlmCallRepository(BaseRepository[LlmCall]):
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(session, LlmCall)
+
+    async def summarize_by_branch(self, branch_id: UUID, since: datetime) -> list[dict]:
+        """Per model/reason call counts, latency and token usage for one branch."""
+        stmt = (
+            select(
+                LlmCall.model,
+                LlmCall.reason,
+                func.count().label("calls"),
+                func.avg(LlmCall.latency_ms).label("avg_latency_ms"),
+                func.percentile_cont(0.95).within_group(LlmCall.latency_ms).label("p95_latency_ms"),
+                func.coalesce(func.sum(LlmCall.prompt_tokens), 0).label("prompt_tokens"),
+                func.coalesce(func.sum(LlmCall.completion_tokens), 0).label("completion_tokens"),
+            )
+            .where(LlmCall.branch_id == branch_id, LlmCall.created_at >= since)
+            .group_by(LlmCall.model, LlmCall.reason)
+            .order_by(func.count().desc())
+        )
+        result = await self.session.execute(stmt)
+        return [dict(row._mapping) for row in result.all()]
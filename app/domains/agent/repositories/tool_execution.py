@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domains.agent.models import ToolExecution
 from app.domains.company.repositories.base import BaseRepository
+from app.domains.messaging.repositories.message import since_conversation_start
 
 
 class ToolExecutionRepository(BaseRepository[ToolExecution]):
@@ -16,7 +17,10 @@ class ToolExecutionRepository(BaseRepository[ToolExecution]):
     async def list_by_conversation(self, conversation_id: UUID) -> list[ToolExecution]:
         stmt = (
             select(ToolExecution)
-            .where(ToolExecution.conversation_id == conversation_id)
+            .where(
+                ToolExecution.conversation_id == conversation_id,
+                ToolExecution.created_at >= since_conversation_start(conversation_id),
+            )
             .order_by(ToolExecution.created_at)
         )
         result = await self.session.execute(stmt)
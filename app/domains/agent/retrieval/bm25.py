@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = frozenset({
+    "a", "an", "and", "are", "at", "be", "can", "do", "does", "for", "how", "i", "if", "in",
+    "is", "it", "me", "my", "of", "on", "or", "the", "to", "we", "what", "when", "where",
+    "which", "who", "will", "with", "you", "your",
+})
+
+# Standard Okapi BM25 parameters
+K1 = 1.5
+B = 0.75
+
+
+def tokenize(text: str) -> list[str]:
+    """Lower-case word tokens with stopwords and single characters removed."""
+    return [t for t in _TOKEN_RE.findall(text.lower()) if len(t) > 1 and t not in _STOPWORDS]
+
+
+class BM25Index:
+    """In-memory BM25 index over short documents, updatable one document at a time.
+
+    Only per-document term frequencies are persisted (see to_dict); document
+    frequencies and lengths are derived on load, so an add/remove never has to
+    touch the other documents.
+
+    Usage:
+        index = BM25Index()
+        index.add("entry-1", "What are your opening hours? We open 9am-6pm daily.")
+        index.search("when do you open", top_k=5)  # -> [("entry-1", 1.23)]
+    """
+
+    def __init__(self) -> None:
+        self._docs: dict[str, dict[str, int]] = {}
+        self._lengths: dict[str, int] = {}
+        self._df: Counter[str] = Counter()
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._docs
+
+    def add(self, doc_id: str, text: str) -> None:
+        """Index a document, replacing any previous version with the same id."""
+        self.remove(doc_id)
+        self._add_terms(doc_id, dict(Counter(tokenize(text))))
+
+    def remove(self, doc_id: str) -> None:
+        terms = self._docs.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            self._df[term] -= 1
+            if self._df[term] <= 0:
+                del self._df[term]
+        self._total_length -= self._lengths.pop(doc_id)
+
+    def search(self, query: str, top_k: int) -> list[tuple[str, float]]:
+        """Return up to top_k (doc_id, score) pairs with a positive score, best first."""
+        query_terms = set(tokenize(query))
+        if not query_terms or not self._docs:
+            return []
+
+        n_docs = len(self._docs)
+        avg_len = self._total_length / n_docs or 1.0
+        idf = {
+            term: math.log(1 + (n_docs - self._df[term] + 0.5) / (self._df[term] + 0.5))
+            for term in query_terms
+            if term in self._df
+        }
+        if not idf:
+            return []
+
+        scores: list[tuple[str, float]] = []
+        for doc_id, terms in self._docs.items():
+            norm = K1 * (1 - B + B * self._lengths[doc_id] / avg_len)
+            score = 0.0
+            for term, weight in idf.items():
+                tf = terms.get(term)
+                if tf:
+                    score += weight * tf * (K1 + 1) / (tf + norm)
+            if score > 0:
+                scores.append((doc_id, score))
+
+        scores.sort(key=lambda pair: pair[1], reverse=True)
+        return scores[:top_k]
+
+    # ── Persistence ───────────────────────────────────────────────────────
+
+    def to_dict(self) -> dict:
+        return {"docs": self._docs}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> BM25Index:
+        index = cls()
+        for doc_id, terms in data.get("docs", {}).items():
+            index._add_terms(doc_id, terms)
+        return index
+
+    def _add_terms(self, doc_id: str, terms: dict[str, int]) -> None:
+        self._docs[doc_id] = terms
+        length = sum(terms.values())
+        self._lengths[doc_id] = length
+        self._total_length += length
+        self._df.update(terms.keys())
@@ -3,7 +3,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.domains.agent.models import (
     AgentStatus,
@@ -16,11 +16,23 @@ from app.domains.agent.models import (
 # ── Agent ─────────────────────────────────────────────────────────────────
 
 
+class ModelPolicy(BaseModel):
+    fast_model: str | None = None
+    strong_model: str | None = None
+    compose_model: str | None = None
+    long_context_chars: int | None = None
+
+
 class AgentUpsert(BaseModel):
     name: str | None = None
     system_prompt: str | None = None
     model: str | None = None
+    model_policy: ModelPolicy | None = None
+    fallback_models: list[str] | None = None
+    max_tool_rounds: int | None = Field(default=None, ge=1, le=10)
     tools_enabled: dict | None = None
+    response_cache_enabled: bool | None = None
+    template_replies_enabled: bool | None = None
     status: AgentStatus | None = None
 
 
@@ -33,12 +45,35 @@ class AgentResponse(BaseModel):
     name: str
     system_prompt: str
     model: str
+    model_policy: ModelPolicy | None
+    fallback_models: list[str]
+    max_tool_rounds: int | None
     tools_enabled: dict
+    response_cache_enabled: bool
+    template_replies_enabled: bool
     status: AgentStatus
     created_at: datetime
     updated_at: datetime
 
 
+class ResponseCacheStats(BaseModel):
+    enabled: bool
+    entries: int
+    hits: int
+    misses: int
+    hit_rate: float
+
+
+class LlmUsageRow(BaseModel):
+    model: str
+    reason: str
+    calls: int
+    avg_latency_ms: float
+    p95_latency_ms: float
+    prompt_tokens: int
+    completion_tokens: int
+
+
 # ── Knowledge Entry ───────────────────────────────────────────────────────
 
 
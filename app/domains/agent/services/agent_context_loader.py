@@ -2,28 +2,29 @@ from __future__ import annotations
 
 import dataclasses
 import datetime as _dt
-from collections import Counter
 from uuid import UUID
 
+from app.config import Config
 from app.domains.agent.defaults import DEFAULT_REPLY_TEMPLATES
-from app.domains.agent.models import AgentStatus, KnowledgeEntry, KnowledgeEntryStatus, ReplyTemplateTrigger
+from app.domains.agent.models import Agent, AgentStatus, KnowledgeEntry, KnowledgeEntryStatus, ReplyTemplateTrigger
 from app.domains.agent.repositories.agent import AgentRepository
-from app.domains.agent.repositories.knowledge_entry import KnowledgeEntryRepository
 from app.domains.agent.repositories.reply_template import ReplyTemplateRepository
-from app.domains.company.models import Booking, BookingStatus, Branch, Company, Service, Staff
-from app.domains.company.repositories.booking import BookingRepository
+from app.domains.agent.services.knowledge_index_service import KnowledgeIndexService
+from app.domains.company.models import Branch, Company, CustomerProfile, Service, Staff
 from app.domains.company.repositories.branch import BranchRepository
 from app.domains.company.repositories.company import CompanyRepository
+from app.domains.company.repositories.customer_profile import CustomerProfileRepository
 from app.domains.company.repositories.service import ServiceRepository
 from app.domains.company.repositories.staff import StaffRepository
 from app.domains.messaging.repositories.message import MessageRepository
 
-_MILESTONE_VISITS = {5, 10, 25, 50, 100}
+# Number of latest customer messages used as the knowledge-retrieval query
+_RETRIEVAL_QUERY_MESSAGES = 3
 
 
 @dataclasses.dataclass
 class CustomerHistory:
-    """Derived profile from booking history."""
+    """Derived profile from the customer's completed visits."""
 
     is_returning: bool
     visit_count: int
@@ -37,67 +38,59 @@ class CustomerHistory:
     next_visit_number: int
 
     @classmethod
-    def from_bookings(cls, bookings: list[Booking]) -> CustomerHistory | None:
-        """Derive a customer profile from their booking history.
-
-        Returns None if the customer has no bookings at all.
+    def from_profile(
+        cls,
+        profile: CustomerProfile | None,
+        services: list[Service],
+        staff: list[Staff],
+    ) -> CustomerHistory | None:
+        """Derive the customer history from their stored profile aggregate.
+
+        Returns None if the customer has never booked. Preferred service/staff
+        names are resolved against the already-loaded catalogue.
         """
-        if not bookings:
+        if profile is None:
             return None
 
-        completed = [b for b in bookings if b.status == BookingStatus.completed]
-        visit_count = len(completed)
-        is_returning = visit_count > 0
-
-        last_visit_date = completed[0].date if completed else None
+        visit_count = profile.visit_count
         weeks_since = None
-        if last_visit_date:
-            weeks_since = (_dt.date.today() - last_visit_date).days // 7
-
-        preferred_service_name: str | None = None
-        preferred_service_id: UUID | None = None
-        preferred_staff_name: str | None = None
-        preferred_staff_id: UUID | None = None
-        preferred_day_of_week: str | None = None
-
-        if completed:
-            top_service_id = Counter(b.service_id for b in completed).most_common(1)[0][0]
-            for b in completed:
-                if b.service_id == top_service_id:
-                    preferred_service_id = b.service_id
-                    preferred_service_name = b.service.name if b.service else None
-                    break
-
-            top_staff_id = Counter(b.staff_id for b in completed).most_common(1)[0][0]
-            for b in completed:
-                if b.staff_id == top_staff_id:
-                    preferred_staff_id = b.staff_id
-                    preferred_staff_name = b.staff.name if b.staff else None
-                    break
-
-            preferred_day_of_week = Counter(
-                b.date.strftime("%A") for b in completed
-            ).most_common(1)[0][0]
+        if profile.last_visit_date:
+            weeks_since = (_dt.date.today() - profile.last_visit_date).days // 7
+
+        preferred_service_id = _most_common_id(profile.service_counts)
+        preferred_staff_id = _most_common_id(profile.staff_counts)
+        service_names = {s.id: s.name for s in services}
+        staff_names = {s.id: s.name for s in staff}
 
         return cls(
-            is_returning=is_returning,
+            is_returning=visit_count > 0,
             visit_count=visit_count,
-            last_visit_date=last_visit_date,
+            last_visit_date=profile.last_visit_date,
             weeks_since_last_visit=weeks_since,
-            preferred_service_name=preferred_service_name,
+            preferred_service_name=service_names.get(preferred_service_id) if preferred_service_id else None,
             preferred_service_id=preferred_service_id,
-            preferred_staff_name=preferred_staff_name,
+            preferred_staff_name=staff_names.get(preferred_staff_id) if preferred_staff_id else None,
             preferred_staff_id=preferred_staff_id,
-            preferred_day_of_week=preferred_day_of_week,
+            preferred_day_of_week=_most_common(profile.weekday_counts),
             next_visit_number=visit_count + 1,
         )
 
 
+def _most_common(counts: dict[str, int]) -> str | None:
+    positive = {key: n for key, n in counts.items() if n > 0}
+    return max(positive, key=positive.__getitem__) if positive else None
+
+
+def _most_common_id(counts: dict[str, int]) -> UUID | None:
+    key = _most_common(counts)
+    return UUID(key) if key else None
+
+
 @dataclasses.dataclass
 class AgentRunContext:
     """All data needed for a single agent invocation."""
 
-    agent: object  # Agent model
+    agent: Agent
     company: Company | None
     branch: Branch | None
     active_services: list[Service]
@@ -117,24 +110,24 @@ class AgentContextLoader:
     def __init__(
         self,
         agent_repo: AgentRepository,
-        knowledge_repo: KnowledgeEntryRepository,
+        knowledge_index: KnowledgeIndexService,
         template_repo: ReplyTemplateRepository,
         message_repo: MessageRepository,
         company_repo: CompanyRepository,
         branch_repo: BranchRepository,
         service_repo: ServiceRepository,
         staff_repo: StaffRepository,
-        booking_repo: BookingRepository,
+        customer_profile_repo: CustomerProfileRepository,
     ) -> None:
         self._agent_repo = agent_repo
-        self._knowledge_repo = knowledge_repo
+        self._knowledge_index = knowledge_index
         self._template_repo = template_repo
         self._message_repo = message_repo
         self._company_repo = company_repo
         self._branch_repo = branch_repo
         self._service_repo = service_repo
         self._staff_repo = staff_repo
-        self._booking_repo = booking_repo
+        self._customer_profile_repo = customer_profile_repo
 
     async def load(
         self,
@@ -149,7 +142,9 @@ class AgentContextLoader:
             return None
 
         recent_messages = await self._message_repo.get_recent(conversation_id, limit=20)
-        knowledge_entries = await self._knowledge_repo.list_active_by_agent(agent.id)
+        knowledge_entries = await self._knowledge_index.select_relevant(
+            agent.id, _retrieval_query(recent_messages), Config.KNOWLEDGE_TOP_K
+        )
         templates = await self._load_all_templates(agent.id)
 
         company = await self._company_repo.get_by_id(agent.company_id)
@@ -159,15 +154,12 @@ class AgentContextLoader:
         staff_list = await self._staff_repo.list_by(company_id=agent.company_id)
         active_staff = [s for s in staff_list if s.status.value == "active"]
 
-        past_bookings = await self._booking_repo.list_past_by_phone(agent.company_id, customer_phone)
-        customer_history = CustomerHistory.from_bookings(past_bookings)
+        profile = await self._customer_profile_repo.get(agent.company_id, customer_phone)
+        customer_history = CustomerHistory.from_profile(profile, active_services, active_staff)
 
         resolved_name = customer_name
-        if resolved_name is None and past_bookings:
-            for b in past_bookings:
-                if b.customer_name:
-                    resolved_name = b.customer_name
-                    break
+        if resolved_name is None and profile is not None:
+            resolved_name = profile.customer_name
 
         is_new_conversation = not any(
             m.role.value in ("agent", "member") for m in recent_messages
@@ -200,3 +192,8 @@ class AgentContextLoader:
             elif key in DEFAULT_REPLY_TEMPLATES:
                 result[key] = DEFAULT_REPLY_TEMPLATES[key]["content"]
         return result
+
+
+def _retrieval_query(recent_messages: list) -> str:
+    customer_texts = [m.content for m in recent_messages if m.role.value == "customer"]
+    return " ".join(customer_texts[-_RETRIEVAL_QUERY_MESSAGES:])
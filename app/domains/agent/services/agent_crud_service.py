@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import datetime as _dt
 from uuid import UUID
 
 from fastapi import HTTPException, status
@@ -9,6 +10,7 @@ from app.domains.agent.defaults import DEFAULT_REPLY_TEMPLATES
 from app.domains.agent.models import AgentStatus, KnowledgeEntryStatus, ReplyTemplateTrigger
 from app.domains.agent.repositories.agent import AgentRepository
 from app.domains.agent.repositories.knowledge_entry import KnowledgeEntryRepository
+from app.domains.agent.repositories.llm_call import LlmCallRepository
 from app.domains.agent.repositories.reply_template import ReplyTemplateRepository
 from app.domains.agent.schemas import (
     AgentUpsert,
@@ -17,6 +19,8 @@ from app.domains.agent.schemas import (
     ReplyTemplateResponse,
     ReplyTemplateUpsert,
 )
+from app.domains.agent.services.knowledge_index_service import KnowledgeIndexService
+from app.domains.agent.services.response_cache import response_cache
 
 
 class AgentCrudService:
@@ -25,10 +29,14 @@ class AgentCrudService:
         agent_repo: AgentRepository,
         knowledge_repo: KnowledgeEntryRepository,
         template_repo: ReplyTemplateRepository,
+        knowledge_index: KnowledgeIndexService,
+        llm_call_repo: LlmCallRepository,
     ) -> None:
         self.agent_repo = agent_repo
         self.knowledge_repo = knowledge_repo
         self.template_repo = template_repo
+        self.knowledge_index = knowledge_index
+        self.llm_call_repo = llm_call_repo
 
     # ── Agent ─────────────────────────────────────────────────────────────
 
@@ -54,6 +62,7 @@ class AgentCrudService:
         else:
             kwargs = data.model_dump(exclude_unset=True)
             if kwargs:
+                response_cache.invalidate_agent(existing.id)
                 return await self.agent_repo.update(existing.id, **kwargs)
             return existing
 
@@ -75,20 +84,47 @@ class AgentCrudService:
         entries = await self.knowledge_repo.list_by_agent(agent.id)
         if entries:
             max_order = max(e.sort_order for e in entries)
-        return await self.knowledge_repo.create(
+        entry = await self.knowledge_repo.create(
             agent_id=agent.id,
             question=data.question,
             answer=data.answer,
             category=data.category,
             sort_order=max_order + 1,
         )
+        await self.knowledge_index.sync_entry(entry)
+        response_cache.invalidate_agent(agent.id)
+        return entry
 
     async def update_knowledge_entry(self, entry_id: UUID, data: KnowledgeEntryUpdate):
         kwargs = data.model_dump(exclude_unset=True)
-        return await self.knowledge_repo.update(entry_id, **kwargs)
+        entry = await self.knowledge_repo.update(entry_id, **kwargs)
+        if entry is not None:
+            await self.knowledge_index.sync_entry(entry)
+            response_cache.invalidate_agent(entry.agent_id)
+        return entry
 
     async def delete_knowledge_entry(self, entry_id: UUID) -> bool:
-        return await self.knowledge_repo.delete(entry_id)
+        entry = await self.knowledge_repo.get_by_id(entry_id)
+        if entry is None:
+            return False
+        agent_id = entry.agent_id
+        deleted = await self.knowledge_repo.delete(entry_id)
+        if deleted:
+            await self.knowledge_index.remove_entry(agent_id, entry_id)
+            response_cache.invalidate_agent(agent_id)
+        return deleted
+
+    async def get_response_cache_stats(self, branch_id: UUID) -> dict:
+        agent = await self._require_agent(branch_id)
+        return {"enabled": agent.response_cache_enabled, **response_cache.stats(agent.id)}
+
+    async def clear_response_cache(self, branch_id: UUID) -> None:
+        agent = await self._require_agent(branch_id)
+        response_cache.invalidate_agent(agent.id)
+
+    async def get_llm_usage(self, branch_id: UUID, days: int) -> list[dict]:
+        since = _dt.datetime.now(_dt.timezone.utc) - _dt.timedelta(days=days)
+        return await self.llm_call_repo.summarize_by_branch(branch_id, since)
 
     # ── Reply templates ───────────────────────────────────────────────────
 
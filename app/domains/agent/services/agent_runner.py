@@ -1,18 +1,35 @@
 from __future__ import annotations
 
+import datetime as _dt
 import json
 import logging
+import time
+import uuid
 from uuid import UUID
 
+from openai.types.chat import ChatCompletion
+
+from app import metrics, tracing
 from app.config import Config
+from app.db.buffered_writer import BufferedWriter
 from app.domains.agent.defaults import DEFAULT_REPLY_TEMPLATES, DEFAULT_TOOLS_ENABLED
-from app.domains.agent.llm.client import chat_completion, get_response_text, parse_tool_calls
+from app.domains.agent.llm.client import get_response_text, parse_tool_calls
+from app.domains.agent.llm.pricing import estimate_cost
+from app.domains.agent.llm.resilience import resilient_completion
+from app.domains.agent.llm.routing import ModelPolicy, RoundState, context_chars, is_low_confidence, select_model
 from app.domains.agent.prompt.builder import SystemPromptBuilder
 from app.domains.agent.repositories.reply_template import ReplyTemplateRepository
-from app.domains.agent.services.agent_context_loader import AgentContextLoader
+from app.domains.agent.services.agent_context_loader import AgentContextLoader, AgentRunContext
+from app.domains.agent.services.intent_replies import format_bookings, format_opening_hours
+from app.domains.agent.services.prefetch import SpeculativePrefetcher
+from app.domains.agent.services.response_cache import response_cache
 from app.domains.agent.services.tool_executor import ToolExecutor
-from app.domains.agent.tools.base import ToolContext
+from app.domains.agent.templating import has_placeholders, render_template
+from app.domains.agent.tools.base import BaseTool, ToolContext
 from app.domains.agent.tools.registry import ToolRegistry
+from app.domains.agent.tools.shaping import elide_stale_tool_results, encode_tool_result
+from app.domains.company.services.booking_service import BookingService
+from app.domains.company.services.scheduling_service import SchedulingService
 from app.domains.pipeline.contracts import AgentResponse
 
 logger = logging.getLogger(__name__)
@@ -33,12 +50,22 @@ class AgentRunner:
         tool_registry: ToolRegistry,
         tool_executor: ToolExecutor,
         template_repo: ReplyTemplateRepository,
+        llm_call_writer: BufferedWriter,
+        booking_service: BookingService,
+        scheduling_service: SchedulingService,
+        prefetcher: SpeculativePrefetcher | None = None,
     ) -> None:
         self.context_loader = context_loader
         self.prompt_builder = prompt_builder
         self.tool_registry = tool_registry
         self.tool_executor = tool_executor
         self.template_repo = template_repo
+        self.llm_call_writer = llm_call_writer
+        self.booking_service = booking_service
+        self.scheduling_service = scheduling_service
+        self.prefetcher = prefetcher
+        # Context handle_intent loaded for a turn it then declined, reused once by process()
+        self._declined_ctx: tuple[tuple, AgentRunContext | None] | None = None
 
     async def process(
         self,
@@ -48,7 +75,7 @@ class AgentRunner:
         customer_name: str | None = None,
         msg_id: str = "",
     ) -> AgentResponse:
-        ctx = await self.context_loader.load(branch_id, conversation_id, customer_phone, customer_name)
+        ctx = await self._load_context(branch_id, conversation_id, customer_phone, customer_name)
 
         if ctx is None:
             logger.warning("Step 4 - msg=%s: No active agent, escalating", msg_id)
@@ -64,7 +91,19 @@ class AgentRunner:
             ctx.customer_history.is_returning if ctx.customer_history else None,
         )
 
-        system_prompt = self.prompt_builder.build(ctx)
+        question = _latest_customer_text(ctx.recent_messages)
+        # Only the opening message stands on its own; later ones lean on the conversation so far
+        standalone = len(ctx.recent_messages) <= 1
+        if ctx.agent.response_cache_enabled and question:
+            cached = response_cache.lookup(
+                ctx.agent.id, branch_id, ctx.agent.company_id, question, ctx.knowledge_entries, standalone
+            )
+            if cached:
+                logger.info("Step 4 - msg=%s: Answered from response cache", msg_id)
+                return AgentResponse(text=cached)
+
+        with tracing.span("prompt_build"):
+            system_prompt = self.prompt_builder.build(ctx)
 
         messages = [{"role": "system", "content": system_prompt}]
         for msg in ctx.recent_messages:
@@ -72,74 +111,117 @@ class AgentRunner:
             messages.append({"role": role, "content": msg.content})
 
         enabled = {**DEFAULT_TOOLS_ENABLED, **(ctx.agent.tools_enabled or {})}
-        tools_map = self.tool_registry.build_enabled(enabled)
-        tool_schemas = [t.to_openai_schema() for t in tools_map.values()] if tools_map else None
+        tools_map = self.tool_registry.enabled_tools(enabled)
+        tool_schemas = self.tool_registry.schemas(enabled)
 
-        tool_context = ToolContext(
-            branch_id=branch_id,
-            company_id=ctx.agent.company_id,
-            conversation_id=conversation_id,
-            customer_phone=customer_phone,
-            customer_name=customer_name,
-        )
+        tool_context = self._tool_context(ctx, branch_id, conversation_id, customer_phone, customer_name)
+        if self.prefetcher is not None:
+            # Runs alongside the first LLM round; tools pick the results up if they are asked for
+            tool_context.prefetch = self.prefetcher.start(ctx, question, tools_map, tool_context)
 
         escalate = False
         escalation_reason = None
         response = None
+        terminal_text = None
+        used_tools = False
+        policy = ModelPolicy.for_agent(ctx.agent)
+        round_state = RoundState(context_chars=context_chars(messages))
+        max_rounds = ctx.agent.max_tool_rounds or MAX_TOOL_ROUNDS
 
-        for round_num in range(MAX_TOOL_ROUNDS):
-            model = ctx.agent.model or Config.OPENROUTER_DEFAULT_MODEL
-            logger.info("Step 4 - msg=%s: LLM round %d", msg_id, round_num + 1)
-            response = await chat_completion(model, messages, tool_schemas, msg_id=msg_id)
-
-            tool_calls = parse_tool_calls(response)
-            if not tool_calls:
-                logger.info("Step 6 - msg=%s: LLM done (no tools)", msg_id)
-                break
-
-            logger.info("Step 5 - msg=%s: Tools: %s", msg_id, ", ".join(tc["name"] for tc in tool_calls))
-
-            assistant_msg = response.choices[0].message
-            messages.append({
-                "role": "assistant",
-                "content": assistant_msg.content,
-                "tool_calls": [
-                    {
-                        "id": tc["id"],
-                        "type": "function",
-                        "function": {"name": tc["name"], "arguments": json.dumps(tc["arguments"])},
-                    }
-                    for tc in tool_calls
-                ],
-            })
-
-            for tc in tool_calls:
-                tool = tools_map.get(tc["name"])
-                if tool is None:
-                    logger.warning("Step 5 - msg=%s: Unknown tool: %s", msg_id, tc["name"])
-                    tool_result = {"error": f"Unknown tool: {tc['name']}"}
-                else:
-                    tool_result = await self.tool_executor.run(
-                        tool=tool,
-                        tool_name=tc["name"],
-                        tool_call_id=tc["id"],
-                        arguments=tc["arguments"],
-                        context=tool_context,
-                        conversation_id=conversation_id,
-                        msg_id=msg_id,
+        try:
+            for round_num in range(max_rounds):
+                model, reason = select_model(policy, round_state)
+                # The last allowed round may not call tools, so the turn always ends with a reply
+                tool_choice = "none" if round_num == max_rounds - 1 else "auto"
+                logger.info("Step 4 - msg=%s: LLM round %d (model=%s reason=%s)", msg_id, round_num + 1, model, reason)
+                response = await self._call_llm(
+                    model, reason, round_num, messages, tool_schemas, tool_choice, ctx.agent.fallback_models,
+                    conversation_id, branch_id, ctx.agent.company_id, msg_id,
+                )
+                if model != policy.strong_model and is_low_confidence(response):
+                    logger.info(
+                        "Step 4 - msg=%s: Low-confidence reply from %s, retrying on %s",
+                        msg_id, model, policy.strong_model,
+                    )
+                    response = await self._call_llm(
+                        policy.strong_model, "low_confidence", round_num, messages, tool_schemas, tool_choice,
+                        ctx.agent.fallback_models, conversation_id, branch_id, ctx.agent.company_id, msg_id,
                     )
 
-                if tc["name"] == "escalate" and tool_result.get("escalate"):
-                    escalate = True
-                    escalation_reason = tool_result.get("reason")
+                tool_calls = parse_tool_calls(response)
+                if not tool_calls:
+                    logger.info("Step 6 - msg=%s: LLM done (no tools)", msg_id)
+                    break
 
+                logger.info("Step 5 - msg=%s: Tools: %s", msg_id, ", ".join(tc["name"] for tc in tool_calls))
+                used_tools = True
+                round_state.used_tools = True
+                round_state.last_tools = tuple(tc["name"] for tc in tool_calls)
+                round_state.last_tools_succeeded = True
+
+                assistant_msg = response.choices[0].message
                 messages.append({
-                    "role": "tool",
-                    "tool_call_id": tc["id"],
-                    "content": json.dumps(tool_result),
+                    "role": "assistant",
+                    "content": assistant_msg.content,
+                    "tool_calls": [
+                        {
+                            "id": tc["id"],
+                            "type": "function",
+                            "function": {"name": tc["name"], "arguments": json.dumps(tc["arguments"])},
+                        }
+                        for tc in tool_calls
+                    ],
                 })
 
-        text = get_response_text(response) if response else None
+                terminal = None
+                for tc in tool_calls:
+                    tool = tools_map.get(tc["name"])
+                    if tool is None:
+                        logger.warning("Step 5 - msg=%s: Unknown tool: %s", msg_id, tc["name"])
+                        tool_result = {"error": f"Unknown tool: {tc['name']}"}
+                    else:
+                        tool_result = await self.tool_executor.run(
+                            tool=tool,
+                            tool_name=tc["name"],
+                            tool_call_id=tc["id"],
+                            arguments=tc["arguments"],
+                            context=tool_context,
+                            conversation_id=conversation_id,
+                            msg_id=msg_id,
+                        )
+
+                    if tc["name"] == "escalate" and tool_result.get("escalate"):
+                        escalate = True
+                        escalation_reason = tool_result.get("reason")
+                    if "error" in tool_result:
+                        round_state.last_tools_succeeded = False
+                    elif tool is not None and tool.ends_turn(tool_result) \
+                            and (ctx.agent.template_replies_enabled or not tool.template_reply_opt_in):
+                        terminal = (tool, tool_result, tc["arguments"])
+
+                    messages.append({
+                        "role": "tool",
+                        "tool_call_id": tc["id"],
+                        "content": encode_tool_result(tool, tool_result, tc["arguments"]),
+                    })
+
+                # Only a round that did nothing but the terminal call can end on its template;
+                # the LLM has to speak to whatever else was called alongside it
+                if terminal is not None and len(tool_calls) == 1:
+                    terminal_text = self._terminal_reply(ctx, *terminal)
+                    if terminal_text:
+                        logger.info("Step 6 - msg=%s: %s ended the turn", msg_id, terminal[0].name)
+                        metrics.incr(f"agent.terminal_tool.{terminal[0].name}")
+                        break
+
+                elide_stale_tool_results(messages, keep_last_rounds=Config.TOOL_RESULT_KEEP_ROUNDS)
+                round_state.context_chars = context_chars(messages)
+        finally:
+            # Cancel outstanding prefetches even when a round raises
+            if tool_context.prefetch is not None:
+                tool_context.prefetch.close()
+
+        text = terminal_text or (get_response_text(response) if response else None)
         if not text:
             logger.warning("Step 6 - msg=%s: Empty response, escalating", msg_id)
             text = await self.resolve_template(
@@ -147,10 +229,165 @@ class AgentRunner:
             )
             escalate = True
             escalation_reason = "Agent returned empty response"
+        elif ctx.agent.response_cache_enabled and question and not (used_tools or escalate):
+            if not _is_personalised(ctx, text):
+                response_cache.store(ctx.agent.id, branch_id, ctx.agent.company_id, question, text, standalone)
 
         logger.info("Step 7 - msg=%s: Agent done (escalate=%s)", msg_id, escalate)
         return AgentResponse(text=text, escalate=escalate, escalation_reason=escalation_reason)
 
+    def _tool_context(
+        self,
+        ctx: AgentRunContext,
+        branch_id: UUID,
+        conversation_id: UUID,
+        customer_phone: str,
+        customer_name: str | None,
+    ) -> ToolContext:
+        return ToolContext(
+            branch_id=branch_id,
+            company_id=ctx.agent.company_id,
+            conversation_id=conversation_id,
+            customer_phone=customer_phone,
+            customer_name=customer_name,
+            booking_service=self.booking_service,
+            scheduling_service=self.scheduling_service,
+        )
+
+    @staticmethod
+    def _terminal_reply(ctx: AgentRunContext, tool: BaseTool, result: dict, arguments: dict) -> str | None:
+        """Customer reply for a turn-ending tool, from its reply template; None falls back to an LLM round.
+
+        Templates are written by the business and may use placeholders the tool
+        has no value for; those never reach the customer as literal brackets.
+        """
+        template = ctx.templates.get(tool.reply_trigger) if tool.reply_trigger else None
+        if not template:
+            return None
+        visit_number = ctx.customer_history.next_visit_number if ctx.customer_history else 1
+        text = render_template(template, tool.reply_values(result, arguments, visit_number))
+        return None if has_placeholders(text) else text
+
+    async def _call_llm(
+        self,
+        model: str,
+        reason: str,
+        round_num: int,
+        messages: list[dict],
+        tool_schemas: list[dict] | None,
+        tool_choice: str,
+        fallback_models: list[str],
+        conversation_id: UUID,
+        branch_id: UUID,
+        company_id: UUID,
+        msg_id: str,
+    ) -> ChatCompletion:
+        """Run one LLM round and record which model served it, how long it took and its token usage."""
+        start = time.monotonic()
+        with tracing.span("llm", round=round_num + 1, reason=reason):
+            response, served_by = await resilient_completion(
+                [model, *(fallback_models or [])], messages, tool_schemas, msg_id=msg_id, tool_choice=tool_choice,
+            )
+            usage = response.usage
+            prompt_tokens = usage.prompt_tokens if usage else 0
+            completion_tokens = usage.completion_tokens if usage else 0
+            details = getattr(usage, "prompt_tokens_details", None)
+            cached_tokens = (details.cached_tokens or 0) if details else 0
+            tracing.annotate(
+                model=served_by, tokens_in=prompt_tokens, tokens_out=completion_tokens, tokens_cached=cached_tokens,
+            )
+        self.llm_call_writer.add({
+            "id": uuid.uuid4(),
+            "conversation_id": conversation_id,
+            "branch_id": branch_id,
+            "company_id": company_id,
+            "round": round_num + 1,
+            "model": served_by,
+            "reason": reason if served_by == model else "fallback",
+            "latency_ms": int((time.monotonic() - start) * 1000),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cached_tokens": cached_tokens,
+            "cost": estimate_cost(served_by, prompt_tokens, completion_tokens, cached_tokens),
+            "created_at": _dt.datetime.now(_dt.timezone.utc),
+        })
+        return response
+
+    async def handle_intent(
+        self,
+        conversation_id: UUID,
+        branch_id: UUID,
+        intent: str,
+        customer_phone: str = "",
+        customer_name: str | None = None,
+        msg_id: str = "",
+    ) -> AgentResponse | None:
+        """Answer a fast-path intent without calling the LLM.
+
+        Returns None when the intent can't be answered deterministically for this
+        customer/agent, in which case the caller should fall back to process().
+        """
+        key = (branch_id, conversation_id, customer_phone, customer_name)
+        ctx = await self._load_context(*key)
+        # Until this returns an answer, process() may pick the same context up
+        self._declined_ctx = (key, ctx)
+        if ctx is None:
+            return None
+
+        if intent == "greeting":
+            # Returning customers get a personalised welcome from the LLM instead
+            if not ctx.is_new_conversation or "greeting" not in ctx.templates:
+                return None
+            if ctx.customer_history is not None and ctx.customer_history.is_returning:
+                return None
+            text = render_template(ctx.templates["greeting"], {
+                "company_name": ctx.company.name if ctx.company else None,
+                "branch_name": ctx.branch.name if ctx.branch else None,
+            })
+            if has_placeholders(text):
+                return None
+
+        elif intent == "opening_hours":
+            if ctx.branch is None or not ctx.branch.operating_hours:
+                return None
+            text = format_opening_hours(ctx.branch.operating_hours)
+
+        elif intent in ("list_bookings", "cancel_booking"):
+            enabled = {**DEFAULT_TOOLS_ENABLED, **(ctx.agent.tools_enabled or {})}
+            tool = self.tool_registry.enabled_tools(enabled).get("list_bookings")
+            if tool is None:
+                return None
+            tool_context = self._tool_context(ctx, branch_id, conversation_id, customer_phone, customer_name)
+            result = await self.tool_executor.run(
+                tool=tool,
+                tool_name="list_bookings",
+                tool_call_id="",
+                arguments={},
+                context=tool_context,
+                conversation_id=conversation_id,
+                msg_id=msg_id,
+            )
+            if "error" in result:
+                return None
+            text = format_bookings(result["bookings"], for_cancellation=intent == "cancel_booking")
+
+        else:
+            return None
+
+        self._declined_ctx = None
+        logger.info("Step 4 - msg=%s: Answered intent %s without LLM", msg_id, intent)
+        return AgentResponse(text=text)
+
+    async def _load_context(
+        self, branch_id: UUID, conversation_id: UUID, customer_phone: str, customer_name: str | None
+    ) -> AgentRunContext | None:
+        """Load the turn's context, reusing the one a declined handle_intent just loaded."""
+        declined, self._declined_ctx = self._declined_ctx, None
+        if declined is not None and declined[0] == (branch_id, conversation_id, customer_phone, customer_name):
+            return declined[1]
+        with tracing.span("context_load"):
+            return await self.context_loader.load(branch_id, conversation_id, customer_phone, customer_name)
+
     async def resolve_template(self, agent_id: UUID | None, trigger: str) -> str:
         """Required by AgentServiceProtocol."""
         if agent_id is not None:
@@ -163,3 +400,23 @@ class AgentRunner:
             return default["content"]
 
         return "Let me connect you with our team. Someone will be with you shortly."
+
+
+def _is_personalised(ctx: AgentRunContext, text: str) -> bool:
+    """Whether a reply was written for this customer and must not be served to others.
+
+    Returning customers are welcomed back with their visit history in the
+    prompt, so anything said to them may lean on it. A new customer's opening
+    reply only carries the agent's own greeting, which suits any other opening
+    message to the same agent.
+    """
+    if ctx.customer_history is not None and ctx.customer_history.is_returning:
+        return True
+    return bool(ctx.customer_name and ctx.customer_name in text)
+
+
+def _latest_customer_text(recent_messages: list) -> str | None:
+    for msg in reversed(recent_messages):
+        if msg.role.value == "customer":
+            return msg.content
+    return None
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from app.domains.agent.templating import format_date
+
+_DAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+
+def format_opening_hours(operating_hours: dict) -> str:
+    lines = ["🕘 Our opening hours:"]
+    for day in _DAYS:
+        if day not in operating_hours:
+            continue
+        slot = operating_hours[day]
+        hours = f"{slot['open']}–{slot['close']}" if slot else "Closed"
+        lines.append(f"{day.capitalize()}: {hours}")
+    return "\n".join(lines)
+
+
+def format_bookings(bookings: list[dict], *, for_cancellation: bool = False) -> str:
+    if not bookings:
+        return "You don't have any upcoming bookings with us. Would you like to make one? 📅"
+
+    lines = ["Here are your upcoming bookings:"]
+    for i, b in enumerate(bookings, start=1):
+        lines.append(f"{i}. {b['service']} with {b['staff']} — {format_date(b['date'])} at {b['start_time']}")
+
+    if for_cancellation and len(bookings) == 1:
+        lines.append("\nShall I cancel this booking for you?")
+    elif for_cancellation:
+        lines.append("\nWhich booking would you like to cancel?")
+    else:
+        lines.append("\nWould you like to change or cancel any of these?")
+    return "\n".join(lines)
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import logging
+from uuid import UUID
+
+from app.domains.agent.models import KnowledgeEntry, KnowledgeEntryStatus
+from app.domains.agent.repositories.knowledge_entry import KnowledgeEntryRepository
+from app.domains.agent.repositories.knowledge_index import KnowledgeIndexRepository
+from app.domains.agent.retrieval.bm25 import BM25Index
+
+logger = logging.getLogger(__name__)
+
+
+def _entry_text(entry: KnowledgeEntry) -> str:
+    # The question carries most of the matching signal, so it is counted twice.
+    parts = [entry.question, entry.question, entry.answer]
+    if entry.category:
+        parts.append(entry.category)
+    return " ".join(parts)
+
+
+class KnowledgeIndexService:
+    """Keeps the per-agent BM25 index in sync with knowledge entries and queries it.
+
+    The index is updated one entry at a time on every knowledge-entry write and
+    persisted in knowledge_indexes, so a turn only loads one row instead of
+    re-tokenizing the whole knowledge base.
+    """
+
+    def __init__(
+        self,
+        index_repo: KnowledgeIndexRepository,
+        knowledge_repo: KnowledgeEntryRepository,
+    ) -> None:
+        self._index_repo = index_repo
+        self._knowledge_repo = knowledge_repo
+
+    async def load(self, agent_id: UUID) -> BM25Index:
+        row = await self._index_repo.get_by_agent_id(agent_id)
+        if row is not None:
+            return BM25Index.from_dict(row.data)
+        return await self.rebuild(agent_id)
+
+    async def rebuild(self, agent_id: UUID) -> BM25Index:
+        """Index every active entry from scratch — only needed for agents that predate the index.
+
+        The row is only inserted if it is still missing, so a rebuild never
+        overwrites an index another transaction has just updated.
+        """
+        index = await self._build(agent_id)
+        await self._index_repo.create(agent_id, index.to_dict())
+        return index
+
+    async def sync_entry(self, entry: KnowledgeEntry) -> None:
+        """Add, replace or drop a single entry depending on its current status."""
+        index = await self._load_for_update(entry.agent_id)
+        if entry.status == KnowledgeEntryStatus.active:
+            index.add(str(entry.id), _entry_text(entry))
+        else:
+            index.remove(str(entry.id))
+        await self._index_repo.save(entry.agent_id, index.to_dict())
+
+    async def remove_entry(self, agent_id: UUID, entry_id: UUID) -> None:
+        index = await self._load_for_update(agent_id)
+        if str(entry_id) not in index:
+            return
+        index.remove(str(entry_id))
+        await self._index_repo.save(agent_id, index.to_dict())
+
+    async def _load_for_update(self, agent_id: UUID) -> BM25Index:
+        """Load the index with its row locked until the transaction ends.
+
+        Concurrent entry writes for the same agent then apply one after the
+        other, each on top of the last committed index, instead of the later
+        save overwriting the earlier one.
+        """
+        row = await self._index_repo.get_by_agent_id(agent_id, for_update=True)
+        if row is None:
+            index = await self._build(agent_id)
+            # Our insert holds the new row's lock; on conflict wait for the other creator and use its row
+            if await self._index_repo.create(agent_id, index.to_dict()):
+                return index
+            row = await self._index_repo.get_by_agent_id(agent_id, for_update=True)
+            if row is None:
+                return index
+        return BM25Index.from_dict(row.data)
+
+    async def _build(self, agent_id: UUID) -> BM25Index:
+        entries = await self._knowledge_repo.list_active_by_agent(agent_id)
+        index = BM25Index()
+        for entry in entries:
+            index.add(str(entry.id), _entry_text(entry))
+        logger.info("Rebuilt knowledge index for agent %s (%d entries)", agent_id, len(index))
+        return index
+
+    async def select_relevant(self, agent_id: UUID, query: str, top_k: int) -> list[KnowledgeEntry]:
+        """Return the top_k active entries most relevant to query, best first.
+
+        Small knowledge bases (top_k entries or fewer) are returned whole.
+        """
+        index = await self.load(agent_id)
+        if len(index) <= top_k:
+            return await self._knowledge_repo.list_active_by_agent(agent_id)
+
+        hits = index.search(query, top_k)
+        if not hits:
+            return []
+
+        entry_ids = [UUID(doc_id) for doc_id, _ in hits]
+        entries = await self._knowledge_repo.list_active_by_ids(agent_id, entry_ids)
+        rank = {entry_id: i for i, entry_id in enumerate(entry_ids)}
+        entries.sort(key=lambda e: rank[e.id])
+        return entries
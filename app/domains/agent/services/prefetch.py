@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import datetime as _dt
+import logging
+import re
+from collections.abc import Callable
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import metrics, tracing
+from app.config import Config
+from app.db.base import get_session_factory
+from app.domains.agent.services.agent_context_loader import AgentRunContext
+from app.domains.agent.tools.base import BaseTool, ToolContext
+
+logger = logging.getLogger(__name__)
+
+# Cheap hints, deliberately loose: a wasted prefetch costs one read query,
+# a missed one costs nothing beyond today's behaviour.
+_AVAILABILITY_HINT = re.compile(
+    r"\b(book|booking|appointment|available|availability|slot|free|opening|reserve|schedule|"
+    r"today|tomorrow|tonight|next week|this week|monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b",
+    re.IGNORECASE,
+)
+_BOOKINGS_HINT = re.compile(
+    r"\b(my (booking|bookings|appointment|appointments|reservation)|cancel|reschedule|change|move|postpone)\b",
+    re.IGNORECASE,
+)
+
+# Tools that change bookings; after one runs, prefetched reads are stale
+_WRITE_TOOLS = {"book_appointment", "edit_booking", "cancel_booking"}
+
+
+@dataclasses.dataclass
+class _Prefetched:
+    arguments: dict[str, Any]
+    task: asyncio.Task
+
+
+class TurnPrefetch:
+    """Speculative tool results for one agent turn, keyed by tool name."""
+
+    def __init__(self) -> None:
+        self._entries: dict[str, _Prefetched] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self._entries)
+
+    def add(self, tool_name: str, arguments: dict[str, Any], task: asyncio.Task) -> None:
+        self._entries[tool_name] = _Prefetched(arguments, task)
+
+    async def take(self, tool: BaseTool, arguments: dict[str, Any]) -> dict | None:
+        """Prefetched result answering this call, or None if the call must run for real."""
+        if tool.name in _WRITE_TOOLS:
+            self.close()
+            return None
+        entry = self._entries.get(tool.name)
+        if entry is None:
+            return None
+        try:
+            prefetched = await entry.task
+        except Exception:
+            prefetched = None
+        result = tool.reuse_prefetched(entry.arguments, prefetched, arguments) if prefetched else None
+        metrics.incr("agent.prefetch.hit" if result is not None else "agent.prefetch.miss")
+        return result
+
+    def close(self) -> None:
+        """Cancel outstanding prefetches and forget all results."""
+        for entry in self._entries.values():
+            entry.task.cancel()
+        self._entries.clear()
+
+
+class SpeculativePrefetcher:
+    """Starts likely read-only tool calls in parallel with the first LLM round.
+
+    Each prefetch runs in its own session (the request session stays free for
+    the agent loop) and only reads, so a wrong guess is harmless.
+    """
+
+    def __init__(
+        self,
+        bind_services: Callable[[AsyncSession], dict[str, Any]],
+        window_days: int = Config.AGENT_PREFETCH_DAYS,
+    ) -> None:
+        self._bind_services = bind_services
+        self._window_days = window_days
+
+    def start(
+        self,
+        ctx: AgentRunContext,
+        question: str | None,
+        tools_map: dict[str, BaseTool],
+        tool_context: ToolContext,
+    ) -> TurnPrefetch:
+        prefetch = TurnPrefetch()
+        if not question:
+            return prefetch
+        for tool_name, arguments in self._plan(ctx, question):
+            tool = tools_map.get(tool_name)
+            if tool is None:
+                continue
+            task = asyncio.create_task(self._run(tool, arguments, tool_context), name=f"prefetch-{tool_name}")
+            task.add_done_callback(_log_failure)
+            prefetch.add(tool_name, arguments, task)
+            metrics.incr("agent.prefetch.started")
+        return prefetch
+
+    def _plan(self, ctx: AgentRunContext, question: str) -> list[tuple[str, dict[str, Any]]]:
+        plan: list[tuple[str, dict[str, Any]]] = []
+        if _BOOKINGS_HINT.search(question) and ctx.customer_phone:
+            plan.append(("list_bookings", {}))
+        elif _AVAILABILITY_HINT.search(question):
+            service_id = self._likely_service_id(ctx)
+            if service_id is not None:
+                today = _dt.date.today()
+                plan.append(("check_availability", {
+                    "service_id": str(service_id),
+                    "date_from": today.isoformat(),
+                    "date_to": (today + _dt.timedelta(days=self._window_days - 1)).isoformat(),
+                }))
+        return plan
+
+    @staticmethod
+    def _likely_service_id(ctx: AgentRunContext) -> UUID | None:
+        active_ids = {s.id for s in ctx.active_services}
+        history = ctx.customer_history
+        if history is not None and history.preferred_service_id in active_ids:
+            return history.preferred_service_id
+        if len(active_ids) == 1:
+            return next(iter(active_ids))
+        return None
+
+    async def _run(self, tool: BaseTool, arguments: dict[str, Any], tool_context: ToolContext) -> dict:
+        tracing.detach_trace()
+        async with get_session_factory()() as session:
+            context = dataclasses.replace(tool_context, prefetch=None, **self._bind_services(session))
+            return await tool.execute(arguments, context)
+
+
+def _log_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Prefetch %s failed: %r", task.get_name(), task.exception())
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import dataclasses
+import logging
+import re
+import time
+from collections import OrderedDict
+from uuid import UUID
+
+from app import metrics
+from app.config import Config
+from app.domains.agent.models import KnowledgeEntry
+from app.domains.agent.retrieval.bm25 import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Questions mentioning any of these are likely to need a tool (availability, bookings)
+# and are never answered from the cache.
+_TOOL_HINTS = re.compile(
+    r"\b(book|booking|bookings|appointment|reserve|reschedule|cancel|change|move|available|availability|"
+    r"slot|slots|today|tomorrow|tonight|monday|tuesday|wednesday|thursday|friday|saturday|sunday|"
+    r"next week|this week)\b"
+)
+
+
+def normalize_question(text: str) -> frozenset[str]:
+    return frozenset(tokenize(text))
+
+
+def _similarity(a: frozenset[str], b: frozenset[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+@dataclasses.dataclass
+class _CachedAnswer:
+    question: frozenset[str]
+    answer: str
+    stored_at: float
+
+
+@dataclasses.dataclass
+class _AgentCache:
+    branch_id: UUID
+    company_id: UUID
+    answers: OrderedDict[frozenset[str], _CachedAnswer] = dataclasses.field(default_factory=OrderedDict)
+    hits: int = 0
+    misses: int = 0
+
+
+class ResponseCache:
+    """Per-agent cache of answers to FAQ-style questions, shared by all requests in the process.
+
+    A question is answered from the cache when its normalized token set is similar
+    enough (Jaccard >= threshold) to a knowledge-entry question or to a question the
+    LLM already answered without calling any tools. Entries are dropped whenever the
+    agent's knowledge base, the company catalogue or the branch changes.
+
+    LLM answers are only learned from, and only served to, standalone questions:
+    the opening message of a conversation with at least `min_tokens` content
+    tokens. A short follow-up ("how much?") means something different in every
+    conversation, so it can only match a knowledge entry.
+    """
+
+    def __init__(
+        self, threshold: float, ttl_seconds: int, max_entries_per_agent: int, min_tokens: int
+    ) -> None:
+        self._threshold = threshold
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries_per_agent
+        self._min_tokens = min_tokens
+        self._agents: dict[UUID, _AgentCache] = {}
+
+    def lookup(
+        self,
+        agent_id: UUID,
+        branch_id: UUID,
+        company_id: UUID,
+        question: str,
+        knowledge_entries: list[KnowledgeEntry],
+        standalone: bool,
+    ) -> str | None:
+        cache = self._get_or_create(agent_id, branch_id, company_id)
+        answer = self._find(cache, question, knowledge_entries, standalone)
+        if answer is None:
+            cache.misses += 1
+            metrics.incr("response_cache.miss")
+        else:
+            cache.hits += 1
+            metrics.incr("response_cache.hit")
+        return answer
+
+    def store(
+        self, agent_id: UUID, branch_id: UUID, company_id: UUID, question: str, answer: str, standalone: bool
+    ) -> None:
+        normalized = normalize_question(question)
+        if not standalone or len(normalized) < self._min_tokens or _TOOL_HINTS.search(question.lower()):
+            return
+        cache = self._get_or_create(agent_id, branch_id, company_id)
+        cache.answers[normalized] = _CachedAnswer(normalized, answer, time.monotonic())
+        cache.answers.move_to_end(normalized)
+        while len(cache.answers) > self._max_entries:
+            cache.answers.popitem(last=False)
+
+    # ── Invalidation ──────────────────────────────────────────────────────
+
+    def invalidate_agent(self, agent_id: UUID) -> None:
+        cache = self._agents.get(agent_id)
+        if cache is not None:
+            cache.answers.clear()
+            metrics.incr("response_cache.invalidation")
+
+    def invalidate_branch(self, branch_id: UUID) -> None:
+        for agent_id, cache in self._agents.items():
+            if cache.branch_id == branch_id:
+                self.invalidate_agent(agent_id)
+
+    def invalidate_company(self, company_id: UUID) -> None:
+        for agent_id, cache in self._agents.items():
+            if cache.company_id == company_id:
+                self.invalidate_agent(agent_id)
+
+    def stats(self, agent_id: UUID) -> dict:
+        cache = self._agents.get(agent_id)
+        if cache is None:
+            return {"entries": 0, "hits": 0, "misses": 0, "hit_rate": 0.0}
+        lookups = cache.hits + cache.misses
+        return {
+            "entries": len(cache.answers),
+            "hits": cache.hits,
+            "misses": cache.misses,
+            "hit_rate": round(cache.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    # ── Internals ─────────────────────────────────────────────────────────
+
+    def _get_or_create(self, agent_id: UUID, branch_id: UUID, company_id: UUID) -> _AgentCache:
+        cache = self._agents.get(agent_id)
+        if cache is None:
+            cache = _AgentCache(branch_id=branch_id, company_id=company_id)
+            self._agents[agent_id] = cache
+        return cache
+
+    def _find(
+        self, cache: _AgentCache, question: str, knowledge_entries: list[KnowledgeEntry], standalone: bool
+    ) -> str | None:
+        normalized = normalize_question(question)
+        if not normalized or _TOOL_HINTS.search(question.lower()):
+            return None
+
+        for entry in knowledge_entries:
+            if _similarity(normalized, normalize_question(entry.question)) >= self._threshold:
+                return entry.answer
+
+        if not standalone or len(normalized) < self._min_tokens:
+            return None
+
+        now = time.monotonic()
+        best: _CachedAnswer | None = None
+        best_score = self._threshold
+        for key, cached in list(cache.answers.items()):
+            if now - cached.stored_at > self._ttl:
+                del cache.answers[key]
+                continue
+            score = _similarity(normalized, cached.question)
+            if score >= best_score:
+                best, best_score = cached, score
+        if best is None:
+            return None
+        cache.answers.move_to_end(best.question)
+        return best.answer
+
+
+response_cache = ResponseCache(
+    threshold=Config.RESPONSE_CACHE_THRESHOLD,
+    ttl_seconds=Config.RESPONSE_CACHE_TTL_SECONDS,
+    max_entries_per_agent=Config.RESPONSE_CACHE_MAX_ENTRIES,
+    min_tokens=Config.RESPONSE_CACHE_MIN_TOKENS,
+)
@@ -1,20 +1,25 @@
 from __future__ import annotations
 
+import datetime as _dt
 import logging
 import time
+import uuid
 from uuid import UUID
 
-from app.domains.agent.repositories.tool_execution import ToolExecutionRepository
+from app import tracing
+from app.db.buffered_writer import BufferedWriter
+from app.domains.agent.audit import truncate_output
+from app.domains.agent.models import ToolExecutionStatus
 from app.domains.agent.tools.base import BaseTool, ToolContext
 
 logger = logging.getLogger(__name__)
 
 
 class ToolExecutor:
-    """Runs a tool call, logs the ToolExecution audit record, and returns the result."""
+    """Runs a tool call, queues the ToolExecution audit record, and returns the result."""
 
-    def __init__(self, tool_execution_repo: ToolExecutionRepository) -> None:
-        self._repo = tool_execution_repo
+    def __init__(self, audit_writer: BufferedWriter) -> None:
+        self._audit_writer = audit_writer
 
     async def run(
         self,
@@ -27,23 +32,32 @@ class ToolExecutor:
         msg_id: str = "",
     ) -> dict:
         start_ms = time.monotonic()
-        exec_status = "success"
-        try:
-            result = await tool.execute(arguments, context)
-        except Exception as exc:
-            logger.exception("Step 5 - msg=%s: Tool %s failed", msg_id, tool_name)
-            result = {"error": str(exc)}
-            exec_status = "failure"
+        exec_status = ToolExecutionStatus.success
+        with tracing.span("tool", tool=tool_name):
+            result = await context.prefetch.take(tool, arguments) if context.prefetch else None
+            if result is not None:
+                tracing.annotate(prefetched=True)
+            else:
+                try:
+                    result = await tool.execute(arguments, context)
+                except Exception as exc:
+                    logger.exception("Step 5 - msg=%s: Tool %s failed", msg_id, tool_name)
+                    result = {"error": str(exc)}
+                    exec_status = ToolExecutionStatus.failure
 
         duration_ms = int((time.monotonic() - start_ms) * 1000)
-        logger.info("Step 5 - msg=%s: Tool %s %s (%dms)", msg_id, tool_name, exec_status, duration_ms)
-
-        await self._repo.create(
-            conversation_id=conversation_id,
-            tool=tool_name,
-            input=arguments,
-            output=result,
-            status=exec_status,
-            duration_ms=duration_ms,
-        )
+        logger.info("Step 5 - msg=%s: Tool %s %s (%dms)", msg_id, tool_name, exec_status.value, duration_ms)
+
+        # Written in bulk by the background flusher — no round-trip on the agent loop
+        self._audit_writer.add({
+            "id": uuid.uuid4(),
+            "conversation_id": conversation_id,
+            "message_id": None,
+            "tool": tool_name,
+            "input": arguments,
+            "output": truncate_output(result),
+            "status": exec_status,
+            "duration_ms": duration_ms,
+            "created_at": _dt.datetime.now(_dt.timezone.utc),
+        })
         return result
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import datetime as _dt
+import re
+
+_PLACEHOLDER_RE = re.compile(r"\[([a-z_]+)\]")
+
+# Visit numbers worth celebrating in a booking confirmation
+MILESTONE_VISITS = {5, 10, 25, 50, 100}
+
+
+def render_template(content: str, values: dict[str, object]) -> str:
+    """Substitute [placeholder] variables in a reply template.
+
+    Placeholders without a value are left untouched.
+    """
+    return _PLACEHOLDER_RE.sub(
+        lambda m: str(values[m.group(1)]) if values.get(m.group(1)) is not None else m.group(0),
+        content,
+    )
+
+
+def has_placeholders(text: str) -> bool:
+    """Whether a rendered template still contains a [placeholder] that had no value."""
+    return _PLACEHOLDER_RE.search(text) is not None
+
+
+def booking_values(booking: dict, visit_number: int | None = None) -> dict[str, object]:
+    """Template values for a booking tool result.
+
+    Placeholders: [service], [staff], [date], [time], [end_time], [price],
+    [visit_number] and [milestone] (a congratulation line on milestone visits,
+    otherwise empty).
+    """
+    milestone = ""
+    if visit_number in MILESTONE_VISITS:
+        milestone = f"\n\n🎉 This will be your {ordinal(visit_number)} visit with us — thank you for being with us!"
+    return {
+        "service": booking.get("service"),
+        "staff": booking.get("staff"),
+        "date": format_date(booking["date"]) if booking.get("date") else None,
+        "time": booking.get("start_time"),
+        "end_time": booking.get("end_time"),
+        "price": format_price(booking.get("price"), booking.get("currency")),
+        "visit_number": visit_number,
+        "milestone": milestone,
+    }
+
+
+def format_date(iso_date: str) -> str:
+    return _dt.date.fromisoformat(iso_date).strftime("%a, %b %d")
+
+
+def format_price(amount: float | None, currency: str | None) -> str | None:
+    if amount is None:
+        return None
+    value = f"{amount:,.0f}" if float(amount).is_integer() else f"{amount:,.2f}"
+    return f"{currency} {value}" if currency else value
+
+
+def ordinal(n: int) -> str:
+    suffix = "th" if 10 <= n % 100 <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
+    return f"{n}{suffix}"
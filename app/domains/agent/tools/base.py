@@ -2,21 +2,41 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from uuid import UUID
 
+if TYPE_CHECKING:
+    from app.domains.agent.services.prefetch import TurnPrefetch
+    from app.domains.company.services.booking_service import BookingService
+    from app.domains.company.services.scheduling_service import SchedulingService
+
 
 @dataclass
 class ToolContext:
-    """Runtime context passed to every tool execution."""
+    """Runtime context passed to every tool execution.
+
+    Tools are stateless singletons shared by all requests; request-scoped
+    services (bound to the request's DB session) travel here instead.
+    """
     branch_id: UUID
     company_id: UUID
     conversation_id: UUID
     customer_phone: str
     customer_name: str | None
+    booking_service: BookingService
+    scheduling_service: SchedulingService
+    # Speculative results started alongside the first LLM round, if enabled
+    prefetch: TurnPrefetch | None = None
 
 
 class BaseTool(ABC):
+    # Max size of the shaped result sent to the LLM; None uses TOOL_RESULT_BUDGET_TOKENS
+    result_budget_tokens: int | None = None
+    # Reply template trigger sent to the customer when this tool ends the turn
+    reply_trigger: str | None = None
+    # Only end the turn when the agent has template_replies_enabled (replies the LLM would otherwise compose)
+    template_reply_opt_in: bool = False
+
     @property
     @abstractmethod
     def name(self) -> str: ...
@@ -32,6 +52,25 @@ class BaseTool(ABC):
     @abstractmethod
     async def execute(self, arguments: dict[str, Any], context: ToolContext) -> dict: ...
 
+    def shape(self, result: dict, arguments: dict[str, Any]) -> dict:
+        """Compact form of a successful result for the LLM. execute() output is kept as-is for audit."""
+        return result
+
+    def ends_turn(self, result: dict) -> bool:
+        """Whether this result finishes the turn, so the reply comes from reply_trigger instead of another LLM round."""
+        return False
+
+    def reply_values(self, result: dict, arguments: dict[str, Any], visit_number: int | None) -> dict[str, object]:
+        """Placeholder values for the reply_trigger template; visit_number is the customer's upcoming visit."""
+        return {}
+
+    def reuse_prefetched(self, prefetched_args: dict[str, Any], prefetched: dict, arguments: dict[str, Any]) -> dict | None:
+        """Answer a call from a speculatively fetched result, or None if it doesn't cover the call.
+
+        Tools whose results can be narrowed (e.g. a date range) override this.
+        """
+        return prefetched if arguments == prefetched_args else None
+
     def to_openai_schema(self) -> dict:
         return {
             "type": "function",
@@ -5,15 +5,14 @@ import datetime as _dt
 from typing import Any
 from uuid import UUID
 
+from app.domains.agent.templating import booking_values
 from app.domains.agent.tools.base import BaseTool, ToolContext
-from app.domains.company.services.booking_service import AgentBookingResult, BookingService
-from app.domains.company.services.scheduling_service import SchedulingService
+from app.domains.company.services.booking_service import AgentBookingResult
 
 
 class BookAppointmentTool(BaseTool):
-    def __init__(self, booking_service: BookingService, scheduling_service: SchedulingService) -> None:
-        self._booking_svc = booking_service
-        self._scheduling_svc = scheduling_service
+    reply_trigger = "booking_confirmed"
+    template_reply_opt_in = True
 
     @property
     def name(self) -> str:
@@ -44,7 +43,7 @@ class BookAppointmentTool(BaseTool):
         start_time = _dt.time.fromisoformat(arguments["start_time"])
         customer_name = arguments.get("customer_name") or context.customer_name or ""
 
-        result = await self._booking_svc.create_from_agent(
+        result = await context.booking_service.create_from_agent(
             branch_id=context.branch_id,
             company_id=context.company_id,
             staff_id=staff_id,
@@ -54,7 +53,7 @@ class BookAppointmentTool(BaseTool):
             customer_phone=context.customer_phone,
             customer_name=customer_name,
             conversation_id=context.conversation_id,
-            scheduling_service=self._scheduling_svc,
+            scheduling_service=context.scheduling_service,
         )
 
         if isinstance(result, dict):
@@ -72,3 +71,9 @@ class BookAppointmentTool(BaseTool):
             "currency": result.currency,
             "status": "confirmed",
         }
+
+    def ends_turn(self, result: dict) -> bool:
+        return "error" not in result
+
+    def reply_values(self, result: dict, arguments: dict[str, Any], visit_number: int | None) -> dict[str, object]:
+        return booking_values(result, visit_number)
@@ -4,13 +4,9 @@ from typing import Any
 from uuid import UUID
 
 from app.domains.agent.tools.base import BaseTool, ToolContext
-from app.domains.company.services.booking_service import BookingService
 
 
 class CancelBookingTool(BaseTool):
-    def __init__(self, booking_service: BookingService) -> None:
-        self._booking_svc = booking_service
-
     @property
     def name(self) -> str:
         return "cancel_booking"
@@ -34,4 +30,4 @@ class CancelBookingTool(BaseTool):
 
     async def execute(self, arguments: dict[str, Any], context: ToolContext) -> dict:
         booking_id = UUID(arguments["booking_id"])
-        return await self._booking_svc.cancel_from_agent(booking_id, context.branch_id)
+        return await context.booking_service.cancel_from_agent(booking_id, context.branch_id)
@@ -1,17 +1,15 @@
 from __future__ import annotations
 
 import datetime as _dt
+import json
 from typing import Any
 from uuid import UUID
 
+from app.config import Config
 from app.domains.agent.tools.base import BaseTool, ToolContext
-from app.domains.company.services.scheduling_service import SchedulingService
 
 
 class CheckAvailabilityTool(BaseTool):
-    def __init__(self, scheduling_service: SchedulingService) -> None:
-        self._scheduling = scheduling_service
-
     @property
     def name(self) -> str:
         return "check_availability"
@@ -40,7 +38,7 @@ class CheckAvailabilityTool(BaseTool):
         date_to = _dt.date.fromisoformat(arguments["date_to"])
 
         try:
-            result = await self._scheduling.check_availability(
+            result = await context.scheduling_service.check_availability(
                 service_id=service_id,
                 branch_id=context.branch_id,
                 date_from=date_from,
@@ -61,3 +59,64 @@ class CheckAvailabilityTool(BaseTool):
                 for date, staff in result.slots_by_date.items()
             ],
         }
+
+    def reuse_prefetched(self, prefetched_args: dict[str, Any], prefetched: dict, arguments: dict[str, Any]) -> dict | None:
+        """Narrow a prefetched all-staff result to the requested dates and staff member."""
+        if "error" in prefetched or arguments.get("service_id") != prefetched_args["service_id"]:
+            return None
+        if prefetched_args.get("staff_id") and arguments.get("staff_id") != prefetched_args["staff_id"]:
+            return None
+        try:
+            date_from = _dt.date.fromisoformat(arguments["date_from"])
+            date_to = _dt.date.fromisoformat(arguments["date_to"])
+        except (KeyError, TypeError, ValueError):
+            return None
+        if date_from < _dt.date.fromisoformat(prefetched_args["date_from"]) or date_to > _dt.date.fromisoformat(prefetched_args["date_to"]):
+            return None
+
+        staff_id = arguments.get("staff_id")
+        availability = []
+        for day in prefetched.get("availability", []):
+            if not date_from.isoformat() <= day["date"] <= date_to.isoformat():
+                continue
+            staff = [s for s in day["staff"] if not staff_id or s["staff_id"] == staff_id]
+            if staff:
+                availability.append({"date": day["date"], "staff": staff})
+        if not availability:
+            return {"availability": [], "message": "No staff assigned to this service"}
+        return {**prefetched, "availability": availability}
+
+    def shape(self, result: dict, arguments: dict[str, Any]) -> dict:
+        """Group free windows per day under short staff aliases, stopping at the token budget.
+
+        {"svc": "Haircut", "dur": 45,
+         "staff": {"s1": ["<staff_id>", "Anna"]},
+         "days": {"2025-03-04": {"s1": "09:00-12:00,13:00-17:00"}},
+         "more_from": "2025-03-09"}
+        """
+        if not result.get("availability"):
+            return result
+
+        aliases: dict[str, str] = {}
+        staff: dict[str, list[str]] = {}
+        days: dict[str, dict[str, str]] = {}
+        shaped = {"svc": result["service"], "dur": result["duration_minutes"], "staff": staff, "days": days}
+        max_chars = (self.result_budget_tokens or Config.TOOL_RESULT_BUDGET_TOKENS) * 4 - 200
+
+        size = 0
+        for day in result["availability"]:
+            entry: dict[str, str] = {}
+            for s in day["staff"]:
+                alias = aliases.get(s["staff_id"])
+                if alias is None:
+                    alias = aliases[s["staff_id"]] = f"s{len(aliases) + 1}"
+                    staff[alias] = [s["staff_id"], s["staff_name"]]
+                    size += len(s["staff_id"]) + len(s["staff_name"]) + 16
+                entry[alias] = ",".join(s["windows"])
+            size += len(json.dumps(entry)) + 16
+            if days and size > max_chars:
+                shaped["more_from"] = day["date"]
+                shaped["note"] = "More availability exists; call again with date_from=more_from if needed."
+                break
+            days[day["date"]] = entry
+        return shaped
@@ -4,15 +4,14 @@ import datetime as _dt
 from typing import Any
 from uuid import UUID
 
+from app.domains.agent.templating import booking_values
 from app.domains.agent.tools.base import BaseTool, ToolContext
-from app.domains.company.services.booking_service import AgentBookingResult, BookingService
-from app.domains.company.services.scheduling_service import SchedulingService
+from app.domains.company.services.booking_service import AgentBookingResult
 
 
 class EditBookingTool(BaseTool):
-    def __init__(self, booking_service: BookingService, scheduling_service: SchedulingService) -> None:
-        self._booking_svc = booking_service
-        self._scheduling_svc = scheduling_service
+    reply_trigger = "booking_confirmed"
+    template_reply_opt_in = True
 
     @property
     def name(self) -> str:
@@ -42,10 +41,10 @@ class EditBookingTool(BaseTool):
     async def execute(self, arguments: dict[str, Any], context: ToolContext) -> dict:
         booking_id = UUID(arguments["booking_id"])
 
-        result = await self._booking_svc.edit_from_agent(
+        result = await context.booking_service.edit_from_agent(
             booking_id=booking_id,
             branch_id=context.branch_id,
-            scheduling_service=self._scheduling_svc,
+            scheduling_service=context.scheduling_service,
             date=_dt.date.fromisoformat(arguments["date"]) if "date" in arguments else None,
             start_time=_dt.time.fromisoformat(arguments["start_time"]) if "start_time" in arguments else None,
             staff_id=UUID(arguments["staff_id"]) if "staff_id" in arguments else None,
@@ -68,3 +67,10 @@ class EditBookingTool(BaseTool):
             "status": "confirmed",
             "message": "Booking has been updated successfully.",
         }
+
+    def ends_turn(self, result: dict) -> bool:
+        return "error" not in result
+
+    def reply_values(self, result: dict, arguments: dict[str, Any], visit_number: int | None) -> dict[str, object]:
+        # Moving a booking is not a new visit: no visit number, no milestone line
+        return booking_values(result)
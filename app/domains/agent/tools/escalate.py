@@ -6,6 +6,8 @@ from app.domains.agent.tools.base import BaseTool, ToolContext
 
 
 class EscalateTool(BaseTool):
+    reply_trigger = "escalation"
+
     @property
     def name(self) -> str:
         return "escalate"
@@ -32,3 +34,6 @@ class EscalateTool(BaseTool):
             "escalate": True,
             "reason": arguments.get("reason", "Customer requested human assistance"),
         }
+
+    def ends_turn(self, result: dict) -> bool:
+        return bool(result.get("escalate"))
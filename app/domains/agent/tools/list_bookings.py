@@ -3,13 +3,12 @@ from __future__ import annotations
 from typing import Any
 
 from app.domains.agent.tools.base import BaseTool, ToolContext
-from app.domains.company.services.booking_service import BookingService
 
 
-class ListBookingsTool(BaseTool):
-    def __init__(self, booking_service: BookingService) -> None:
-        self._booking_svc = booking_service
+_PAGE_SIZE = 10
+
 
+class ListBookingsTool(BaseTool):
     @property
     def name(self) -> str:
         return "list_bookings"
@@ -26,7 +25,9 @@ class ListBookingsTool(BaseTool):
     def parameters(self) -> dict:
         return {
             "type": "object",
-            "properties": {},
+            "properties": {
+                "page": {"type": "integer", "description": "Page of results (10 per page), default 1"},
+            },
         }
 
     async def execute(self, arguments: dict[str, Any], context: ToolContext) -> dict:
@@ -34,7 +35,7 @@ class ListBookingsTool(BaseTool):
         if not phone:
             return {"error": "missing_phone", "message": "Unable to identify the customer."}
 
-        bookings = await self._booking_svc.list_for_customer(
+        bookings = await context.booking_service.list_for_customer(
             branch_id=context.branch_id,
             customer_phone=phone,
         )
@@ -58,3 +59,36 @@ class ListBookingsTool(BaseTool):
             }
             for b in bookings
         ]}
+
+    def reuse_prefetched(self, prefetched_args: dict[str, Any], prefetched: dict, arguments: dict[str, Any]) -> dict | None:
+        # execute() ignores paging (shape() pages), so any prefetched listing answers any call
+        return prefetched
+
+    def shape(self, result: dict, arguments: dict[str, Any]) -> dict:
+        """One row per booking under a shared header, 10 per page."""
+        bookings = result.get("bookings")
+        if not bookings:
+            return result
+        page = _page(arguments.get("page"))
+        start = (page - 1) * _PAGE_SIZE
+        rows = bookings[start:start + _PAGE_SIZE]
+        shaped: dict = {
+            "cols": ["booking_id", "service", "staff", "date", "start", "end", "price"],
+            "rows": [
+                [b["booking_id"], b["service"], b["staff"], b["date"], b["start_time"], b["end_time"], b["price"]]
+                for b in rows
+            ],
+            "currency": bookings[0]["currency"],
+            "total": len(bookings),
+        }
+        if start + _PAGE_SIZE < len(bookings):
+            shaped["next_page"] = page + 1
+        return shaped
+
+
+def _page(value: Any) -> int:
+    """The LLM may send the page as anything (a string, a float, junk); fall back to page 1."""
+    try:
+        return max(int(value or 1), 1)
+    except (TypeError, ValueError, OverflowError):
+        return 1
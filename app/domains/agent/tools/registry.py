@@ -1,35 +1,55 @@
 from __future__ import annotations
 
-from typing import Callable
-
 from app.domains.agent.tools.base import BaseTool
 
 
 class ToolRegistry:
-    """Central registry mapping tool names to factory callables.
+    """Central registry of stateless tool instances.
 
-    Factories receive their dependencies at registration time (via closure),
-    so the registry itself has no dependencies.
+    Tools are registered once at startup and the registry is then frozen. Tool
+    maps and OpenAI schema lists are memoized per set of enabled tools, so a turn
+    costs a dict lookup instead of constructing tools and serializing schemas.
 
     Usage:
         registry = ToolRegistry()
-        registry.register("check_availability", lambda: CheckAvailabilityTool(scheduling_svc))
-        enabled_tools = registry.build_enabled({"check_availability": True})
+        registry.register(CheckAvailabilityTool())
+        registry.freeze()
+        tools = registry.enabled_tools({"check_availability": True})
+        schemas = registry.schemas({"check_availability": True})
     """
 
     def __init__(self) -> None:
-        self._factories: dict[str, Callable[[], BaseTool]] = {}
-
-    def register(self, name: str, factory: Callable[[], BaseTool]) -> None:
-        self._factories[name] = factory
-
-    def build_enabled(self, enabled_map: dict[str, bool]) -> dict[str, BaseTool]:
-        """Build only the tools that are enabled according to the agent config."""
-        result: dict[str, BaseTool] = {}
-        for name, enabled in enabled_map.items():
-            if enabled and name in self._factories:
-                result[name] = self._factories[name]()
-        return result
+        self._tools: dict[str, BaseTool] = {}
+        self._frozen = False
+        self._tool_maps: dict[frozenset[str], dict[str, BaseTool]] = {}
+        self._schemas: dict[frozenset[str], list[dict]] = {}
+
+    def register(self, tool: BaseTool) -> None:
+        if self._frozen:
+            raise RuntimeError("ToolRegistry is frozen")
+        self._tools[tool.name] = tool
+
+    def freeze(self) -> ToolRegistry:
+        self._frozen = True
+        return self
+
+    def enabled_tools(self, enabled_map: dict[str, bool]) -> dict[str, BaseTool]:
+        """Tools that are enabled according to the agent config. The returned dict is shared — don't mutate it."""
+        key = self._key(enabled_map)
+        tools = self._tool_maps.get(key)
+        if tools is None:
+            tools = {name: self._tools[name] for name in self._tools if name in key}
+            self._tool_maps[key] = tools
+        return tools
+
+    def schemas(self, enabled_map: dict[str, bool]) -> list[dict] | None:
+        key = self._key(enabled_map)
+        if key not in self._schemas:
+            self._schemas[key] = [t.to_openai_schema() for t in self.enabled_tools(enabled_map).values()]
+        return self._schemas[key] or None
 
     def all_registered(self) -> list[str]:
-        return list(self._factories.keys())
+        return list(self._tools.keys())
+
+    def _key(self, enabled_map: dict[str, bool]) -> frozenset[str]:
+        return frozenset(name for name, enabled in enabled_map.items() if enabled and name in self._tools)
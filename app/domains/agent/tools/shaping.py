@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import json
+
+from app.config import Config
+from app.domains.agent.tools.base import BaseTool
+
+# Rough chars-per-token ratio used to turn token budgets into string lengths
+_CHARS_PER_TOKEN = 4
+
+_STALE_RESULT = '{"elided":true,"note":"Earlier tool result removed to save space; call the tool again if needed."}'
+
+
+def encode_tool_result(tool: BaseTool | None, result: dict, arguments: dict) -> str:
+    """Serialize a tool result for the LLM: tool-specific compact shape, minimal JSON, hard size cap."""
+    shaped = tool.shape(result, arguments) if tool is not None and "error" not in result else result
+    encoded = _dumps(shaped)
+
+    budget_tokens = tool.result_budget_tokens if tool is not None else None
+    max_chars = (budget_tokens or Config.TOOL_RESULT_BUDGET_TOKENS) * _CHARS_PER_TOKEN
+    if len(encoded) <= max_chars:
+        return encoded
+    # Tools should page/summarize within their budget; this is the last-resort cut.
+    return _dumps({
+        "truncated": True,
+        "note": "Result too large; narrow the request (e.g. a shorter date range).",
+        "partial": encoded[:max_chars],
+    })
+
+
+def elide_stale_tool_results(messages: list[dict], keep_last_rounds: int) -> None:
+    """Replace tool results from all but the latest rounds with a short stub, in place.
+
+    Tool-call/result pairing is kept intact so the conversation stays valid; only
+    the payloads stop being re-sent on every later round.
+    """
+    rounds = [i for i, m in enumerate(messages) if m["role"] == "assistant" and m.get("tool_calls")]
+    if len(rounds) <= keep_last_rounds:
+        return
+    cutoff = rounds[-keep_last_rounds]
+    for message in messages[:cutoff]:
+        if message["role"] == "tool":
+            message["content"] = _STALE_RESULT
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
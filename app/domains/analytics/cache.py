@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import datetime
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import metrics
+from app.config import Config
+from app.db.base import get_read_session_factory
+
+logger = logging.getLogger(__name__)
+
+Loader = Callable[[AsyncSession], Awaitable[dict]]
+
+
+@dataclasses.dataclass
+class _Entry:
+    value: dict
+    stored_at: float
+
+
+class AnalyticsCache:
+    """Process-wide cache of dashboard payloads, shared by every member polling a company.
+
+    Keys are (kind, company_id, branch_id, today, *params), so a new day never
+    serves yesterday's trend. Within `ttl` an entry is served as is; for a
+    further `stale_seconds` it is still served while one background task
+    reloads it; after that callers wait for a fresh load. Concurrent callers of
+    the same key share one in-flight load.
+    """
+
+    def __init__(self, ttl: float, stale_seconds: float, max_entries: int) -> None:
+        self._ttl = ttl
+        self._stale = stale_seconds
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self._refreshes: set[asyncio.Task] = set()
+
+    async def get(
+        self,
+        kind: str,
+        company_id: UUID,
+        branch_id: UUID | None,
+        params: tuple[Hashable, ...],
+        load: Loader,
+        session: AsyncSession,
+    ) -> dict:
+        key = (kind, company_id, branch_id, datetime.date.today(), *params)
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry.stored_at
+            if age < self._ttl:
+                metrics.incr(f"analytics_cache.{kind}.hit")
+                self._entries.move_to_end(key)
+                return entry.value
+            if age < self._ttl + self._stale:
+                metrics.incr(f"analytics_cache.{kind}.stale")
+                self._revalidate(key, load)
+                return entry.value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            metrics.incr(f"analytics_cache.{kind}.coalesced")
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # Only swallow the cancellation of the leader's load (its client went away), not our own
+                if not inflight.cancelled():
+                    raise
+        metrics.incr(f"analytics_cache.{kind}.miss")
+        return await self._load(key, load, session)
+
+    async def _load(self, key: tuple, load: Loader, session: AsyncSession) -> dict:
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await load(session)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Waiters re-raise it; mark retrieved so an unawaited future doesn't log
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        self._store(key, value)
+        future.set_result(value)
+        return value
+
+    def _revalidate(self, key: tuple, load: Loader) -> None:
+        if key in self._inflight:
+            return
+        task = asyncio.create_task(self._refresh(key, load), name=f"analytics-cache-{key[0]}")
+        self._refreshes.add(task)
+        task.add_done_callback(self._refreshes.discard)
+
+    async def _refresh(self, key: tuple, load: Loader) -> None:
+        try:
+            # The request that noticed the stale entry has its own session and may be gone by now
+            async with (await get_read_session_factory())() as session:
+                await self._load(key, load, session)
+        except Exception:
+            logger.exception("Analytics cache refresh failed for %s", key[0])
+            metrics.incr(f"analytics_cache.{key[0]}.refresh_failed")
+
+    def _store(self, key: tuple, value: dict) -> None:
+        self._entries[key] = _Entry(value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+analytics_cache = AnalyticsCache(
+    ttl=Config.ANALYTICS_CACHE_TTL_SECONDS,
+    stale_seconds=Config.ANALYTICS_CACHE_STALE_SECONDS,
+    max_entries=Config.ANALYTICS_CACHE_MAX_ENTRIES,
+)
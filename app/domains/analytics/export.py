@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import csv
+import datetime
+import decimal
+import enum
+import importlib.util
+import io
+import uuid
+from collections.abc import AsyncIterator, Iterable
+from typing import TYPE_CHECKING, Any, Literal
+
+from fastapi import HTTPException, status
+from sqlalchemy import Date, DateTime, Integer, Numeric, Select, and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import metrics
+from app.db.base import get_read_session_factory
+from app.domains.company.models import Booking
+from app.domains.messaging.models import Contact, Conversation, Message
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+# Optional: pip install sushi-api[export]. Imported where it is used, so the module loads without it.
+_HAS_ARROW = importlib.util.find_spec("pyarrow") is not None
+
+# Rows fetched per server-side cursor round trip, and per CSV chunk / Parquet row group
+EXPORT_CHUNK_ROWS = 5000
+
+ExportDataset = Literal["bookings", "conversations", "messages"]
+FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+
+def export_query(
+    dataset: ExportDataset,
+    company_id: uuid.UUID,
+    branch_id: uuid.UUID | None,
+    date_from: datetime.date | None,
+    date_to: datetime.date | None,
+) -> Select:
+    """Flat column select for one dataset, filtered by company, branch and created_at date."""
+    if dataset == "bookings":
+        stmt = select(
+            Booking.id, Booking.branch_id, Booking.service_id, Booking.staff_id,
+            Booking.customer_phone, Booking.customer_name, Booking.date, Booking.start_time,
+            Booking.end_time, Booking.duration_minutes, Booking.price, Booking.currency,
+            Booking.status, Booking.booked_via, Booking.conversation_id, Booking.notes,
+            Booking.created_at, Booking.updated_at,
+        )
+        company_col, branch_col, created_col = Booking.company_id, Booking.branch_id, Booking.created_at
+    elif dataset == "conversations":
+        stmt = select(
+            Conversation.id, Conversation.branch_id, Conversation.contact_id,
+            Contact.phone.label("customer_phone"), Contact.name.label("customer_name"),
+            Conversation.channel, Conversation.status, Conversation.escalated_at,
+            Conversation.escalation_reason, Conversation.resolved_at,
+            Conversation.created_at, Conversation.updated_at,
+        ).join(Contact, Conversation.contact_id == Contact.id)
+        company_col, branch_col, created_col = (
+            Conversation.company_id, Conversation.branch_id, Conversation.created_at,
+        )
+    elif dataset == "messages":
+        stmt = select(
+            Message.id, Message.conversation_id, Conversation.branch_id, Message.role,
+            Message.content, Message.channel_message_id, Message.created_at,
+        ).join(Conversation, Message.conversation_id == Conversation.id)
+        company_col, branch_col, created_col = Conversation.company_id, Conversation.branch_id, Message.created_at
+    else:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, f"Unknown export dataset: {dataset}")
+
+    filters = [company_col == company_id]
+    if branch_id:
+        filters.append(branch_col == branch_id)
+    if date_from:
+        filters.append(created_col >= date_from)
+    if date_to:
+        filters.append(created_col < date_to + datetime.timedelta(days=1))
+    return stmt.where(and_(*filters)).order_by(created_col)
+
+
+def check_format(fmt: str) -> None:
+    if fmt not in FORMATS:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, f"Unsupported export format: {fmt}")
+    if fmt != "csv" and not _HAS_ARROW:
+        raise HTTPException(
+            status.HTTP_400_BAD_REQUEST, f"{fmt} export needs pyarrow installed on the server; use format=csv"
+        )
+
+
+async def stream_export(dataset: str, stmt: Select, fmt: str) -> AsyncIterator[bytes]:
+    """Encode the query result chunk by chunk; memory stays at one chunk whatever the table size.
+
+    Runs on its own (read replica) session: the response body is produced
+    after the request's dependencies have been torn down.
+    """
+    columns = [c.name for c in stmt.selected_columns]
+    encoder = _CsvEncoder(columns) if fmt == "csv" else _ArrowEncoder(stmt, fmt)
+    rows = 0
+    try:
+        async with (await get_read_session_factory())() as session:
+            async for chunk in _partitions(session, stmt):
+                rows += len(chunk)
+                data = encoder.encode(chunk)
+                if data:
+                    yield data
+        tail = encoder.finish()
+        if tail:
+            yield tail
+    finally:
+        metrics.incr(f"export.{dataset}.rows", rows)
+
+
+async def _partitions(session: AsyncSession, stmt: Select) -> AsyncIterator[list[tuple]]:
+    # stream() + yield_per uses a server-side cursor, so rows arrive EXPORT_CHUNK_ROWS at a time
+    result = await session.stream(stmt.execution_options(yield_per=EXPORT_CHUNK_ROWS))
+    async for partition in result.partitions():
+        yield [tuple(row) for row in partition]
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, datetime.time):
+        return value.strftime("%H:%M")
+    return value
+
+
+class _CsvEncoder:
+    def __init__(self, columns: list[str]) -> None:
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+        self._writer.writerow(columns)
+
+    def encode(self, rows: Iterable[tuple]) -> bytes:
+        for row in rows:
+            self._writer.writerow(
+                [v.isoformat() if isinstance(v, (datetime.date, datetime.datetime)) else _plain(v) for v in row]
+            )
+        return self._drain()
+
+    def finish(self) -> bytes:
+        return self._drain()
+
+    def _drain(self) -> bytes:
+        data = self._buffer.getvalue().encode("utf-8")
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+
+class _ByteSink(io.RawIOBase):
+    """Write-only file that hands pyarrow's output back to the generator as it is produced."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class _ArrowEncoder:
+    """Parquet (one row group per chunk) or Arrow IPC stream (one record batch per chunk)."""
+
+    def __init__(self, stmt: Select, fmt: str) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._schema = pa.schema([(c.name, _arrow_type(c.type)) for c in stmt.selected_columns])
+        self._sink = _ByteSink()
+        if fmt == "parquet":
+            self._writer = pq.ParquetWriter(self._sink, self._schema)
+        else:
+            self._writer = pa.ipc.new_stream(self._sink, self._schema)
+
+    def encode(self, rows: list[tuple]) -> bytes:
+        columns = list(zip(*rows)) if rows else [() for _ in self._schema]
+        pa = self._pa
+        table = pa.Table.from_arrays(
+            [pa.array([_plain(v) for v in values], type=field.type) for values, field in zip(columns, self._schema)],
+            schema=self._schema,
+        )
+        self._writer.write_table(table)
+        return self._sink.drain()
+
+    def finish(self) -> bytes:
+        self._writer.close()
+        return self._sink.drain()
+
+
+def _arrow_type(sa_type) -> pa.DataType:
+    import pyarrow as pa
+
+    if isinstance(sa_type, DateTime):
+        return pa.timestamp("us", tz="UTC")
+    if isinstance(sa_type, Date):
+        return pa.date32()
+    if isinstance(sa_type, Integer):
+        return pa.int64()
+    if isinstance(sa_type, Numeric):
+        return pa.float64()
+    return pa.string()
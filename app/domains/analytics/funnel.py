@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import datetime
+from uuid import UUID
+
+from sqlalchemy import Integer, and_, cast, func, select, union
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import metrics
+from app.db.partitions import retained_since
+from app.domains.agent.models import ToolExecution
+from app.domains.analytics.models import AnalyticsRollupState, ConversationFunnel
+from app.domains.analytics.rollup import claim_sweep, local_day
+from app.domains.company.models import Booking, BookingStatus, Branch
+from app.domains.messaging.models import Conversation, Message, MessageRole
+
+FUNNEL_NAME = "conversation_funnel"
+
+_COUNTED_STATUSES = (BookingStatus.confirmed, BookingStatus.completed)
+# Conversations rebuilt per statement
+_BATCH = 500
+
+
+def _ms(later, earlier):
+    return cast(func.extract("epoch", later - earlier) * 1000, Integer)
+
+
+class FunnelAggregator:
+    """Keeps conversation_funnels in step with messages, bookings and tool executions.
+
+    Works like AnalyticsRollup: each sweep collects the conversations touched
+    since its watermark and recomputes their row from source with window
+    functions, so rebuilding is idempotent and late changes are picked up.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def is_ready(self) -> bool:
+        """Whether a first full sweep has completed."""
+        state = await self.session.get(AnalyticsRollupState, FUNNEL_NAME)
+        return state is not None and state.watermark is not None
+
+    async def sweep(self) -> int:
+        """Rebuild funnel rows changed since the last sweep. Returns the number of conversations rebuilt."""
+        claim = await claim_sweep(self.session, FUNNEL_NAME)
+        if claim is None:
+            return 0
+        state, started_at, since = claim
+
+        rebuilt = 0
+        if since is None:
+            # First sweep: walk every conversation in id order instead of loading all ids at once
+            last_id: UUID | None = None
+            while True:
+                stmt = select(Conversation.id).order_by(Conversation.id).limit(_BATCH)
+                if last_id is not None:
+                    stmt = stmt.where(Conversation.id > last_id)
+                ids = list((await self.session.execute(stmt)).scalars())
+                if not ids:
+                    break
+                await self.rebuild(ids)
+                rebuilt += len(ids)
+                last_id = ids[-1]
+        else:
+            dirty = list((await self.session.execute(union(
+                select(Conversation.id).where(Conversation.updated_at > since),
+                select(Message.conversation_id).where(Message.created_at > since),
+                select(Booking.conversation_id).where(
+                    and_(Booking.updated_at > since, Booking.conversation_id.isnot(None))
+                ),
+                select(ToolExecution.conversation_id).where(ToolExecution.created_at > since),
+            ))).scalars())
+            for i in range(0, len(dirty), _BATCH):
+                await self.rebuild(dirty[i:i + _BATCH])
+            rebuilt = len(dirty)
+
+        state.watermark = started_at
+        await self.session.flush()
+        metrics.incr("analytics.funnel.conversations", rebuilt)
+        return rebuilt
+
+    async def rebuild(self, conversation_ids: list[UUID]) -> None:
+        """Recompute the funnel rows of these conversations."""
+        conversations = (await self.session.execute(
+            select(
+                Conversation.id, Conversation.company_id, Conversation.branch_id,
+                local_day(Conversation.created_at).label("day"),
+                Conversation.created_at, Conversation.escalated_at,
+            )
+            .join(Branch, Conversation.branch_id == Branch.id)
+            .where(Conversation.id.in_(conversation_ids))
+        )).all()
+        if not conversations:
+            return
+        # Nothing in a conversation predates it; bounds the partitioned tables to the months that matter
+        earliest = min(conv.created_at for conv in conversations)
+
+        # Each message next to the one before it in its conversation
+        ordered = (
+            select(
+                Message.conversation_id,
+                Message.role,
+                Message.created_at,
+                func.lag(Message.role).over(
+                    partition_by=Message.conversation_id, order_by=Message.created_at
+                ).label("prev_role"),
+                func.lag(Message.created_at).over(
+                    partition_by=Message.conversation_id, order_by=Message.created_at
+                ).label("prev_at"),
+            )
+            .where(and_(Message.conversation_id.in_(conversation_ids), Message.created_at >= earliest))
+            .subquery()
+        )
+        answers_customer = and_(ordered.c.role != MessageRole.customer, ordered.c.prev_role == MessageRole.customer)
+        timings = {
+            row.conversation_id: row
+            for row in (await self.session.execute(
+                select(
+                    ordered.c.conversation_id,
+                    func.min(ordered.c.created_at).filter(ordered.c.role == MessageRole.customer)
+                    .label("first_customer_at"),
+                    func.min(ordered.c.created_at).filter(answers_customer).label("first_reply_at"),
+                    func.array_agg(_ms(ordered.c.created_at, ordered.c.prev_at)).filter(
+                        and_(answers_customer, ordered.c.role == MessageRole.agent)
+                    ).label("agent_reply_ms"),
+                ).group_by(ordered.c.conversation_id)
+            )).all()
+        }
+        first_bookings = dict((await self.session.execute(
+            select(Booking.conversation_id, func.min(Booking.created_at))
+            .where(and_(Booking.conversation_id.in_(conversation_ids), Booking.status.in_(_COUNTED_STATUSES)))
+            .group_by(Booking.conversation_id)
+        )).all())
+        tool_durations = dict((await self.session.execute(
+            select(ToolExecution.conversation_id, func.array_agg(ToolExecution.duration_ms))
+            .where(and_(
+                ToolExecution.conversation_id.in_(conversation_ids),
+                ToolExecution.created_at >= earliest,
+                ToolExecution.duration_ms.isnot(None),
+            ))
+            .group_by(ToolExecution.conversation_id)
+        )).all())
+
+        # Conversations older than retention may have lost their messages / tool rows;
+        # their message- and tool-derived timings keep the stored values. (Without
+        # messages, start falls back to created_at, which the pipeline's first
+        # customer message shares, so escalation/booking timings still hold.)
+        messages_since = retained_since("messages")
+        tools_since = retained_since("tool_executions")
+        stored = {}
+        if any(_expired(conv.created_at, messages_since) or _expired(conv.created_at, tools_since)
+               for conv in conversations):
+            stored = {
+                row.conversation_id: row
+                for row in (await self.session.execute(
+                    select(
+                        ConversationFunnel.conversation_id, ConversationFunnel.first_reply_ms,
+                        ConversationFunnel.agent_reply_ms, ConversationFunnel.tool_ms,
+                    ).where(ConversationFunnel.conversation_id.in_(conversation_ids))
+                )).all()
+            }
+
+        values = []
+        for conv in conversations:
+            timing = timings.get(conv.id)
+            start = (timing.first_customer_at if timing else None) or conv.created_at
+            row = {
+                "conversation_id": conv.id,
+                "company_id": conv.company_id,
+                "branch_id": conv.branch_id,
+                "day": conv.day,
+                "first_reply_ms": _elapsed_ms(start, timing.first_reply_at if timing else None),
+                "escalation_ms": _elapsed_ms(start, conv.escalated_at),
+                "booking_ms": _elapsed_ms(start, first_bookings.get(conv.id)),
+                "agent_reply_ms": (timing.agent_reply_ms if timing else None) or [],
+                "tool_ms": tool_durations.get(conv.id) or [],
+            }
+            previous = stored.get(conv.id)
+            if previous is not None and _expired(conv.created_at, messages_since):
+                row["first_reply_ms"] = previous.first_reply_ms
+                row["agent_reply_ms"] = previous.agent_reply_ms
+            if previous is not None and _expired(conv.created_at, tools_since):
+                row["tool_ms"] = previous.tool_ms
+            values.append(row)
+
+        stmt = pg_insert(ConversationFunnel).values(values)
+        await self.session.execute(stmt.on_conflict_do_update(
+            index_elements=[ConversationFunnel.conversation_id],
+            set_={
+                **{
+                    column: stmt.excluded[column]
+                    for column in values[0] if column != "conversation_id"
+                },
+                "updated_at": func.now(),
+            },
+        ))
+
+
+def _expired(created_at: datetime.datetime, since: datetime.datetime | None) -> bool:
+    return since is not None and created_at < since
+
+
+def _elapsed_ms(start: datetime.datetime, end: datetime.datetime | None) -> int | None:
+    if end is None:
+        return None
+    return max(0, int((end - start).total_seconds() * 1000))
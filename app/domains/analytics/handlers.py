@@ -1,26 +1,115 @@
 from __future__ import annotations
 
+import datetime
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.base import get_session
-from app.domains.analytics.schemas import HomeAnalyticsResponse
+from app.db.base import get_read_session
+from app.domains.analytics.cache import analytics_cache
+from app.domains.analytics.export import FORMATS, ExportDataset, check_format, export_query, stream_export
+from app.domains.analytics.schemas import (
+    AnalyticsSeriesResponse,
+    FunnelAnalyticsResponse,
+    Granularity,
+    HomeAnalyticsResponse,
+    UsageAnalyticsResponse,
+)
 from app.domains.analytics.service import AnalyticsService
 
 router = APIRouter(
     prefix="/api/v1/companies/{company_id}/analytics",
     tags=["analytics"],
 )
+export_router = APIRouter(
+    prefix="/api/v1/companies/{company_id}/exports",
+    tags=["exports"],
+)
 
 
 @router.get("/home", response_model=HomeAnalyticsResponse)
 async def get_home_analytics(
     company_id: UUID,
     branch_id: UUID | None = None,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ) -> HomeAnalyticsResponse:
-    svc = AnalyticsService(session)
-    data = await svc.get_home_analytics(company_id, branch_id)
+    data = await analytics_cache.get(
+        "home", company_id, branch_id, (),
+        lambda s: AnalyticsService(s).get_home_analytics(company_id, branch_id),
+        session,
+    )
     return HomeAnalyticsResponse(**data)
+
+
+@router.get("/usage", response_model=UsageAnalyticsResponse)
+async def get_usage_analytics(
+    company_id: UUID,
+    branch_id: UUID | None = None,
+    days: int = Query(30, ge=1, le=365),
+    session: AsyncSession = Depends(get_read_session),
+) -> UsageAnalyticsResponse:
+    data = await analytics_cache.get(
+        "usage", company_id, branch_id, (days,),
+        lambda s: AnalyticsService(s).get_usage_analytics(company_id, branch_id, days),
+        session,
+    )
+    return UsageAnalyticsResponse(**data)
+
+
+@router.get("/series", response_model=AnalyticsSeriesResponse)
+async def get_analytics_series(
+    company_id: UUID,
+    branch_id: UUID | None = None,
+    date_from: datetime.date | None = Query(None, alias="from"),
+    date_to: datetime.date | None = Query(None, alias="to"),
+    granularity: Granularity = Granularity.day,
+    session: AsyncSession = Depends(get_read_session),
+) -> AnalyticsSeriesResponse:
+    date_to = date_to or datetime.date.today()
+    date_from = date_from or date_to - datetime.timedelta(days=29)
+    data = await analytics_cache.get(
+        "series", company_id, branch_id, (date_from, date_to, granularity),
+        lambda s: AnalyticsService(s).get_series(company_id, branch_id, date_from, date_to, granularity),
+        session,
+    )
+    return AnalyticsSeriesResponse(**data)
+
+
+@router.get("/funnel", response_model=FunnelAnalyticsResponse)
+async def get_funnel_analytics(
+    company_id: UUID,
+    branch_id: UUID | None = None,
+    date_from: datetime.date | None = Query(None, alias="from"),
+    date_to: datetime.date | None = Query(None, alias="to"),
+    session: AsyncSession = Depends(get_read_session),
+) -> FunnelAnalyticsResponse:
+    date_to = date_to or datetime.date.today()
+    date_from = date_from or date_to - datetime.timedelta(days=29)
+    data = await analytics_cache.get(
+        "funnel", company_id, branch_id, (date_from, date_to),
+        lambda s: AnalyticsService(s).get_funnel(company_id, branch_id, date_from, date_to),
+        session,
+    )
+    return FunnelAnalyticsResponse(**data)
+
+
+@export_router.get("/{dataset}")
+async def export_dataset(
+    company_id: UUID,
+    dataset: ExportDataset,
+    fmt: str = Query("csv", alias="format"),
+    branch_id: UUID | None = None,
+    date_from: datetime.date | None = Query(None, alias="from"),
+    date_to: datetime.date | None = Query(None, alias="to"),
+) -> StreamingResponse:
+    """Stream every row of bookings, conversations or messages (created between from/to) as a file."""
+    check_format(fmt)
+    stmt = export_query(dataset, company_id, branch_id, date_from, date_to)
+    filename = f"{dataset}-{datetime.date.today().isoformat()}.{fmt}"
+    return StreamingResponse(
+        stream_export(dataset, stmt, fmt),
+        media_type=FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
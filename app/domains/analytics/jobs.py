@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import Config
+from app.db.periodic import PeriodicJob
+from app.domains.analytics.funnel import FunnelAggregator
+from app.domains.analytics.rollup import AnalyticsRollup
+
+logger = logging.getLogger(__name__)
+
+
+async def refresh_analytics_rollup(session: AsyncSession) -> None:
+    """Fold booking, conversation, message and tool changes into analytics_daily and conversation_funnels."""
+    rebuilt = await AnalyticsRollup(session).sweep()
+    if rebuilt:
+        logger.info("Rebuilt %d analytics rollup buckets", rebuilt)
+    funnels = await FunnelAggregator(session).sweep()
+    if funnels:
+        logger.info("Rebuilt %d conversation funnels", funnels)
+
+
+analytics_rollup_job = PeriodicJob(
+    "analytics_rollup",
+    interval=Config.ANALYTICS_ROLLUP_SWEEP_SECONDS,
+    job=refresh_analytics_rollup,
+)
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import Date, DateTime, ForeignKey, Integer, Numeric, String, func
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class AnalyticsDaily(Base):
+    """Per-branch daily rollup of the home dashboard metrics, rebuilt by the analytics rollup job.
+
+    Days are in the branch's timezone. Bookings count on the day they were
+    created, conversations (by their current status) on the day they started,
+    messages on the day they were sent. Only confirmed/completed bookings are
+    counted, matching the live queries.
+    """
+
+    __tablename__ = "analytics_daily"
+
+    company_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("companies.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    branch_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("branches.id", ondelete="CASCADE"), primary_key=True
+    )
+    bookings_agent: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    bookings_member: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    revenue_agent: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False, default=0)
+    revenue_member: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False, default=0)
+    conversations: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    conversations_active: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    conversations_escalated: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    conversations_resolved_by_ai: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    conversations_resolved_by_human: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    conversations_with_bookings: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    messages_customer: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    messages_agent: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    messages_member: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class ConversationFunnel(Base):
+    """Per-conversation timings for the funnel/latency analytics, rebuilt by the funnel sweep.
+
+    Durations are milliseconds from the conversation's first customer message
+    (first reply, escalation, first confirmed/completed booking). The arrays
+    hold every customer→agent reply gap and tool duration, so percentiles can
+    be taken over any date range.
+    """
+
+    __tablename__ = "conversation_funnels"
+
+    conversation_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("conversations.id", ondelete="CASCADE"), primary_key=True
+    )
+    company_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("companies.id", ondelete="CASCADE"), nullable=False
+    )
+    branch_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("branches.id", ondelete="CASCADE"), nullable=False
+    )
+    # Branch-local day the conversation started
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    first_reply_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    escalation_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    booking_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    agent_reply_ms: Mapped[list[int]] = mapped_column(
+        ARRAY(Integer), nullable=False, default=list, server_default="{}"
+    )
+    tool_ms: Mapped[list[int]] = mapped_column(ARRAY(Integer), nullable=False, default=list, server_default="{}")
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
+class AnalyticsRollupState(Base):
+    """Watermark of the last rollup sweep; source rows changed after it are re-aggregated."""
+
+    __tablename__ = "analytics_rollup_state"
+
+    name: Mapped[str] = mapped_column(String(63), primary_key=True)
+    watermark: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
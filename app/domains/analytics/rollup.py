@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import datetime
+import logging
+from collections import defaultdict
+from uuid import UUID
+
+from sqlalchemy import Date, and_, case, cast, delete, exists, func, select, union
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import metrics
+from app.config import Config
+from app.db.partitions import retained_since
+from app.domains.analytics.models import AnalyticsDaily, AnalyticsRollupState
+from app.domains.company.models import BookedVia, Booking, BookingStatus, Branch
+from app.domains.messaging.models import (
+    Conversation,
+    ConversationStatus,
+    Message,
+    MessageRole,
+)
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_NAME = "home_daily"
+
+_COUNTED_STATUSES = (BookingStatus.confirmed, BookingStatus.completed)
+# Days re-aggregated per statement, keeps IN lists and result sets small on backfill
+_DAYS_PER_BATCH = 90
+# Widest UTC offset; a local day starts at most this long before UTC midnight
+_MAX_UTC_OFFSET = datetime.timedelta(hours=14)
+
+
+def local_day(timestamp):
+    """The calendar day of a timestamptz in its branch's timezone (Branch must be in the FROM list)."""
+    return cast(func.timezone(Branch.timezone, timestamp), Date)
+
+
+async def claim_sweep(
+    session: AsyncSession, name: str
+) -> tuple[AnalyticsRollupState, datetime.datetime, datetime.datetime | None] | None:
+    """Lock the named watermark row for this transaction.
+
+    Returns (state, sweep start, changed-since bound), or None when another
+    instance holds the lock. The bound is None on the first sweep (rebuild
+    everything). Set state.watermark to the sweep start once done.
+    """
+    await session.execute(pg_insert(AnalyticsRollupState).values(name=name).on_conflict_do_nothing())
+    state = (await session.execute(
+        select(AnalyticsRollupState)
+        .where(AnalyticsRollupState.name == name)
+        .with_for_update(skip_locked=True)
+    )).scalar_one_or_none()
+    if state is None:
+        return None
+    started_at = (await session.execute(select(func.now()))).scalar_one()
+    # Rows committed late by long transactions carry an older timestamp; the
+    # overlap re-reads them, and rebuilding from source twice changes nothing.
+    since = state.watermark - datetime.timedelta(seconds=Config.ANALYTICS_ROLLUP_OVERLAP_SECONDS) \
+        if state.watermark else None
+    return state, started_at, since
+
+
+class AnalyticsRollup:
+    """Keeps analytics_daily in step with bookings, conversations and messages.
+
+    Days are branch-local (Branch.timezone). Each sweep finds the (company,
+    day) buckets touched since the previous watermark and re-aggregates them
+    from source, so late status changes
+    (a cancellation, an escalation) correct the day they belong to. Buckets are
+    replaced wholesale, which makes overlapping or repeated sweeps harmless.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def is_ready(self) -> bool:
+        """Whether a first full sweep has completed."""
+        state = await self.session.get(AnalyticsRollupState, ROLLUP_NAME)
+        return state is not None and state.watermark is not None
+
+    async def sweep(self) -> int:
+        """Re-aggregate buckets changed since the last sweep. Returns the number of buckets rebuilt."""
+        claim = await claim_sweep(self.session, ROLLUP_NAME)
+        if claim is None:
+            return 0
+        state, started_at, since = claim
+
+        dirty = await self._dirty_buckets(since)
+        for company_id, days in dirty.items():
+            ordered = sorted(days)
+            for i in range(0, len(ordered), _DAYS_PER_BATCH):
+                await self.rebuild(company_id, ordered[i:i + _DAYS_PER_BATCH])
+
+        state.watermark = started_at
+        await self.session.flush()
+        rebuilt = sum(len(days) for days in dirty.values())
+        metrics.incr("analytics.rollup.buckets", rebuilt)
+        return rebuilt
+
+    async def rebuild(self, company_id: UUID, days: list[datetime.date]) -> None:
+        """Replace the company's rollup rows for these days with fresh aggregates."""
+        # Days that may predate message retention keep their stored message counts
+        retained = retained_since("messages")
+        expired_days = [d for d in days if retained is not None and _earliest([d]) < retained]
+        live_days = [d for d in days if d not in expired_days]
+
+        rows: dict[tuple[UUID, datetime.date], dict] = defaultdict(dict)
+        results = [
+            await self._booking_rows(company_id, days),
+            await self._conversation_rows(company_id, days),
+        ]
+        if live_days:
+            results.append(await self._message_rows(company_id, live_days))
+        if expired_days:
+            results.append(await self._stored_message_rows(company_id, expired_days))
+        for result in results:
+            for row in result:
+                values = dict(row._mapping)
+                rows[(values.pop("branch_id"), values.pop("day"))].update(values)
+
+        await self.session.execute(
+            delete(AnalyticsDaily).where(
+                and_(AnalyticsDaily.company_id == company_id, AnalyticsDaily.day.in_(days))
+            )
+        )
+        if rows:
+            await self.session.execute(pg_insert(AnalyticsDaily).values([
+                {"company_id": company_id, "branch_id": branch_id, "day": day, **values}
+                for (branch_id, day), values in rows.items()
+            ]))
+
+    async def _stored_message_rows(self, company_id: UUID, days: list[datetime.date]):
+        stmt = select(
+            AnalyticsDaily.branch_id,
+            AnalyticsDaily.day,
+            AnalyticsDaily.messages_customer,
+            AnalyticsDaily.messages_agent,
+            AnalyticsDaily.messages_member,
+        ).where(and_(AnalyticsDaily.company_id == company_id, AnalyticsDaily.day.in_(days)))
+        return (await self.session.execute(stmt)).all()
+
+    # ── Change detection ──────────────────────────────────────────────────
+
+    async def _dirty_buckets(self, since: datetime.datetime | None) -> dict[UUID, set[datetime.date]]:
+        booking_day = local_day(Booking.created_at)
+        conversation_day = local_day(Conversation.created_at)
+        message_day = local_day(Message.created_at)
+
+        sources = [
+            select(Booking.company_id, booking_day)
+            .join(Branch, Booking.branch_id == Branch.id),
+            select(Conversation.company_id, conversation_day)
+            .join(Branch, Conversation.branch_id == Branch.id),
+            select(Conversation.company_id, message_day)
+            .join(Conversation, Message.conversation_id == Conversation.id)
+            .join(Branch, Conversation.branch_id == Branch.id),
+        ]
+        if since is not None:
+            sources = [
+                sources[0].where(Booking.updated_at > since),
+                sources[1].where(Conversation.updated_at > since),
+                sources[2].where(Message.created_at > since),
+                # A booking status change flips its conversation's conversations_with_bookings
+                select(Conversation.company_id, conversation_day)
+                .join(Booking, Booking.conversation_id == Conversation.id)
+                .join(Branch, Conversation.branch_id == Branch.id)
+                .where(Booking.updated_at > since),
+            ]
+
+        dirty: dict[UUID, set[datetime.date]] = defaultdict(set)
+        for company_id, day in (await self.session.execute(union(*sources))).all():
+            dirty[company_id].add(day)
+        return dirty
+
+    # ── Aggregates ────────────────────────────────────────────────────────
+
+    async def _booking_rows(self, company_id: UUID, days: list[datetime.date]):
+        day = local_day(Booking.created_at)
+        by_agent = Booking.booked_via == BookedVia.agent
+        by_member = Booking.booked_via == BookedVia.member
+        stmt = (
+            select(
+                Booking.branch_id,
+                day.label("day"),
+                func.count(case((by_agent, 1))).label("bookings_agent"),
+                func.count(case((by_member, 1))).label("bookings_member"),
+                func.coalesce(func.sum(case((by_agent, Booking.price))), 0).label("revenue_agent"),
+                func.coalesce(func.sum(case((by_member, Booking.price))), 0).label("revenue_member"),
+            )
+            .join(Branch, Booking.branch_id == Branch.id)
+            .where(
+                and_(
+                    Booking.company_id == company_id,
+                    Booking.status.in_(_COUNTED_STATUSES),
+                    Booking.created_at >= _earliest(days),
+                    day.in_(days),
+                )
+            )
+            .group_by(Booking.branch_id, day)
+        )
+        return (await self.session.execute(stmt)).all()
+
+    async def _conversation_rows(self, company_id: UUID, days: list[datetime.date]):
+        day = local_day(Conversation.created_at)
+        resolved = Conversation.status == ConversationStatus.resolved
+        has_booking = exists().where(
+            and_(
+                Booking.conversation_id == Conversation.id,
+                Booking.status.in_(_COUNTED_STATUSES),
+            )
+        )
+        stmt = (
+            select(
+                Conversation.branch_id,
+                day.label("day"),
+                func.count().label("conversations"),
+                func.count(case((Conversation.status == ConversationStatus.active, 1))).label("conversations_active"),
+                func.count(case((Conversation.status == ConversationStatus.escalated, 1))).label("conversations_escalated"),
+                func.count(case((and_(resolved, Conversation.escalated_at.is_(None)), 1)))
+                .label("conversations_resolved_by_ai"),
+                func.count(case((and_(resolved, Conversation.escalated_at.isnot(None)), 1)))
+                .label("conversations_resolved_by_human"),
+                func.count(case((has_booking, 1))).label("conversations_with_bookings"),
+            )
+            .join(Branch, Conversation.branch_id == Branch.id)
+            .where(
+                and_(
+                    Conversation.company_id == company_id,
+                    Conversation.created_at >= _earliest(days),
+                    day.in_(days),
+                )
+            )
+            .group_by(Conversation.branch_id, day)
+        )
+        return (await self.session.execute(stmt)).all()
+
+    async def _message_rows(self, company_id: UUID, days: list[datetime.date]):
+        day = local_day(Message.created_at)
+        stmt = (
+            select(
+                Conversation.branch_id,
+                day.label("day"),
+                func.count(case((Message.role == MessageRole.customer, 1))).label("messages_customer"),
+                func.count(case((Message.role == MessageRole.agent, 1))).label("messages_agent"),
+                func.count(case((Message.role == MessageRole.member, 1))).label("messages_member"),
+            )
+            .select_from(Message)
+            .join(Conversation, Message.conversation_id == Conversation.id)
+            .join(Branch, Conversation.branch_id == Branch.id)
+            .where(
+                and_(
+                    Conversation.company_id == company_id,
+                    # Both bounds, so only the months holding these days are scanned
+                    Message.created_at >= _earliest(days),
+                    Message.created_at < _latest(days),
+                    day.in_(days),
+                )
+            )
+            .group_by(Conversation.branch_id, day)
+        )
+        return (await self.session.execute(stmt)).all()
+
+
+def _earliest(days: list[datetime.date]) -> datetime.datetime:
+    """Lower bound on created_at for rows whose local day is in `days` (lets the timestamp index prune)."""
+    return datetime.datetime.combine(days[0], datetime.time(), datetime.timezone.utc) - _MAX_UTC_OFFSET
+
+
+def _latest(days: list[datetime.date]) -> datetime.datetime:
+    """Upper bound on created_at for rows whose local day is in `days`."""
+    return datetime.datetime.combine(
+        days[-1] + datetime.timedelta(days=1), datetime.time(), datetime.timezone.utc
+    ) + _MAX_UTC_OFFSET
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import enum
+
 from pydantic import BaseModel
 
 
@@ -57,3 +59,115 @@ class HomeAnalyticsResponse(BaseModel):
     revenue_trend: list[DailyRevenueTrend]
     conversion_rate: float
     conversations_with_bookings: int
+
+
+# ── Funnel and response latency ───────────────────────────────────────────
+
+
+class LatencyStats(BaseModel):
+    p50_ms: float | None
+    p95_ms: float | None
+
+
+class FunnelMetrics(BaseModel):
+    branch_id: str | None
+    conversations: int
+    replied: int
+    escalated: int
+    booked: int
+    booking_rate: float
+    first_reply: LatencyStats
+    agent_reply: LatencyStats
+    time_to_escalation: LatencyStats
+    time_to_booking: LatencyStats
+    tool_execution: LatencyStats
+
+
+class FunnelAnalyticsResponse(BaseModel):
+    date_from: str
+    date_to: str
+    overall: FunnelMetrics
+    branches: list[FunnelMetrics]
+
+
+# ── Range / granularity series ────────────────────────────────────────────
+
+
+class Granularity(str, enum.Enum):
+    day = "day"
+    week = "week"
+    month = "month"
+
+
+class SeriesTotals(BaseModel):
+    bookings: int
+    bookings_by_ai: int
+    bookings_by_human: int
+    revenue: float
+    revenue_from_ai: float
+    revenue_from_human: float
+    conversations: int
+    conversations_resolved_by_ai: int
+    conversations_resolved_by_human: int
+    conversations_escalated: int
+    conversations_with_bookings: int
+    messages: int
+    messages_from_ai: int
+    messages_from_customers: int
+    messages_from_humans: int
+
+
+class SeriesPoint(SeriesTotals):
+    period_start: str
+
+
+class AnalyticsSeriesResponse(BaseModel):
+    granularity: Granularity
+    date_from: str
+    date_to: str
+    currency: str
+    totals: SeriesTotals
+    points: list[SeriesPoint]
+
+
+# ── LLM usage ─────────────────────────────────────────────────────────────
+
+
+class DailyUsageTrend(BaseModel):
+    date: str
+    calls: int
+    prompt_tokens: int
+    completion_tokens: int
+    cached_tokens: int
+    cost: float
+    revenue: float
+
+
+class BranchUsage(BaseModel):
+    branch_id: str
+    calls: int
+    avg_prompt_tokens: float
+    cached_token_rate: float
+    cost: float
+    revenue: float
+    ai_bookings: int
+    cost_per_ai_booking: float | None
+
+
+class ModelUsage(BaseModel):
+    model: str
+    calls: int
+    prompt_tokens: int
+    completion_tokens: int
+    cost: float
+
+
+class UsageAnalyticsResponse(BaseModel):
+    days: int
+    cost_currency: str
+    revenue_currency: str
+    total_cost: float
+    total_revenue: float
+    usage_trend: list[DailyUsageTrend]
+    branches: list[BranchUsage]
+    models: list[ModelUsage]
@@ -3,9 +3,16 @@ from __future__ import annotations
 import datetime
 from uuid import UUID
 
-from sqlalchemy import Date, and_, case, cast, func, select
+from fastapi import HTTPException, status
+from sqlalchemy import Date, DateTime, Interval, and_, case, cast, func, literal, select, true
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import Config
+from app.domains.agent.models import LlmUsageDaily
+from app.domains.analytics.funnel import FunnelAggregator
+from app.domains.analytics.models import AnalyticsDaily, ConversationFunnel
+from app.domains.analytics.rollup import AnalyticsRollup
+from app.domains.analytics.schemas import Granularity
 from app.domains.company.models import BookedVia, Booking, BookingStatus
 from app.domains.messaging.models import (
     Conversation,
@@ -14,6 +21,18 @@ from app.domains.messaging.models import (
     MessageRole,
 )
 
+_COUNTED_STATUSES = (BookingStatus.confirmed, BookingStatus.completed)
+_TREND_DAYS = 30
+
+_MAX_SERIES_POINTS = 1000
+_PERIOD_DAYS = {Granularity.day: 1, Granularity.week: 7, Granularity.month: 28}
+_SERIES_COLUMNS = (
+    "bookings_agent", "bookings_member", "revenue_agent", "revenue_member",
+    "conversations", "conversations_resolved_by_ai", "conversations_resolved_by_human",
+    "conversations_escalated", "conversations_with_bookings",
+    "messages_customer", "messages_agent", "messages_member",
+)
+
 
 class AnalyticsService:
     def __init__(self, session: AsyncSession) -> None:
@@ -22,342 +41,531 @@ class AnalyticsService:
     async def get_home_analytics(
         self, company_id: UUID, branch_id: UUID | None = None
     ) -> dict:
-        conversations = await self._conversation_metrics(company_id, branch_id)
-        bookings = await self._booking_metrics(company_id, branch_id)
-        revenue = await self._revenue_metrics(company_id, branch_id)
-        messages = await self._message_metrics(company_id, branch_id)
-        booking_trend, revenue_trend = await self._daily_trends(company_id, branch_id)
-        conv_with_bookings = await self._conversations_with_bookings(
-            company_id, branch_id
-        )
+        if Config.ANALYTICS_ROLLUP_ENABLED and await AnalyticsRollup(self.session).is_ready():
+            totals, trend = await self._rollup_home_rows(company_id, branch_id)
+        else:
+            totals, trend = await self._live_home_rows(company_id, branch_id)
+        return self._home_payload(totals, trend)
 
-        total_conv = conversations["total"]
-        conversion_rate = (
-            round(conv_with_bookings / total_conv * 100, 1) if total_conv > 0 else 0.0
-        )
+    # ── Live home metrics ─────────────────────────────────────────────────
+    # Two statements: every all-time total (CTEs with FILTER aggregates, one
+    # scan per table) and the 30-day trend.
 
-        return {
-            "conversations": conversations,
-            "bookings": bookings,
-            "revenue": revenue,
-            "messages": messages,
-            "booking_trend": booking_trend,
-            "revenue_trend": revenue_trend,
-            "conversion_rate": conversion_rate,
-            "conversations_with_bookings": conv_with_bookings,
-        }
-
-    # ── Conversation metrics ──────────────────────────────────────────────
-
-    async def _conversation_metrics(
+    async def _live_home_rows(
         self, company_id: UUID, branch_id: UUID | None
-    ) -> dict:
-        filters = [Conversation.company_id == company_id]
+    ) -> tuple:
+        today = datetime.date.today()
+        counted = Booking.status.in_(_COUNTED_STATUSES)
+        by_agent = Booking.booked_via == BookedVia.agent
+        by_member = Booking.booked_via == BookedVia.member
+        resolved = Conversation.status == ConversationStatus.resolved
+
+        conversation_filters = [Conversation.company_id == company_id]
+        booking_filters = [Booking.company_id == company_id, counted]
         if branch_id:
-            filters.append(Conversation.branch_id == branch_id)
-
-        stmt = select(
-            func.count().label("total"),
-            func.count(
-                case(
-                    (
-                        and_(
-                            Conversation.status == ConversationStatus.resolved,
-                            Conversation.escalated_at.is_(None),
-                        ),
-                        1,
-                    ),
-                )
-            ).label("resolved_by_ai"),
-            func.count(
-                case(
-                    (
-                        and_(
-                            Conversation.status == ConversationStatus.resolved,
-                            Conversation.escalated_at.isnot(None),
-                        ),
-                        1,
-                    ),
-                )
-            ).label("resolved_by_human"),
-            func.count(
-                case(
-                    (Conversation.status == ConversationStatus.escalated, 1),
-                )
-            ).label("escalated"),
-            func.count(
-                case(
-                    (Conversation.status == ConversationStatus.active, 1),
-                )
-            ).label("active"),
-        ).where(and_(*filters))
+            conversation_filters.append(Conversation.branch_id == branch_id)
+            booking_filters.append(Booking.branch_id == branch_id)
+
+        conversations = select(
+            func.count().label("conversations"),
+            func.count().filter(Conversation.status == ConversationStatus.active).label("active"),
+            func.count().filter(Conversation.status == ConversationStatus.escalated).label("escalated"),
+            func.count().filter(and_(resolved, Conversation.escalated_at.is_(None))).label("resolved_by_ai"),
+            func.count().filter(and_(resolved, Conversation.escalated_at.isnot(None))).label("resolved_by_human"),
+        ).where(and_(*conversation_filters)).cte("conversation_totals")
+
+        bookings = select(
+            func.count().filter(by_agent).label("bookings_agent"),
+            func.count().filter(by_member).label("bookings_member"),
+            func.coalesce(func.sum(Booking.price).filter(by_agent), 0).label("revenue_agent"),
+            func.coalesce(func.sum(Booking.price).filter(by_member), 0).label("revenue_member"),
+            func.count().filter(
+                and_(Booking.date == today, Booking.status == BookingStatus.confirmed)
+            ).label("upcoming_today"),
+            func.count(func.distinct(Booking.conversation_id)).label("with_bookings"),
+        ).where(and_(*booking_filters)).cte("booking_totals")
 
-        result = await self.session.execute(stmt)
-        row = result.one()
+        messages = (
+            select(
+                func.count().filter(Message.role == MessageRole.customer).label("messages_customer"),
+                func.count().filter(Message.role == MessageRole.agent).label("messages_agent"),
+                func.count().filter(Message.role == MessageRole.member).label("messages_member"),
+            )
+            .select_from(Message)
+            .join(Conversation, Message.conversation_id == Conversation.id)
+            .where(and_(*conversation_filters))
+            .cte("message_totals")
+        )
 
-        concluded = row.resolved_by_ai + row.resolved_by_human + row.escalated
-        rate = (row.resolved_by_ai / concluded * 100) if concluded > 0 else 0.0
+        totals = (await self.session.execute(
+            select(
+                *conversations.c, *bookings.c, *messages.c,
+                self._currency_subquery(company_id).label("currency"),
+            ).select_from(conversations.join(bookings, true()).join(messages, true()))
+        )).one()
 
-        return {
-            "total": row.total,
-            "resolved_by_ai": row.resolved_by_ai,
-            "resolved_by_human": row.resolved_by_human,
-            "escalated": row.escalated,
-            "active": row.active,
-            "ai_resolution_rate": round(rate, 1),
-        }
+        # Group by when the booking was created, not appointment date
+        created_date = cast(Booking.created_at, Date)
+        start_date = today - datetime.timedelta(days=_TREND_DAYS - 1)
+        trend = (await self.session.execute(
+            select(
+                created_date.label("day"),
+                func.count().filter(by_agent).label("by_ai"),
+                func.count().filter(by_member).label("by_human"),
+                func.coalesce(func.sum(Booking.price).filter(by_agent), 0).label("rev_ai"),
+                func.coalesce(func.sum(Booking.price).filter(by_member), 0).label("rev_human"),
+            )
+            .where(and_(*booking_filters, Booking.created_at >= start_date))
+            .group_by(created_date)
+        )).all()
+        return totals, trend
 
-    # ── Booking metrics ───────────────────────────────────────────────────
+    # ── Home metrics from the daily rollup ────────────────────────────────
 
-    async def _booking_metrics(
+    async def _rollup_home_rows(
         self, company_id: UUID, branch_id: UUID | None
-    ) -> dict:
-        filters = [
+    ) -> tuple:
+        today = datetime.date.today()
+        filters = [AnalyticsDaily.company_id == company_id]
+        upcoming_filters = [
             Booking.company_id == company_id,
-            Booking.status.in_([BookingStatus.confirmed, BookingStatus.completed]),
+            Booking.date == today,
+            Booking.status == BookingStatus.confirmed,
         ]
         if branch_id:
-            filters.append(Booking.branch_id == branch_id)
+            filters.append(AnalyticsDaily.branch_id == branch_id)
+            upcoming_filters.append(Booking.branch_id == branch_id)
 
-        today = datetime.date.today()
+        def total(column):
+            return func.coalesce(func.sum(column), 0)
 
-        stmt = select(
-            func.count().label("total"),
-            func.count(
-                case((Booking.booked_via == BookedVia.agent, 1))
-            ).label("by_ai"),
-            func.count(
-                case((Booking.booked_via == BookedVia.member, 1))
-            ).label("by_human"),
-            func.count(
-                case(
-                    (
-                        and_(
-                            Booking.date == today,
-                            Booking.status == BookingStatus.confirmed,
-                        ),
-                        1,
-                    ),
-                )
-            ).label("upcoming_today"),
-        ).where(and_(*filters))
+        totals = (await self.session.execute(
+            select(
+                total(AnalyticsDaily.conversations).label("conversations"),
+                total(AnalyticsDaily.conversations_active).label("active"),
+                total(AnalyticsDaily.conversations_escalated).label("escalated"),
+                total(AnalyticsDaily.conversations_resolved_by_ai).label("resolved_by_ai"),
+                total(AnalyticsDaily.conversations_resolved_by_human).label("resolved_by_human"),
+                total(AnalyticsDaily.bookings_agent).label("bookings_agent"),
+                total(AnalyticsDaily.bookings_member).label("bookings_member"),
+                total(AnalyticsDaily.revenue_agent).label("revenue_agent"),
+                total(AnalyticsDaily.revenue_member).label("revenue_member"),
+                select(func.count()).where(and_(*upcoming_filters)).scalar_subquery().label("upcoming_today"),
+                total(AnalyticsDaily.conversations_with_bookings).label("with_bookings"),
+                total(AnalyticsDaily.messages_customer).label("messages_customer"),
+                total(AnalyticsDaily.messages_agent).label("messages_agent"),
+                total(AnalyticsDaily.messages_member).label("messages_member"),
+                self._currency_subquery(company_id).label("currency"),
+            ).where(and_(*filters))
+        )).one()
+
+        start_date = today - datetime.timedelta(days=_TREND_DAYS - 1)
+        trend = (await self.session.execute(
+            select(
+                AnalyticsDaily.day,
+                func.sum(AnalyticsDaily.bookings_agent).label("by_ai"),
+                func.sum(AnalyticsDaily.bookings_member).label("by_human"),
+                func.sum(AnalyticsDaily.revenue_agent).label("rev_ai"),
+                func.sum(AnalyticsDaily.revenue_member).label("rev_human"),
+            )
+            .where(and_(*filters, AnalyticsDaily.day >= start_date))
+            .group_by(AnalyticsDaily.day)
+        )).all()
+        return totals, trend
 
-        result = await self.session.execute(stmt)
-        row = result.one()
+    # ── Shared shaping ────────────────────────────────────────────────────
 
-        total = row.total or 0
-        by_ai = row.by_ai or 0
-        rate = (by_ai / total * 100) if total > 0 else 0.0
+    @staticmethod
+    def _currency_subquery(company_id: UUID):
+        return select(Booking.currency).where(Booking.company_id == company_id).limit(1).scalar_subquery()
 
+    @staticmethod
+    def _home_payload(totals, trend_rows) -> dict:
+        today = datetime.date.today()
+        start_date = today - datetime.timedelta(days=_TREND_DAYS - 1)
+        by_day = {row.day: row for row in trend_rows}
+
+        booking_trend: list[dict] = []
+        revenue_trend: list[dict] = []
+        for i in range(_TREND_DAYS):
+            d = start_date + datetime.timedelta(days=i)
+            row = by_day.get(d)
+            by_ai, by_human = (row.by_ai, row.by_human) if row else (0, 0)
+            rev_ai, rev_human = (float(row.rev_ai), float(row.rev_human)) if row else (0.0, 0.0)
+            booking_trend.append(
+                {"date": d.isoformat(), "total": by_ai + by_human, "by_ai": by_ai, "by_human": by_human}
+            )
+            revenue_trend.append(
+                {"date": d.isoformat(), "total": rev_ai + rev_human, "from_ai": rev_ai, "from_human": rev_human}
+            )
+
+        concluded = totals.resolved_by_ai + totals.resolved_by_human + totals.escalated
+        bookings_total = totals.bookings_agent + totals.bookings_member
         return {
-            "total": total,
-            "by_ai": by_ai,
-            "by_human": row.by_human or 0,
-            "ai_booking_rate": round(rate, 1),
-            "upcoming_today": row.upcoming_today or 0,
+            "conversations": {
+                "total": totals.conversations,
+                "resolved_by_ai": totals.resolved_by_ai,
+                "resolved_by_human": totals.resolved_by_human,
+                "escalated": totals.escalated,
+                "active": totals.active,
+                "ai_resolution_rate": round(totals.resolved_by_ai / concluded * 100, 1) if concluded > 0 else 0.0,
+            },
+            "bookings": {
+                "total": bookings_total,
+                "by_ai": totals.bookings_agent,
+                "by_human": totals.bookings_member,
+                "ai_booking_rate": (
+                    round(totals.bookings_agent / bookings_total * 100, 1) if bookings_total > 0 else 0.0
+                ),
+                "upcoming_today": totals.upcoming_today,
+            },
+            "revenue": {
+                "total": float(totals.revenue_agent + totals.revenue_member),
+                "from_ai": float(totals.revenue_agent),
+                "from_human": float(totals.revenue_member),
+                "currency": totals.currency or "USD",
+            },
+            "messages": {
+                "total": totals.messages_customer + totals.messages_agent + totals.messages_member,
+                "from_ai": totals.messages_agent,
+                "from_customers": totals.messages_customer,
+                "from_humans": totals.messages_member,
+            },
+            "booking_trend": booking_trend,
+            "revenue_trend": revenue_trend,
+            "conversion_rate": (
+                round(totals.with_bookings / totals.conversations * 100, 1) if totals.conversations > 0 else 0.0
+            ),
+            "conversations_with_bookings": totals.with_bookings,
         }
 
-    # ── Revenue metrics ───────────────────────────────────────────────────
+    # ── Range / granularity series (rollup only) ─────────────────────────
 
-    async def _revenue_metrics(
-        self, company_id: UUID, branch_id: UUID | None
+    async def get_series(
+        self,
+        company_id: UUID,
+        branch_id: UUID | None,
+        date_from: datetime.date,
+        date_to: datetime.date,
+        granularity: Granularity,
     ) -> dict:
+        """Per-period totals between two branch-local dates, gap-filled in SQL with generate_series.
+
+        Buckets start on the period boundary (Monday, 1st of the month) at or
+        before date_from; only days inside [date_from, date_to] are counted.
+        """
+        if date_from > date_to:
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, "date_from must not be after date_to")
+        if (date_to - date_from).days // _PERIOD_DAYS[granularity] + 1 > _MAX_SERIES_POINTS:
+            raise HTTPException(
+                status.HTTP_400_BAD_REQUEST,
+                f"Range too large for {granularity.value} granularity (max {_MAX_SERIES_POINTS} points)",
+            )
+        if not await AnalyticsRollup(self.session).is_ready():
+            raise HTTPException(status.HTTP_503_SERVICE_UNAVAILABLE, "Analytics rollup is still being built")
+
+        unit = granularity.value
+        buckets = select(
+            cast(
+                func.generate_series(
+                    func.date_trunc(unit, cast(date_from, DateTime)),
+                    cast(date_to, DateTime),
+                    cast(literal(f"1 {unit}"), Interval),
+                ),
+                Date,
+            ).label("bucket")
+        ).subquery("buckets")
+
         filters = [
-            Booking.company_id == company_id,
-            Booking.status.in_([BookingStatus.confirmed, BookingStatus.completed]),
+            AnalyticsDaily.company_id == company_id,
+            AnalyticsDaily.day >= date_from,
+            AnalyticsDaily.day <= date_to,
         ]
         if branch_id:
-            filters.append(Booking.branch_id == branch_id)
-
-        stmt = select(
-            func.coalesce(func.sum(Booking.price), 0).label("total"),
-            func.coalesce(
-                func.sum(
-                    case(
-                        (Booking.booked_via == BookedVia.agent, Booking.price),
-                        else_=0,
-                    )
-                ),
-                0,
-            ).label("from_ai"),
-            func.coalesce(
-                func.sum(
-                    case(
-                        (Booking.booked_via == BookedVia.member, Booking.price),
-                        else_=0,
-                    )
-                ),
-                0,
-            ).label("from_human"),
-        ).where(and_(*filters))
-
-        result = await self.session.execute(stmt)
-        row = result.one()
-
-        currency_stmt = (
-            select(Booking.currency)
-            .where(Booking.company_id == company_id)
-            .limit(1)
+            filters.append(AnalyticsDaily.branch_id == branch_id)
+        period = cast(func.date_trunc(unit, cast(AnalyticsDaily.day, DateTime)), Date)
+        sums = (
+            select(
+                period.label("bucket"),
+                *(func.sum(getattr(AnalyticsDaily, column)).label(column) for column in _SERIES_COLUMNS),
+            )
+            .where(and_(*filters))
+            .group_by(period)
+            .subquery("sums")
         )
-        currency_row = (await self.session.execute(currency_stmt)).scalar_one_or_none()
 
+        rows = (await self.session.execute(
+            select(
+                buckets.c.bucket,
+                *(func.coalesce(sums.c[column], 0).label(column) for column in _SERIES_COLUMNS),
+                self._currency_subquery(company_id).label("currency"),
+            )
+            .select_from(buckets.outerjoin(sums, sums.c.bucket == buckets.c.bucket))
+            .order_by(buckets.c.bucket)
+        )).all()
+
+        points = [{"period_start": row.bucket.isoformat(), **self._series_values(row)} for row in rows]
+        totals = {
+            key: sum(point[key] for point in points)
+            for key in points[0] if key != "period_start"
+        } if points else self._series_values(None)
         return {
-            "total": float(row.total),
-            "from_ai": float(row.from_ai),
-            "from_human": float(row.from_human),
-            "currency": currency_row or "USD",
+            "granularity": granularity,
+            "date_from": date_from.isoformat(),
+            "date_to": date_to.isoformat(),
+            "currency": (rows[0].currency if rows else None) or "USD",
+            "totals": totals,
+            "points": points,
         }
 
-    # ── Message metrics ───────────────────────────────────────────────────
+    @staticmethod
+    def _series_values(row) -> dict:
+        v = {column: getattr(row, column) if row else 0 for column in _SERIES_COLUMNS}
+        return {
+            "bookings": v["bookings_agent"] + v["bookings_member"],
+            "bookings_by_ai": v["bookings_agent"],
+            "bookings_by_human": v["bookings_member"],
+            "revenue": float(v["revenue_agent"] + v["revenue_member"]),
+            "revenue_from_ai": float(v["revenue_agent"]),
+            "revenue_from_human": float(v["revenue_member"]),
+            "conversations": v["conversations"],
+            "conversations_resolved_by_ai": v["conversations_resolved_by_ai"],
+            "conversations_resolved_by_human": v["conversations_resolved_by_human"],
+            "conversations_escalated": v["conversations_escalated"],
+            "conversations_with_bookings": v["conversations_with_bookings"],
+            "messages": v["messages_customer"] + v["messages_agent"] + v["messages_member"],
+            "messages_from_ai": v["messages_agent"],
+            "messages_from_customers": v["messages_customer"],
+            "messages_from_humans": v["messages_member"],
+        }
 
-    async def _message_metrics(
-        self, company_id: UUID, branch_id: UUID | None
+    # ── Funnel and response latency ──────────────────────────────────────
+
+    async def get_funnel(
+        self,
+        company_id: UUID,
+        branch_id: UUID | None,
+        date_from: datetime.date,
+        date_to: datetime.date,
     ) -> dict:
-        filters = [Conversation.company_id == company_id]
-        if branch_id:
-            filters.append(Conversation.branch_id == branch_id)
+        """Funnel counts and latency percentiles for conversations started in [date_from, date_to].
 
-        stmt = (
-            select(
-                func.count().label("total"),
-                func.count(
-                    case((Message.role == MessageRole.agent, 1))
-                ).label("from_ai"),
-                func.count(
-                    case((Message.role == MessageRole.customer, 1))
-                ).label("from_customers"),
-                func.count(
-                    case((Message.role == MessageRole.member, 1))
-                ).label("from_humans"),
-            )
-            .select_from(Message)
-            .join(Conversation, Message.conversation_id == Conversation.id)
-            .where(and_(*filters))
-        )
+        One row per branch plus the overall row (GROUP BY ROLLUP); reply and
+        tool percentiles are taken over the unnested per-conversation arrays.
+        """
+        if date_from > date_to:
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, "date_from must not be after date_to")
+        if not await FunnelAggregator(self.session).is_ready():
+            raise HTTPException(status.HTTP_503_SERVICE_UNAVAILABLE, "Funnel analytics are still being built")
 
-        result = await self.session.execute(stmt)
-        row = result.one()
+        filters = [
+            ConversationFunnel.company_id == company_id,
+            ConversationFunnel.day >= date_from,
+            ConversationFunnel.day <= date_to,
+        ]
+        if branch_id:
+            filters.append(ConversationFunnel.branch_id == branch_id)
+        by_branch = func.rollup(ConversationFunnel.branch_id)
+
+        def percentiles(column, prefix: str) -> list:
+            return [
+                func.percentile_cont(0.5).within_group(column).label(f"{prefix}_p50"),
+                func.percentile_cont(0.95).within_group(column).label(f"{prefix}_p95"),
+            ]
+
+        rows = {
+            row.branch_id: dict(row._mapping)
+            for row in (await self.session.execute(
+                select(
+                    ConversationFunnel.branch_id,
+                    func.count().label("conversations"),
+                    func.count(ConversationFunnel.first_reply_ms).label("replied"),
+                    func.count(ConversationFunnel.escalation_ms).label("escalated"),
+                    func.count(ConversationFunnel.booking_ms).label("booked"),
+                    *percentiles(ConversationFunnel.first_reply_ms, "first_reply"),
+                    *percentiles(ConversationFunnel.escalation_ms, "time_to_escalation"),
+                    *percentiles(ConversationFunnel.booking_ms, "time_to_booking"),
+                )
+                .where(and_(*filters))
+                .group_by(by_branch)
+            )).all()
+        }
+        arrays = (("agent_reply", ConversationFunnel.agent_reply_ms), ("tool_execution", ConversationFunnel.tool_ms))
+        for prefix, column in arrays:
+            value = func.unnest(column).column_valued("v")
+            for row in (await self.session.execute(
+                select(ConversationFunnel.branch_id, *percentiles(value, prefix))
+                .select_from(ConversationFunnel)
+                .where(and_(*filters))
+                .group_by(by_branch)
+            )).all():
+                if row.branch_id in rows:
+                    rows[row.branch_id].update(row._mapping)
+
+        def metrics_for(row) -> dict:
+            row = row or {}
+            conversations = row.get("conversations", 0)
+            return {
+                "branch_id": str(row["branch_id"]) if row.get("branch_id") else None,
+                "conversations": conversations,
+                "replied": row.get("replied", 0),
+                "escalated": row.get("escalated", 0),
+                "booked": row.get("booked", 0),
+                "booking_rate": round(row.get("booked", 0) / conversations * 100, 1) if conversations else 0.0,
+                **{
+                    prefix: {"p50_ms": row.get(f"{prefix}_p50"), "p95_ms": row.get(f"{prefix}_p95")}
+                    for prefix in (
+                        "first_reply", "agent_reply", "time_to_escalation", "time_to_booking", "tool_execution",
+                    )
+                },
+            }
 
         return {
-            "total": row.total or 0,
-            "from_ai": row.from_ai or 0,
-            "from_customers": row.from_customers or 0,
-            "from_humans": row.from_humans or 0,
+            "date_from": date_from.isoformat(),
+            "date_to": date_to.isoformat(),
+            # ROLLUP's grand-total row has a NULL branch_id
+            "overall": metrics_for(rows.get(None)),
+            "branches": [metrics_for(row) for key, row in rows.items() if key is not None],
         }
 
-    # ── Daily trends (last 30 days) ──────────────────────────────────────
+    # ── LLM usage and cost ────────────────────────────────────────────────
 
-    async def _daily_trends(
-        self, company_id: UUID, branch_id: UUID | None
-    ) -> tuple[list[dict], list[dict]]:
-        today = datetime.date.today()
-        start_date = today - datetime.timedelta(days=29)
+    async def get_usage_analytics(
+        self, company_id: UUID, branch_id: UUID | None = None, days: int = 30
+    ) -> dict:
+        # llm_usage_daily is bucketed by UTC day (see audit.usage_day); revenue uses the same days
+        today = datetime.datetime.now(datetime.timezone.utc).date()
+        start_date = today - datetime.timedelta(days=days - 1)
 
-        # Group by when the booking was created, not appointment date
-        created_date = cast(Booking.created_at, Date)
+        usage_filters = [
+            LlmUsageDaily.company_id == company_id,
+            LlmUsageDaily.day >= start_date,
+        ]
+        if branch_id:
+            usage_filters.append(LlmUsageDaily.branch_id == branch_id)
 
-        filters = [
+        created_date = cast(func.timezone("UTC", Booking.created_at), Date)
+        booking_filters = [
             Booking.company_id == company_id,
             Booking.status.in_([BookingStatus.confirmed, BookingStatus.completed]),
             created_date >= start_date,
-            created_date <= today,
         ]
         if branch_id:
-            filters.append(Booking.branch_id == branch_id)
-
-        stmt = (
-            select(
-                created_date.label("date"),
-                func.count().label("total"),
-                func.count(
-                    case((Booking.booked_via == BookedVia.agent, 1))
-                ).label("by_ai"),
-                func.count(
-                    case((Booking.booked_via == BookedVia.member, 1))
-                ).label("by_human"),
-                func.coalesce(func.sum(Booking.price), 0).label("rev_total"),
-                func.coalesce(
-                    func.sum(
-                        case(
-                            (Booking.booked_via == BookedVia.agent, Booking.price),
-                            else_=0,
-                        )
-                    ),
-                    0,
-                ).label("rev_ai"),
-                func.coalesce(
-                    func.sum(
-                        case(
-                            (Booking.booked_via == BookedVia.member, Booking.price),
-                            else_=0,
-                        )
-                    ),
-                    0,
-                ).label("rev_human"),
-            )
-            .where(and_(*filters))
+            booking_filters.append(Booking.branch_id == branch_id)
+
+        # Daily usage vs. revenue
+        usage_by_day = {
+            row.day: row
+            for row in (await self.session.execute(
+                select(
+                    LlmUsageDaily.day,
+                    func.sum(LlmUsageDaily.calls).label("calls"),
+                    func.sum(LlmUsageDaily.prompt_tokens).label("prompt_tokens"),
+                    func.sum(LlmUsageDaily.completion_tokens).label("completion_tokens"),
+                    func.sum(LlmUsageDaily.cached_tokens).label("cached_tokens"),
+                    func.sum(LlmUsageDaily.cost).label("cost"),
+                )
+                .where(and_(*usage_filters))
+                .group_by(LlmUsageDaily.day)
+            )).all()
+        }
+        revenue_by_day = dict((await self.session.execute(
+            select(created_date, func.coalesce(func.sum(Booking.price), 0))
+            .where(and_(*booking_filters))
             .group_by(created_date)
-            .order_by(created_date)
-        )
+        )).all())
 
-        result = await self.session.execute(stmt)
-        rows = result.all()
-
-        data_by_date: dict[datetime.date, object] = {}
-        for row in rows:
-            data_by_date[row.date] = row
-
-        booking_trend: list[dict] = []
-        revenue_trend: list[dict] = []
-
-        for i in range(30):
+        usage_trend: list[dict] = []
+        for i in range(days):
             d = start_date + datetime.timedelta(days=i)
-            date_str = d.isoformat()
-            row = data_by_date.get(d)
-
-            if row:
-                booking_trend.append(
-                    {
-                        "date": date_str,
-                        "total": row.total,
-                        "by_ai": row.by_ai,
-                        "by_human": row.by_human,
-                    }
-                )
-                revenue_trend.append(
-                    {
-                        "date": date_str,
-                        "total": float(row.rev_total),
-                        "from_ai": float(row.rev_ai),
-                        "from_human": float(row.rev_human),
-                    }
-                )
-            else:
-                booking_trend.append(
-                    {"date": date_str, "total": 0, "by_ai": 0, "by_human": 0}
-                )
-                revenue_trend.append(
-                    {"date": date_str, "total": 0.0, "from_ai": 0.0, "from_human": 0.0}
+            row = usage_by_day.get(d)
+            usage_trend.append({
+                "date": d.isoformat(),
+                "calls": row.calls if row else 0,
+                "prompt_tokens": row.prompt_tokens if row else 0,
+                "completion_tokens": row.completion_tokens if row else 0,
+                "cached_tokens": row.cached_tokens if row else 0,
+                "cost": float(row.cost) if row else 0.0,
+                "revenue": float(revenue_by_day.get(d, 0)),
+            })
+
+        # Per branch — sorted by prompt size so bloated prompts surface first
+        branch_rows = (await self.session.execute(
+            select(
+                LlmUsageDaily.branch_id,
+                func.sum(LlmUsageDaily.calls).label("calls"),
+                func.sum(LlmUsageDaily.prompt_tokens).label("prompt_tokens"),
+                func.sum(LlmUsageDaily.cached_tokens).label("cached_tokens"),
+                func.sum(LlmUsageDaily.cost).label("cost"),
+            )
+            .where(and_(*usage_filters))
+            .group_by(LlmUsageDaily.branch_id)
+        )).all()
+        branch_revenue = {
+            row.branch_id: row
+            for row in (await self.session.execute(
+                select(
+                    Booking.branch_id,
+                    func.coalesce(func.sum(Booking.price), 0).label("revenue"),
+                    func.count(case((Booking.booked_via == BookedVia.agent, 1))).label("ai_bookings"),
                 )
+                .where(and_(*booking_filters))
+                .group_by(Booking.branch_id)
+            )).all()
+        }
 
-        return booking_trend, revenue_trend
-
-    # ── Conversion rate ───────────────────────────────────────────────────
-
-    async def _conversations_with_bookings(
-        self, company_id: UUID, branch_id: UUID | None
-    ) -> int:
-        filters = [
-            Booking.company_id == company_id,
-            Booking.conversation_id.isnot(None),
-            Booking.status.in_([BookingStatus.confirmed, BookingStatus.completed]),
-        ]
-        if branch_id:
-            filters.append(Booking.branch_id == branch_id)
+        branches: list[dict] = []
+        for row in branch_rows:
+            rev = branch_revenue.get(row.branch_id)
+            ai_bookings = rev.ai_bookings if rev else 0
+            branches.append({
+                "branch_id": str(row.branch_id),
+                "calls": row.calls,
+                "avg_prompt_tokens": round(row.prompt_tokens / row.calls, 1) if row.calls else 0.0,
+                "cached_token_rate": round(row.cached_tokens / row.prompt_tokens * 100, 1) if row.prompt_tokens else 0.0,
+                "cost": float(row.cost),
+                "revenue": float(rev.revenue) if rev else 0.0,
+                "ai_bookings": ai_bookings,
+                "cost_per_ai_booking": round(float(row.cost) / ai_bookings, 4) if ai_bookings else None,
+            })
+        branches.sort(key=lambda b: b["avg_prompt_tokens"], reverse=True)
+
+        model_rows = (await self.session.execute(
+            select(
+                LlmUsageDaily.model,
+                func.sum(LlmUsageDaily.calls).label("calls"),
+                func.sum(LlmUsageDaily.prompt_tokens).label("prompt_tokens"),
+                func.sum(LlmUsageDaily.completion_tokens).label("completion_tokens"),
+                func.sum(LlmUsageDaily.cost).label("cost"),
+            )
+            .where(and_(*usage_filters))
+            .group_by(LlmUsageDaily.model)
+            .order_by(func.sum(LlmUsageDaily.cost).desc())
+        )).all()
 
-        stmt = select(
-            func.count(func.distinct(Booking.conversation_id))
-        ).where(and_(*filters))
+        currency_stmt = (
+            select(Booking.currency)
+            .where(Booking.company_id == company_id)
+            .limit(1)
+        )
+        currency = (await self.session.execute(currency_stmt)).scalar_one_or_none()
 
-        result = await self.session.execute(stmt)
-        return result.scalar_one()
+        return {
+            "days": days,
+            "cost_currency": "USD",
+            "revenue_currency": currency or "USD",
+            "total_cost": round(sum(d["cost"] for d in usage_trend), 6),
+            "total_revenue": round(sum(d["revenue"] for d in usage_trend), 2),
+            "usage_trend": usage_trend,
+            "branches": branches,
+            "models": [
+                {
+                    "model": row.model,
+                    "calls": row.calls,
+                    "prompt_tokens": row.prompt_tokens,
+                    "completion_tokens": row.completion_tokens,
+                    "cost": float(row.cost),
+                }
+                for row in model_rows
+            ],
+        }
@@ -3,7 +3,7 @@ from __future__ import annotations
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.base import get_session
+from app.db.base import get_read_session, get_session
 from app.domains.company.repositories.availability_override import AvailabilityOverrideRepository
 from app.domains.company.repositories.booking import BookingRepository
 from app.domains.company.repositories.branch import BranchRepository
@@ -111,6 +111,18 @@ async def get_booking_service(
     )
 
 
+async def get_read_booking_service(session: AsyncSession = Depends(get_read_session)) -> BookingService:
+    """BookingService on the read replica, for booking lists."""
+    return BookingService(
+        BookingRepository(session),
+        StaffServiceRepository(session),
+        StaffAvailabilityRepository(session),
+        AvailabilityOverrideRepository(session),
+        ServiceRepository(session),
+        BranchRepository(session),
+    )
+
+
 async def get_member_service(
     repo: MemberRepository = Depends(get_member_repo),
 ) -> MemberService:
@@ -5,8 +5,8 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.base import get_session
-from app.domains.company.dependencies import get_booking_service
+from app.db.base import get_read_session
+from app.domains.company.dependencies import get_booking_service, get_read_booking_service
 from app.domains.company.repositories.service import ServiceRepository
 from app.domains.company.repositories.staff import StaffRepository
 from app.domains.company.schemas import (
@@ -24,8 +24,8 @@ router = APIRouter(tags=["bookings"])
 async def list_bookings(
     company_id: UUID,
     branch_id: UUID | None = None,
-    svc: BookingService = Depends(get_booking_service),
-    session: AsyncSession = Depends(get_session),
+    svc: BookingService = Depends(get_read_booking_service),
+    session: AsyncSession = Depends(get_read_session),
 ) -> list[BookingListResponse]:
     bookings = await svc.list_by_company(company_id, branch_id=branch_id)
 
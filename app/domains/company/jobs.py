@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import Config
+from app.db.periodic import PeriodicJob
+from app.domains.company.repositories.booking import BookingRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def complete_past_bookings(session: AsyncSession) -> None:
+    """Mark past confirmed bookings completed so customer profiles pick up the visits."""
+    completed = await BookingRepository(session).auto_complete_past_bookings()
+    if completed:
+        logger.info("Completed %d past bookings", completed)
+
+
+booking_completion_job = PeriodicJob(
+    "booking_completion",
+    interval=Config.BOOKING_COMPLETION_SWEEP_SECONDS,
+    job=complete_past_bookings,
+)
@@ -17,6 +17,7 @@ from sqlalchemy import (
     Text,
     Time,
     UniqueConstraint,
+    func,
 )
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -277,6 +278,30 @@ class Booking(TimestampMixin, Base):
     service: Mapped[Service] = relationship(back_populates="bookings")
 
 
+class CustomerProfile(Base):
+    """Per-customer aggregate of completed visits, maintained incrementally from booking status changes.
+
+    Counter columns map service id / staff id / weekday name to the number of
+    completed visits, so preferences can be read without loading the history.
+    """
+
+    __tablename__ = "customer_profiles"
+
+    company_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("companies.id", ondelete="CASCADE"), primary_key=True
+    )
+    customer_phone: Mapped[str] = mapped_column(String(31), primary_key=True)
+    customer_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    visit_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    last_visit_date: Mapped[date | None] = mapped_column(Date, nullable=True)
+    service_counts: Mapped[dict] = mapped_column(JSONB, default=dict, server_default="{}", nullable=False)
+    staff_counts: Mapped[dict] = mapped_column(JSONB, default=dict, server_default="{}", nullable=False)
+    weekday_counts: Mapped[dict] = mapped_column(JSONB, default=dict, server_default="{}", nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+
+
 class Member(TimestampMixin, Base):
     __tablename__ = "members"
 
@@ -2,6 +2,7 @@ from app.domains.company.repositories.availability_override import AvailabilityO
 from app.domains.company.repositories.booking import BookingRepository
 from app.domains.company.repositories.branch import BranchRepository
 from app.domains.company.repositories.company import CompanyRepository
+from app.domains.company.repositories.customer_profile import CustomerProfileRepository
 from app.domains.company.repositories.invite import InviteRepository
 from app.domains.company.repositories.member import MemberRepository
 from app.domains.company.repositories.service import ServiceRepository
@@ -14,6 +15,7 @@ __all__ = [
     "BookingRepository",
     "BranchRepository",
     "CompanyRepository",
+    "CustomerProfileRepository",
     "InviteRepository",
     "MemberRepository",
     "ServiceRepository",
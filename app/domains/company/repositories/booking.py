@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import datetime
+from typing import Any
 from uuid import UUID
 
 from sqlalchemy import and_, select, update
@@ -9,19 +10,31 @@ from sqlalchemy.orm import selectinload
 
 from app.domains.company.models import Booking, BookingStatus
 from app.domains.company.repositories.base import BaseRepository
+from app.domains.company.repositories.customer_profile import CustomerProfileRepository
+
+# Booking columns that feed customer_profiles
+_PROFILE_FIELDS = {"service_id", "staff_id", "date"}
 
 
 class BookingRepository(BaseRepository[Booking]):
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(session, Booking)
+        self.profiles = CustomerProfileRepository(session)
+
+    async def auto_complete_past_bookings(
+        self, company_id: UUID | None = None, *, branch_id: UUID | None = None
+    ) -> int:
+        """Mark confirmed bookings with a date before today as completed.
 
-    async def auto_complete_past_bookings(self, company_id: UUID, *, branch_id: UUID | None = None) -> int:
-        """Mark confirmed bookings with a date before today as completed."""
+        The newly completed visits are folded into customer_profiles in the same
+        transaction. Without a company_id every company is swept.
+        """
         conditions = [
-            Booking.company_id == company_id,
             Booking.status == BookingStatus.confirmed,
             Booking.date < datetime.date.today(),
         ]
+        if company_id is not None:
+            conditions.append(Booking.company_id == company_id)
         if branch_id is not None:
             conditions.append(Booking.branch_id == branch_id)
 
@@ -29,13 +42,45 @@ class BookingRepository(BaseRepository[Booking]):
             update(Booking)
             .where(and_(*conditions))
             .values(status=BookingStatus.completed)
+            .returning(
+                Booking.company_id, Booking.customer_phone, Booking.customer_name,
+                Booking.service_id, Booking.staff_id, Booking.date,
+            )
         )
-        result = await self.session.execute(stmt)
+        completed = (await self.session.execute(stmt)).mappings().all()
+        await self.profiles.add_visits(completed)
         await self.session.flush()
-        return result.rowcount
+        return len(completed)
+
+    async def create(self, **kwargs: Any) -> Booking:
+        booking = await super().create(**kwargs)
+        await self.profiles.remember_name(booking.company_id, booking.customer_phone, booking.customer_name)
+        return booking
+
+    async def update(self, entity_id: UUID, **kwargs: Any) -> Booking | None:
+        """Update a booking, keeping the customer's profile in step with status changes."""
+        booking = await self.get_by_id(entity_id)
+        previous_status = booking.status if booking is not None else None
+        updated = await super().update(entity_id, **kwargs)
+        if updated is None:
+            return updated
+
+        if previous_status == BookingStatus.completed:
+            if updated.status != previous_status or _PROFILE_FIELDS & kwargs.keys():
+                await self.profiles.rebuild(updated.company_id, updated.customer_phone)
+        elif updated.status == BookingStatus.completed:
+            await self.profiles.add_visits([{
+                "company_id": updated.company_id,
+                "customer_phone": updated.customer_phone,
+                "customer_name": updated.customer_name,
+                "service_id": updated.service_id,
+                "staff_id": updated.staff_id,
+                "date": updated.date,
+            }])
+        return updated
 
     async def list_by_company(self, company_id: UUID, *, branch_id: UUID | None = None) -> list[Booking]:
-        await self.auto_complete_past_bookings(company_id, branch_id=branch_id)
+        """Read-only (safe on the read replica); past bookings are completed by booking_completion_job."""
         filters: dict = {"company_id": company_id}
         if branch_id is not None:
             filters["branch_id"] = branch_id
@@ -111,30 +156,6 @@ class BookingRepository(BaseRepository[Booking]):
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
 
-    async def list_past_by_phone(self, company_id: UUID, phone: str) -> list[Booking]:
-        """All bookings for a customer across all branches of a company, ordered by date desc.
-
-        Calls auto_complete_past_bookings first so that old confirmed bookings are
-        reflected as completed before computing customer history.
-        """
-        await self.auto_complete_past_bookings(company_id)
-        stmt = (
-            select(Booking)
-            .where(
-                and_(
-                    Booking.company_id == company_id,
-                    Booking.customer_phone == phone,
-                )
-            )
-            .options(
-                selectinload(Booking.service),
-                selectinload(Booking.staff),
-            )
-            .order_by(Booking.date.desc(), Booking.start_time.desc())
-        )
-        result = await self.session.execute(stmt)
-        return list(result.scalars().all())
-
     async def list_by_customer_phone_with_relations(
         self,
         branch_id: UUID,
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from collections.abc import Iterable, Mapping
+from uuid import UUID
+
+from sqlalchemy import and_, func, literal_column, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domains.company.models import Booking, BookingStatus, CustomerProfile
+
+_COUNTER_COLUMNS = ("service_counts", "staff_counts", "weekday_counts")
+
+
+def _merge_counts(column: str):
+    """ON CONFLICT expression adding the incoming counter object to the stored one key by key."""
+    return literal_column(
+        "(SELECT COALESCE(jsonb_object_agg(k, n), '{}'::jsonb) FROM ("
+        " SELECT key AS k, sum(value::int) AS n FROM ("
+        f"  SELECT * FROM jsonb_each_text(customer_profiles.{column})"
+        f"  UNION ALL SELECT * FROM jsonb_each_text(excluded.{column})"
+        " ) AS u GROUP BY key) AS t)"
+    )
+
+
+def _fold(visits: Iterable[Mapping]) -> dict[tuple[UUID, str], dict]:
+    """Group completed-booking rows into one profile delta per (company, phone)."""
+    deltas: dict[tuple[UUID, str], dict] = defaultdict(lambda: {
+        "customer_name": None,
+        "visit_count": 0,
+        "last_visit_date": None,
+        **{col: Counter() for col in _COUNTER_COLUMNS},
+    })
+    for visit in visits:
+        delta = deltas[(visit["company_id"], visit["customer_phone"])]
+        delta["visit_count"] += 1
+        if delta["last_visit_date"] is None or visit["date"] >= delta["last_visit_date"]:
+            delta["last_visit_date"] = visit["date"]
+            delta["customer_name"] = visit["customer_name"] or delta["customer_name"]
+        delta["service_counts"][str(visit["service_id"])] += 1
+        delta["staff_counts"][str(visit["staff_id"])] += 1
+        delta["weekday_counts"][visit["date"].strftime("%A")] += 1
+    return deltas
+
+
+class CustomerProfileRepository:
+    """Reads and maintains the customer_profiles aggregate.
+
+    Completed visits are folded in incrementally; the rare transition away from
+    completed (an admin correcting a status) rebuilds the one affected profile.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def get(self, company_id: UUID, customer_phone: str) -> CustomerProfile | None:
+        return await self.session.get(CustomerProfile, (company_id, customer_phone))
+
+    async def add_visits(self, visits: Iterable[Mapping]) -> None:
+        """Add newly completed bookings (mappings with booking columns) to their profiles."""
+        deltas = _fold(visits)
+        if not deltas:
+            return
+        values = [
+            {"company_id": company_id, "customer_phone": phone, **{
+                key: dict(value) if key in _COUNTER_COLUMNS else value for key, value in delta.items()
+            }}
+            for (company_id, phone), delta in deltas.items()
+        ]
+        stmt = pg_insert(CustomerProfile).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CustomerProfile.company_id, CustomerProfile.customer_phone],
+            set_={
+                "customer_name": func.coalesce(stmt.excluded.customer_name, CustomerProfile.customer_name),
+                "visit_count": CustomerProfile.visit_count + stmt.excluded.visit_count,
+                "last_visit_date": func.greatest(CustomerProfile.last_visit_date, stmt.excluded.last_visit_date),
+                **{col: _merge_counts(col) for col in _COUNTER_COLUMNS},
+                "updated_at": func.now(),
+            },
+        )
+        await self.session.execute(stmt)
+
+    async def remember_name(self, company_id: UUID, customer_phone: str, customer_name: str | None) -> None:
+        """Create the profile on a customer's first booking so their name is known before any visit."""
+        stmt = pg_insert(CustomerProfile).values(
+            company_id=company_id, customer_phone=customer_phone, customer_name=customer_name,
+        )
+        if customer_name:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[CustomerProfile.company_id, CustomerProfile.customer_phone],
+                set_={"customer_name": customer_name, "updated_at": func.now()},
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing()
+        await self.session.execute(stmt)
+
+    async def rebuild(self, company_id: UUID, customer_phone: str) -> None:
+        """Recompute one profile from the customer's completed bookings."""
+        stmt = (
+            select(
+                Booking.company_id, Booking.customer_phone, Booking.customer_name,
+                Booking.service_id, Booking.staff_id, Booking.date,
+            )
+            .where(
+                and_(
+                    Booking.company_id == company_id,
+                    Booking.customer_phone == customer_phone,
+                    Booking.status == BookingStatus.completed,
+                )
+            )
+        )
+        visits = (await self.session.execute(stmt)).mappings().all()
+        profile = await self.get(company_id, customer_phone)
+        if profile is None:
+            await self.add_visits(visits)
+            return
+        delta = _fold(visits).get((company_id, customer_phone))
+        profile.visit_count = delta["visit_count"] if delta else 0
+        profile.last_visit_date = delta["last_visit_date"] if delta else None
+        for col in _COUNTER_COLUMNS:
+            setattr(profile, col, dict(delta[col]) if delta else {})
+        if delta and delta["customer_name"]:
+            profile.customer_name = delta["customer_name"]
+        await self.session.flush()
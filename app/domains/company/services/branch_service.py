@@ -4,6 +4,7 @@ from uuid import UUID
 
 from fastapi import HTTPException, status
 
+from app.domains.agent.services.response_cache import response_cache
 from app.domains.company.models import Branch
 from app.domains.company.repositories.branch import BranchRepository
 from app.domains.company.schemas import BranchCreate, BranchUpdate
@@ -42,9 +43,11 @@ class BranchService:
         updated = await self.repo.update(branch_id, **payload)
         if updated is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Branch not found")
+        response_cache.invalidate_branch(branch_id)
         return updated
 
     async def delete(self, branch_id: UUID) -> None:
         deleted = await self.repo.delete(branch_id)
         if not deleted:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Branch not found")
+        response_cache.invalidate_branch(branch_id)
@@ -4,6 +4,7 @@ from uuid import UUID
 
 from fastapi import HTTPException, status
 
+from app.domains.agent.services.response_cache import response_cache
 from app.domains.company.models import Service
 from app.domains.company.repositories.service import ServiceRepository
 from app.domains.company.schemas import ServiceCreate, ServiceUpdate
@@ -25,15 +26,18 @@ class CatalogService:
         return svc
 
     async def create(self, company_id: UUID, data: ServiceCreate) -> Service:
-        return await self.repo.create(company_id=company_id, **data.model_dump())
+        created = await self.repo.create(company_id=company_id, **data.model_dump())
+        response_cache.invalidate_company(company_id)
+        return created
 
     async def update(self, service_id: UUID, data: ServiceUpdate) -> Service:
         updated = await self.repo.update(service_id, **data.model_dump(exclude_unset=True))
         if updated is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Service not found")
+        response_cache.invalidate_company(updated.company_id)
         return updated
 
     async def delete(self, service_id: UUID) -> None:
-        deleted = await self.repo.delete(service_id)
-        if not deleted:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Service not found")
+        svc = await self.get(service_id)
+        await self.repo.delete(service_id)
+        response_cache.invalidate_company(svc.company_id)
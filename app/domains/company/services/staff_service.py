@@ -4,6 +4,7 @@ from uuid import UUID
 
 from fastapi import HTTPException, status
 
+from app.domains.agent.services.response_cache import response_cache
 from app.domains.company.models import (
     AvailabilityOverride,
     Staff,
@@ -52,18 +53,21 @@ class StaffService:
         return staff
 
     async def create_staff(self, company_id: UUID, data: StaffCreate) -> Staff:
-        return await self.staff_repo.create(company_id=company_id, **data.model_dump())
+        created = await self.staff_repo.create(company_id=company_id, **data.model_dump())
+        response_cache.invalidate_company(company_id)
+        return created
 
     async def update_staff(self, staff_id: UUID, data: StaffUpdate) -> Staff:
         updated = await self.staff_repo.update(staff_id, **data.model_dump(exclude_unset=True))
         if updated is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Staff not found")
+        response_cache.invalidate_company(updated.company_id)
         return updated
 
     async def delete_staff(self, staff_id: UUID) -> None:
-        deleted = await self.staff_repo.delete(staff_id)
-        if not deleted:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Staff not found")
+        staff = await self.get_staff(staff_id)
+        await self.staff_repo.delete(staff_id)
+        response_cache.invalidate_company(staff.company_id)
 
     # ── Staff Services ───────────────────────────────────────────────
 
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from app.config import Config
+from app.db.buffered_writer import BufferedWriter
+from app.domains.messaging.models import TurnTrace
+
+# Per-turn traces are written off the request path, like the agent audit rows.
+
+turn_trace_writer = BufferedWriter(
+    TurnTrace.__table__,
+    flush_interval=Config.AUDIT_FLUSH_INTERVAL_SECONDS,
+    batch_size=Config.AUDIT_BATCH_SIZE,
+    max_buffer=Config.AUDIT_MAX_BUFFER,
+)
@@ -3,10 +3,11 @@ from __future__ import annotations
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.base import get_session
+from app.db.base import get_read_session, get_session
 from app.domains.messaging.repositories.contact import ContactRepository
 from app.domains.messaging.repositories.conversation import ConversationRepository
 from app.domains.messaging.repositories.message import MessageRepository
+from app.domains.messaging.repositories.turn_trace import TurnTraceRepository
 from app.domains.messaging.services.messaging_service import MessagingService
 
 
@@ -25,6 +26,10 @@ async def get_message_repo(session: AsyncSession = Depends(get_session)) -> Mess
     return MessageRepository(session)
 
 
+async def get_turn_trace_repo(session: AsyncSession = Depends(get_session)) -> TurnTraceRepository:
+    return TurnTraceRepository(session)
+
+
 # ── Services ─────────────────────────────────────────────────────────────
 
 
@@ -32,5 +37,16 @@ async def get_messaging_service(
     contact_repo: ContactRepository = Depends(get_contact_repo),
     conversation_repo: ConversationRepository = Depends(get_conversation_repo),
     message_repo: MessageRepository = Depends(get_message_repo),
+    turn_trace_repo: TurnTraceRepository = Depends(get_turn_trace_repo),
 ) -> MessagingService:
-    return MessagingService(contact_repo, conversation_repo, message_repo)
+    return MessagingService(contact_repo, conversation_repo, message_repo, turn_trace_repo)
+
+
+async def get_read_messaging_service(session: AsyncSession = Depends(get_read_session)) -> MessagingService:
+    """MessagingService on the read replica, for list/detail endpoints that never write."""
+    return MessagingService(
+        ContactRepository(session),
+        ConversationRepository(session),
+        MessageRepository(session),
+        TurnTraceRepository(session),
+    )
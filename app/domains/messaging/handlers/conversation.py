@@ -2,9 +2,9 @@ from __future__ import annotations
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
-from app.domains.messaging.dependencies import get_messaging_service
+from app.domains.messaging.dependencies import get_messaging_service, get_read_messaging_service
 from app.domains.messaging.schemas import (
     ConversationDetailResponse,
     ConversationListItem,
@@ -12,6 +12,7 @@ from app.domains.messaging.schemas import (
     MemberReplyRequest,
     MessageResponse,
     ToolExecutionSummary,
+    TurnTraceResponse,
 )
 from app.domains.messaging.services.messaging_service import MessagingService
 from app.domains.whatsapp.dependencies import get_whatsapp_service
@@ -26,7 +27,7 @@ async def list_conversations(
     branch_id: UUID | None = None,
     status: str | None = None,
     needed_human: bool | None = None,
-    svc: MessagingService = Depends(get_messaging_service),
+    svc: MessagingService = Depends(get_read_messaging_service),
 ):
     conversations = await svc.list_conversations(
         company_id, branch_id, status, needed_human
@@ -54,7 +55,7 @@ async def list_conversations(
 async def get_conversation(
     company_id: UUID,
     conversation_id: UUID,
-    svc: MessagingService = Depends(get_messaging_service),
+    svc: MessagingService = Depends(get_read_messaging_service),
 ):
     conv = await svc.get_conversation_detail(conversation_id)
     return ConversationDetailResponse(
@@ -72,6 +73,17 @@ async def get_conversation(
     )
 
 
+@router.get("/{conversation_id}/traces", response_model=list[TurnTraceResponse])
+async def list_turn_traces(
+    company_id: UUID,
+    conversation_id: UUID,
+    limit: int = Query(50, ge=1, le=200),
+    svc: MessagingService = Depends(get_read_messaging_service),
+):
+    traces = await svc.list_turn_traces(conversation_id, limit)
+    return [TurnTraceResponse.model_validate(t) for t in traces]
+
+
 @router.post("/{conversation_id}/messages", response_model=MessageResponse)
 async def member_reply(
     company_id: UUID,
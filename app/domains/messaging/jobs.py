@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import Config
+from app.db.periodic import PeriodicJob
+from app.domains.messaging.repositories.message import MessageRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def prune_processed_channel_messages(session: AsyncSession) -> None:
+    """Drop dedup ids past the redelivery window so processed_channel_messages stays small."""
+    pruned = await MessageRepository(session).prune_processed_channel_messages()
+    if pruned:
+        logger.info("Pruned %d processed channel message ids", pruned)
+
+
+channel_dedup_prune_job = PeriodicJob(
+    "channel_dedup_prune",
+    interval=Config.CHANNEL_DEDUP_PRUNE_SECONDS,
+    job=prune_processed_channel_messages,
+)
@@ -8,6 +8,7 @@ from sqlalchemy.orm import joinedload
 
 from app.domains.company.repositories.base import BaseRepository
 from app.domains.messaging.models import Conversation, ConversationStatus, Message
+from app.domains.messaging.repositories.message import since_conversation_start
 
 
 class ConversationRepository(BaseRepository[Conversation]):
@@ -63,6 +64,9 @@ class ConversationRepository(BaseRepository[Conversation]):
         return result.unique().scalar_one_or_none()
 
     async def get_message_count(self, conversation_id: UUID) -> int:
-        stmt = select(func.count()).select_from(Message).where(Message.conversation_id == conversation_id)
+        stmt = select(func.count()).select_from(Message).where(
+            Message.conversation_id == conversation_id,
+            Message.created_at >= since_conversation_start(conversation_id),
+        )
         result = await self.session.execute(stmt)
         return result.scalar_one()
@@ -1,29 +1,63 @@
 from __future__ import annotations
 
+import datetime
+from typing import cast
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import CursorResult, delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domains.company.repositories.base import BaseRepository
-from app.domains.messaging.models import Message
+from app.domains.messaging.models import Conversation, Message, ProcessedChannelMessage
+
+# WhatsApp retries an undelivered webhook for up to 7 days
+DEDUP_WINDOW = datetime.timedelta(days=7)
+
+
+def since_conversation_start(conversation_id: UUID):
+    """created_at lower bound for a conversation's rows in a month-partitioned table.
+
+    The planner prunes partitions from before the conversation started at
+    execution time, so per-conversation lookups don't probe every month's index.
+    """
+    return select(Conversation.created_at).where(Conversation.id == conversation_id).scalar_subquery()
 
 
 class MessageRepository(BaseRepository[Message]):
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(session, Message)
 
-    async def exists_by_channel_message_id(self, channel_message_id: str) -> bool:
-        stmt = select(func.count()).select_from(Message).where(
-            Message.channel_message_id == channel_message_id
+    async def claim_channel_message(self, channel_message_id: str) -> bool:
+        """Record the message as processed. False if it already was (a redelivery).
+
+        A concurrent delivery of the same message blocks on the primary key
+        until the first transaction ends, so only one of them gets True.
+        """
+        stmt = (
+            pg_insert(ProcessedChannelMessage)
+            .values(channel_message_id=channel_message_id)
+            .on_conflict_do_nothing()
+            .returning(ProcessedChannelMessage.channel_message_id)
         )
-        result = await self.session.execute(stmt)
-        return result.scalar_one() > 0
+        return (await self.session.execute(stmt)).scalar_one_or_none() is not None
+
+    async def prune_processed_channel_messages(self) -> int:
+        """Forget processed message ids older than the redelivery window."""
+        cutoff = datetime.datetime.now(datetime.timezone.utc) - DEDUP_WINDOW
+        result = await self.session.execute(
+            delete(ProcessedChannelMessage).where(ProcessedChannelMessage.created_at < cutoff)
+        )
+        # A DELETE always yields a CursorResult, which carries the row count
+        return cast(CursorResult, result).rowcount
 
     async def get_recent(self, conversation_id: UUID, limit: int = 20) -> list[Message]:
         stmt = (
             select(Message)
-            .where(Message.conversation_id == conversation_id)
+            .where(
+                Message.conversation_id == conversation_id,
+                Message.created_at >= since_conversation_start(conversation_id),
+            )
             .order_by(Message.created_at.desc())
             .limit(limit)
         )
@@ -36,7 +70,11 @@ class MessageRepository(BaseRepository[Message]):
         stmt = (
             select(func.count())
             .select_from(Message)
-            .where(Message.conversation_id == conversation_id, Message.role == role)
+            .where(
+                Message.conversation_id == conversation_id,
+                Message.role == role,
+                Message.created_at >= since_conversation_start(conversation_id),
+            )
         )
         result = await self.session.execute(stmt)
         return result.scalar_one()
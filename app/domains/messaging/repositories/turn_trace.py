@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domains.company.repositories.base import BaseRepository
+from app.domains.messaging.models import TurnTrace
+
+
+class TurnTraceRepository(BaseRepository[TurnTrace]):
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(session, TurnTrace)
+
+    async def list_by_conversation(self, conversation_id: UUID, limit: int = 50) -> list[TurnTrace]:
+        stmt = (
+            select(TurnTrace)
+            .where(TurnTrace.conversation_id == conversation_id)
+            .order_by(TurnTrace.created_at.desc())
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
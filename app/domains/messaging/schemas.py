@@ -61,6 +61,17 @@ class ToolExecutionSummary(BaseModel):
     created_at: datetime
 
 
+class TurnTraceResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    message_id: uuid.UUID | None
+    total_ms: int
+    query_count: int
+    spans: list[dict]
+    created_at: datetime
+
+
 class ConversationDetailResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -10,6 +10,7 @@ from app.domains.messaging.models import ConversationStatus, MessageRole
 from app.domains.messaging.repositories.contact import ContactRepository
 from app.domains.messaging.repositories.conversation import ConversationRepository
 from app.domains.messaging.repositories.message import MessageRepository
+from app.domains.messaging.repositories.turn_trace import TurnTraceRepository
 
 logger = logging.getLogger(__name__)
 
@@ -20,10 +21,12 @@ class MessagingService:
         contact_repo: ContactRepository,
         conversation_repo: ConversationRepository,
         message_repo: MessageRepository,
+        turn_trace_repo: TurnTraceRepository,
     ) -> None:
         self.contact_repo = contact_repo
         self.conversation_repo = conversation_repo
         self.message_repo = message_repo
+        self.turn_trace_repo = turn_trace_repo
 
     # ── Contact resolution ────────────────────────────────────────────────
 
@@ -95,9 +98,10 @@ class MessagingService:
     # ── Messages ──────────────────────────────────────────────────────────
 
     async def is_duplicate(self, channel_message_id: str) -> bool:
+        """Claim the channel message id; True when it was already claimed (a redelivery)."""
         if not channel_message_id:
             return False
-        return await self.message_repo.exists_by_channel_message_id(channel_message_id)
+        return not await self.message_repo.claim_channel_message(channel_message_id)
 
     async def persist_message(
         self,
@@ -137,3 +141,6 @@ class MessagingService:
         if conv is None:
             raise HTTPException(status.HTTP_404_NOT_FOUND, "Conversation not found")
         return conv
+
+    async def list_turn_traces(self, conversation_id: UUID, limit: int = 50):
+        return await self.turn_trace_repo.list_by_conversation(conversation_id, limit)
@@ -8,10 +8,13 @@ from app.domains.agent.dependencies import get_agent_runner
 from app.domains.agent.services.agent_runner import AgentRunner
 from app.domains.messaging.dependencies import get_messaging_service
 from app.domains.messaging.services.messaging_service import MessagingService
+from app.domains.pipeline.intents import DEFAULT_INTENT_RULES, IntentRouter
 from app.domains.pipeline.service import InboundPipelineService
 from app.domains.whatsapp.dependencies import get_whatsapp_service
 from app.domains.whatsapp.services.whatsapp_service import WhatsAppService
 
+_intent_router = IntentRouter(DEFAULT_INTENT_RULES)
+
 
 async def get_pipeline_service(
     messaging_service: MessagingService = Depends(get_messaging_service),
@@ -24,4 +27,5 @@ async def get_pipeline_service(
         whatsapp_service=whatsapp_service,
         agent_service=agent_service,
         session=session,
+        intent_router=_intent_router,
     )
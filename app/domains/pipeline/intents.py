@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import enum
+import re
+from dataclasses import dataclass
+from typing import Protocol
+
+DEFAULT_MIN_CONFIDENCE = 0.9
+
+_POLITE_SUFFIX = r"(?: please| pls| thanks| thank you)?"
+
+
+class Intent(str, enum.Enum):
+    greeting = "greeting"
+    opening_hours = "opening_hours"
+    list_bookings = "list_bookings"
+    cancel_booking = "cancel_booking"
+
+
+@dataclass(frozen=True)
+class IntentMatch:
+    intent: Intent
+    confidence: float
+
+
+class IntentRule(Protocol):
+    """Classifies a customer message into one intent, or returns None."""
+
+    def match(self, text: str) -> IntentMatch | None: ...
+
+
+class RegexIntentRule:
+    """Matches when the whole (normalized) message matches one of the patterns.
+
+    Patterns are anchored so that "hi" matches but "hi, can I book a facial at 3pm?"
+    does not — anything with extra content is left to the LLM.
+    """
+
+    def __init__(self, intent: Intent, patterns: list[str], confidence: float = 1.0) -> None:
+        self.intent = intent
+        self.confidence = confidence
+        self._patterns = [re.compile(rf"^(?:{p}){_POLITE_SUFFIX}$") for p in patterns]
+
+    def match(self, text: str) -> IntentMatch | None:
+        normalized = _normalize(text)
+        if any(p.match(normalized) for p in self._patterns):
+            return IntentMatch(self.intent, self.confidence)
+        return None
+
+
+_POLITE = r"(?:please |pls |can you |could you |can i |could i |i want to |i'd like to |i would like to )?"
+
+DEFAULT_INTENT_RULES: list[IntentRule] = [
+    RegexIntentRule(Intent.greeting, [
+        r"(?:hi|hello|hey|hiya|good (?:morning|afternoon|evening))(?: there)?",
+    ]),
+    RegexIntentRule(Intent.opening_hours, [
+        r"(?:what are )?(?:your )?(?:opening|operating|business) hours",
+        r"(?:what time|when) do you (?:open|close)(?: today)?",
+        r"are you open(?: today)?",
+    ]),
+    RegexIntentRule(Intent.list_bookings, [
+        _POLITE + r"(?:show|list|check|see|view) (?:me )?my (?:bookings|appointments|booking|appointment)",
+        r"(?:what are |when are |when is )?my (?:upcoming )?(?:bookings|appointments|booking|appointment)",
+        r"do i have (?:a |any )?(?:bookings|appointments|booking|appointment)",
+    ]),
+    RegexIntentRule(Intent.cancel_booking, [
+        _POLITE + r"cancel my (?:booking|appointment|bookings|appointments)",
+    ]),
+]
+
+
+class IntentRouter:
+    """Fast-path classifier that runs before the LLM.
+
+    Rules are evaluated in order; the first match at or above min_confidence wins.
+    """
+
+    def __init__(self, rules: list[IntentRule], min_confidence: float = DEFAULT_MIN_CONFIDENCE) -> None:
+        self._rules = rules
+        self._min_confidence = min_confidence
+
+    def classify(self, text: str) -> IntentMatch | None:
+        for rule in self._rules:
+            match = rule.match(text)
+            if match is not None and match.confidence >= self._min_confidence:
+                return match
+        return None
+
+
+def _normalize(text: str) -> str:
+    lowered = text.lower().strip()
+    lowered = re.sub(r"[^\w\s']", " ", lowered)
+    return re.sub(r"\s+", " ", lowered).strip()
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+import datetime as _dt
 import logging
+import uuid
 from typing import TYPE_CHECKING, Protocol
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app import metrics, tracing
+from app.domains.messaging.audit import turn_trace_writer
 from app.domains.messaging.models import ConversationStatus
 from app.domains.pipeline.contracts import InboundMessage
 from app.domains.pipeline.guardrails import check_keyword_escalation, check_max_turns
+from app.domains.pipeline.intents import IntentRouter
 
 if TYPE_CHECKING:
     from app.domains.messaging.services.messaging_service import MessagingService
@@ -20,6 +25,7 @@ DEFAULT_ESCALATION_MESSAGE = "Let me connect you with our team. Someone will be
 
 class AgentServiceProtocol(Protocol):
     async def process(self, conversation_id, branch_id, customer_phone: str = "", customer_name: str | None = None) -> "AgentResponse": ...
+    async def handle_intent(self, conversation_id, branch_id, intent: str, customer_phone: str = "", customer_name: str | None = None) -> "AgentResponse | None": ...
     async def resolve_template(self, agent_id, trigger: str) -> str: ...
 
 
@@ -37,13 +43,23 @@ class InboundPipelineService:
         whatsapp_service: WhatsAppService,
         agent_service: AgentServiceProtocol | None = None,
         session: AsyncSession | None = None,
+        intent_router: IntentRouter | None = None,
     ) -> None:
         self.messaging = messaging_service
         self.whatsapp = whatsapp_service
         self.agent = agent_service
         self.session = session
+        self.intent_router = intent_router
 
     async def handle_inbound(self, inbound: InboundMessage) -> None:
+        trace, token = tracing.start_trace()
+        try:
+            await self._handle_inbound(inbound)
+        finally:
+            tracing.end_trace(token)
+            self._record_trace(trace)
+
+    async def _handle_inbound(self, inbound: InboundMessage) -> None:
         logger.info(
             "Pipeline start: phone=%s branch=%s channel=%s msg_id=%s",
             inbound.customer_phone, inbound.branch_id, inbound.channel, inbound.channel_message_id,
@@ -54,31 +70,34 @@ class InboundPipelineService:
             logger.info("Duplicate message %s — skipping", inbound.channel_message_id)
             return
 
-        # 2. Resolve contact
-        contact = await self.messaging.resolve_contact(
-            inbound.company_id, inbound.customer_phone, inbound.customer_name
-        )
-        logger.info("Resolved contact %s for phone=%s", contact.id, inbound.customer_phone)
-
-        # 3. Find or create conversation
-        conversation, is_new = await self.messaging.find_or_create_conversation(
-            branch_id=inbound.branch_id,
-            company_id=inbound.company_id,
-            contact_id=contact.id,
-            channel=inbound.channel,
-        )
-        logger.info(
-            "Conversation %s (is_new=%s) for contact=%s branch=%s",
-            conversation.id, is_new, contact.id, inbound.branch_id,
-        )
+        with tracing.span("persist_inbound"):
+            # 2. Resolve contact
+            contact = await self.messaging.resolve_contact(
+                inbound.company_id, inbound.customer_phone, inbound.customer_name
+            )
+            logger.info("Resolved contact %s for phone=%s", contact.id, inbound.customer_phone)
 
-        # 4. Persist inbound message
-        await self.messaging.persist_message(
-            conversation.id, "customer", inbound.text, inbound.channel_message_id
-        )
+            # 3. Find or create conversation
+            conversation, is_new = await self.messaging.find_or_create_conversation(
+                branch_id=inbound.branch_id,
+                company_id=inbound.company_id,
+                contact_id=contact.id,
+                channel=inbound.channel,
+            )
+            logger.info(
+                "Conversation %s (is_new=%s) for contact=%s branch=%s",
+                conversation.id, is_new, contact.id, inbound.branch_id,
+            )
+
+            # 4. Persist inbound message
+            message = await self.messaging.persist_message(
+                conversation.id, "customer", inbound.text, inbound.channel_message_id
+            )
+            _bind_trace(conversation.id, message.id)
 
         # 4b. Acknowledge receipt to the customer
-        await self._acknowledge(inbound)
+        with tracing.span("acknowledge"):
+            await self._acknowledge(inbound)
 
         # 5. If escalated, store only — do not invoke agent
         if conversation.status == ConversationStatus.escalated:
@@ -104,13 +123,19 @@ class InboundPipelineService:
                 await self.session.commit()
             logger.info("Invoking agent for conversation %s", conversation_id)
             try:
-                response = await self.agent.process(
-                    conversation_id,
-                    conversation_branch_id,
-                    customer_phone=inbound.customer_phone,
-                    customer_name=inbound.customer_name,
-                )
+                with tracing.span("intent"):
+                    response = await self._try_intent_fast_path(conversation_id, conversation_branch_id, inbound)
+                if response is None:
+                    metrics.incr("pipeline.agent_turns")
+                    with tracing.span("agent"):
+                        response = await self.agent.process(
+                            conversation_id,
+                            conversation_branch_id,
+                            customer_phone=inbound.customer_phone,
+                            customer_name=inbound.customer_name,
+                        )
             except Exception:
+                metrics.incr("pipeline.agent_failed")
                 logger.exception(
                     "Agent failed for conversation %s (phone=%s, branch=%s)",
                     conversation_id, inbound.customer_phone, inbound.branch_id,
@@ -135,7 +160,8 @@ class InboundPipelineService:
             return
 
         # 8. Persist agent response
-        await self.messaging.persist_message(conversation.id, "agent", response.text)
+        with tracing.span("persist_reply"):
+            await self.messaging.persist_message(conversation.id, "agent", response.text)
 
         # 9. Handle escalation signal from agent
         if response.escalate:
@@ -156,7 +182,48 @@ class InboundPipelineService:
 
         # 11. Deliver reply
         logger.info("Delivering reply to %s via %s", inbound.customer_phone, inbound.channel)
-        await self._deliver(inbound.branch_id, inbound.channel, inbound.customer_phone, response.text)
+        with tracing.span("delivery"):
+            await self._deliver(inbound.branch_id, inbound.channel, inbound.customer_phone, response.text)
+
+    def _record_trace(self, trace: tracing.TurnTrace) -> None:
+        """Queue the turn's trace for storage; turns that never stored an inbound message are skipped."""
+        if trace.conversation_id is None:
+            return
+        data = trace.to_dict()
+        metrics.observe("pipeline.turn_ms", data["total_ms"])
+        turn_trace_writer.add({
+            "id": uuid.uuid4(),
+            "conversation_id": trace.conversation_id,
+            "message_id": trace.message_id,
+            "total_ms": data["total_ms"],
+            "query_count": data["queries"],
+            "spans": data["spans"],
+            "created_at": _dt.datetime.now(_dt.timezone.utc),
+        })
+
+    async def _try_intent_fast_path(self, conversation_id, branch_id, inbound: InboundMessage) -> AgentResponse | None:
+        """Answer simple, high-confidence intents (greetings, hours, bookings) without the LLM."""
+        if self.agent is None or self.intent_router is None:
+            return None
+        match = self.intent_router.classify(inbound.text)
+        if match is None:
+            return None
+
+        response = await self.agent.handle_intent(
+            conversation_id,
+            branch_id,
+            match.intent.value,
+            customer_phone=inbound.customer_phone,
+            customer_name=inbound.customer_name,
+        )
+        if response is None:
+            logger.info("Intent %s not handled for conversation %s — falling back to agent", match.intent.value, conversation_id)
+            return None
+
+        logger.info("Intent %s answered without LLM for conversation %s", match.intent.value, conversation_id)
+        metrics.incr("pipeline.intent_bypass")
+        metrics.incr(f"pipeline.intent_bypass.{match.intent.value}")
+        return response
 
     async def _escalate_with_message(
         self, conversation_id, inbound: InboundMessage, reason: str | None = None,
@@ -206,3 +273,10 @@ class InboundPipelineService:
                 )
         else:
             logger.warning("No adapter for channel %s", channel)
+
+
+def _bind_trace(conversation_id, message_id) -> None:
+    trace = tracing.current_trace()
+    if trace is not None:
+        trace.conversation_id = conversation_id
+        trace.message_id = message_id
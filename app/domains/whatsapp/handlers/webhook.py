@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
 
 from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app import metrics
+from app.config import Config
 from app.db.base import get_session
 from app.domains.pipeline.contracts import InboundMessage
 from app.domains.pipeline.dependencies import get_pipeline_service
@@ -46,6 +50,9 @@ async def receive_message(
     pipeline: InboundPipelineService = Depends(get_pipeline_service),
 ) -> dict:
     body = await request.json()
+    if Config.WEBHOOK_RECORD_PATH:
+        # File I/O; keep it off the event loop
+        await asyncio.to_thread(_record_webhook, body)
 
     for entry in body.get("entry", []):
         for change in entry.get("changes", []):
@@ -91,6 +98,12 @@ async def receive_message(
                 try:
                     await pipeline.handle_inbound(inbound)
                 except Exception:
+                    metrics.incr("pipeline.failed")
                     logger.exception("Step 2 - msg=%s: Pipeline failed", msg_id)
 
     return {"status": "ok"}
+
+
+def _record_webhook(body: dict) -> None:
+    with open(Config.WEBHOOK_RECORD_PATH, "a", encoding="utf-8") as f:
+        f.write(json.dumps(body, separators=(",", ":")) + "\n")
@@ -16,7 +16,7 @@ from app.domains.whatsapp.schemas import WhatsAppAccountCreate, WhatsAppAccountU
 
 logger = logging.getLogger(__name__)
 
-GRAPH_API_BASE = "https://graph.facebook.com"
+GRAPH_API_BASE = Config.WHATSAPP_GRAPH_API_BASE
 
 
 class WhatsAppService:
@@ -6,22 +6,48 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import Config
 from app.db.base import dispose_db, init_db
+from app.db.bulkhead import BACKGROUND, PIPELINE, WorkloadMiddleware
+from app.db.partitions import partition_maintenance_job
+from app.domains.agent.audit import AUDIT_WRITERS
+from app.domains.agent.dependencies import get_prompt_builder, get_tool_registry
 from app.domains.agent.handlers import agent_router
+from app.domains.analytics.handlers import export_router
 from app.domains.analytics.handlers import router as analytics_router
+from app.domains.analytics.jobs import analytics_rollup_job
 from app.domains.auth.handler import router as auth_router
 from app.domains.company.handlers import company_router
+from app.domains.company.jobs import booking_completion_job
+from app.domains.messaging.audit import turn_trace_writer
 from app.domains.messaging.handlers import messaging_router
+from app.domains.messaging.jobs import channel_dedup_prune_job
 from app.domains.whatsapp.handlers import whatsapp_admin_router, whatsapp_company_router, whatsapp_webhook_router
+from app.routers.metrics import router as metrics_router
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_BACKGROUND_WRITERS = [*AUDIT_WRITERS, turn_trace_writer]
+_PERIODIC_JOBS = [booking_completion_job, partition_maintenance_job, channel_dedup_prune_job]
+if Config.ANALYTICS_ROLLUP_ENABLED:
+    _PERIODIC_JOBS.append(analytics_rollup_job)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_db("postgres")
     logger.info("Database engine created")
+    # Build the shared tool registry / prompt builder before the first turn
+    get_tool_registry()
+    get_prompt_builder()
+    for writer in _BACKGROUND_WRITERS:
+        writer.start()
+    for job in _PERIODIC_JOBS:
+        job.start()
     yield
+    for job in _PERIODIC_JOBS:
+        await job.stop()
+    for writer in _BACKGROUND_WRITERS:
+        await writer.stop()
     await dispose_db()
     logger.info("Database engine disposed")
 
@@ -34,6 +60,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Which DB bulkhead each request's sessions count against; everything else is dashboard traffic
+app.add_middleware(WorkloadMiddleware, prefixes={"/webhook": PIPELINE, "/api/v1/admin": BACKGROUND})
 app.include_router(whatsapp_webhook_router)
 app.include_router(whatsapp_admin_router)
 app.include_router(whatsapp_company_router)
@@ -42,6 +70,8 @@ app.include_router(company_router)
 app.include_router(messaging_router)
 app.include_router(agent_router)
 app.include_router(analytics_router)
+app.include_router(export_router)
+app.include_router(metrics_router)
 
 
 @app.get("/health")
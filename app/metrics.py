@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import math
+from collections import defaultdict, deque
+
+# Process-local counters and latency summaries. Each worker keeps its own numbers;
+# they are exposed on GET /api/v1/admin/metrics.
+
+_TIMING_WINDOW = 1000
+
+_counters: dict[str, int] = defaultdict(int)
+_timings: dict[str, deque[float]] = defaultdict(lambda: deque(maxlen=_TIMING_WINDOW))
+
+
+def incr(name: str, value: int = 1) -> None:
+    _counters[name] += value
+
+
+def observe(name: str, value_ms: float) -> None:
+    """Record one latency sample (milliseconds); only the latest samples are kept."""
+    _timings[name].append(value_ms)
+
+
+def counter(name: str) -> int:
+    return _counters.get(name, 0)
+
+
+def sample_count(name: str) -> int:
+    samples = _timings.get(name)
+    return len(samples) if samples else 0
+
+
+def percentile(name: str, pct: float) -> float | None:
+    samples = _timings.get(name)
+    if not samples:
+        return None
+    return _percentile(sorted(samples), pct)
+
+
+def snapshot() -> dict:
+    timings: dict[str, dict] = {}
+    for name, samples in _timings.items():
+        if not samples:
+            continue
+        ordered = sorted(samples)
+        timings[name] = {
+            "count": len(ordered),
+            "p50": round(_percentile(ordered, 50), 1),
+            "p95": round(_percentile(ordered, 95), 1),
+            "max": round(ordered[-1], 1),
+        }
+    return {"counters": dict(sorted(_counters.items())), "timings": dict(sorted(timings.items()))}
+
+
+def reset() -> None:
+    _counters.clear()
+    _timings.clear()
+
+
+def _percentile(ordered: list[float], pct: float) -> float:
+    rank = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[rank]
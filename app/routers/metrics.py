@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, status
+
+from app import metrics
+from app.db.base import get_pool_status
+from app.dependencies import verify_admin_key
+
+router = APIRouter(prefix="/api/v1/admin/metrics", tags=["metrics"], dependencies=[Depends(verify_admin_key)])
+
+
+@router.get("")
+async def get_metrics() -> dict:
+    return {**metrics.snapshot(), "db_pool": get_pool_status()}
+
+
+@router.delete("", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_metrics() -> None:
+    metrics.reset()
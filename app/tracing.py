@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import time
+from collections.abc import Iterator
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Per-turn tracing. A trace is bound to the current asyncio task through a
+# contextvar, so any code running inside a turn can open spans without having
+# the trace passed around. Outside a turn every call here is a no-op.
+
+_current: contextvars.ContextVar[TurnTrace | None] = contextvars.ContextVar("turn_trace", default=None)
+
+
+class TurnTrace:
+    def __init__(self) -> None:
+        self.conversation_id: UUID | None = None
+        self.message_id: UUID | None = None
+        self._start = time.monotonic()
+        self.query_count = 0
+        self.spans: list[dict] = []
+        self._open: list[dict] = []
+
+    @property
+    def elapsed_ms(self) -> int:
+        return int((time.monotonic() - self._start) * 1000)
+
+    def to_dict(self) -> dict:
+        """Compact form for storage: n=name, t=offset ms, d=duration ms, q=queries, plus span attributes."""
+        return {"total_ms": self.elapsed_ms, "queries": self.query_count, "spans": self.spans}
+
+
+def start_trace() -> tuple[TurnTrace, contextvars.Token]:
+    trace = TurnTrace()
+    return trace, _current.set(trace)
+
+
+def end_trace(token: contextvars.Token) -> None:
+    _current.reset(token)
+
+
+def current_trace() -> TurnTrace | None:
+    return _current.get()
+
+
+def detach_trace() -> None:
+    """Stop tracing in the current task, e.g. one spawned from a turn to run beside it.
+
+    A task copies its parent's contextvars, so without this its spans would
+    interleave with the turn's open spans and its queries count towards them.
+    Only the calling task's context is changed.
+    """
+    _current.set(None)
+
+
+@contextlib.contextmanager
+def span(name: str, **attrs) -> Iterator[dict]:
+    """Time a block of work within the current turn; yields the span so attributes can be added."""
+    trace = _current.get()
+    if trace is None:
+        yield {}
+        return
+    record = {"n": name, "t": trace.elapsed_ms, **attrs}
+    start = time.monotonic()
+    queries_before = trace.query_count
+    trace.spans.append(record)
+    trace._open.append(record)
+    try:
+        yield record
+    finally:
+        trace._open.pop()
+        record["d"] = int((time.monotonic() - start) * 1000)
+        record["q"] = trace.query_count - queries_before
+
+
+def annotate(**attrs) -> None:
+    """Attach attributes to the innermost open span."""
+    trace = _current.get()
+    if trace is not None and trace._open:
+        trace._open[-1].update(attrs)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_query(conn, cursor, statement, parameters, context, executemany) -> None:
+    trace = _current.get()
+    if trace is not None:
+        trace.query_count += 1
@@ -14,7 +14,11 @@ from app.config import Config  # noqa: E402
 
 # Import Base and all models so metadata is populated for autogenerate
 from app.models.base import Base  # noqa: E402
+import app.domains.agent.models  # noqa: E402, F401
+import app.domains.analytics.models  # noqa: E402, F401
 import app.domains.company.models  # noqa: E402, F401
+import app.domains.messaging.models  # noqa: E402, F401
+import app.domains.whatsapp.models  # noqa: E402, F401
 
 config = context.config
 
@@ -0,0 +1,33 @@
+"""Baseline: the original schema of scripts/create_tables.sql, before any migration.
+
+Nothing to run. Databases built from that script (or already in production)
+are marked as being at this revision with
+
+    alembic stamp 0001_baseline
+
+and then brought forward with `alembic upgrade head`. A fresh database built
+from the current scripts/create_tables.sql already has every later change and
+is stamped with `alembic stamp head`.
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_baseline"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    pass
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    pass
@@ -0,0 +1,155 @@
+"""Tables and columns added on top of the baseline schema before index tuning.
+
+Customer profiles, turn traces, LLM call audit and daily usage, the
+persisted knowledge index, analytics rollups and conversation funnels, plus
+the agent settings for model cascades, tool rounds, the response cache and
+template replies. Everything is IF NOT EXISTS, so a database that already
+picked some of these up from scripts/create_tables.sql upgrades cleanly.
+
+Revision ID: 0001a_agent_analytics_tables
+Revises: 0001_baseline
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0001a_agent_analytics_tables"
+down_revision: Union[str, Sequence[str], None] = "0001_baseline"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+AGENT_COLUMNS = [
+    ("model_policy", "JSONB"),
+    ("fallback_models", "JSONB NOT NULL DEFAULT '[]'"),
+    ("max_tool_rounds", "INTEGER"),
+    ("response_cache_enabled", "BOOLEAN NOT NULL DEFAULT false"),
+    ("template_replies_enabled", "BOOLEAN NOT NULL DEFAULT false"),
+]
+
+# In creation order; dropped in reverse
+TABLES = {
+    "customer_profiles": """
+        company_id      UUID         NOT NULL REFERENCES companies (id) ON DELETE CASCADE,
+        customer_phone  VARCHAR(31)  NOT NULL,
+        customer_name   VARCHAR(255),
+        visit_count     INTEGER      NOT NULL DEFAULT 0,
+        last_visit_date DATE,
+        service_counts  JSONB        NOT NULL DEFAULT '{}',
+        staff_counts    JSONB        NOT NULL DEFAULT '{}',
+        weekday_counts  JSONB        NOT NULL DEFAULT '{}',
+        updated_at      TIMESTAMPTZ  NOT NULL DEFAULT now(),
+        PRIMARY KEY (company_id, customer_phone)
+    """,
+    "turn_traces": """
+        id              UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+        conversation_id UUID        NOT NULL REFERENCES conversations (id) ON DELETE CASCADE,
+        message_id      UUID        REFERENCES messages (id) ON DELETE SET NULL,
+        total_ms        INTEGER     NOT NULL,
+        query_count     INTEGER     NOT NULL,
+        spans           JSONB       NOT NULL,
+        created_at      TIMESTAMPTZ NOT NULL DEFAULT now()
+    """,
+    "knowledge_indexes": """
+        agent_id   UUID PRIMARY KEY REFERENCES agents (id) ON DELETE CASCADE,
+        data       JSONB       NOT NULL,
+        updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    """,
+    "llm_calls": """
+        id                UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+        conversation_id   UUID         NOT NULL REFERENCES conversations (id) ON DELETE CASCADE,
+        branch_id         UUID         NOT NULL REFERENCES branches (id) ON DELETE CASCADE,
+        company_id        UUID         NOT NULL REFERENCES companies (id) ON DELETE CASCADE,
+        round             INTEGER      NOT NULL,
+        model             VARCHAR(127) NOT NULL,
+        reason            VARCHAR(31)  NOT NULL,
+        latency_ms        INTEGER      NOT NULL,
+        prompt_tokens     INTEGER,
+        completion_tokens INTEGER,
+        cached_tokens     INTEGER,
+        cost              NUMERIC(12, 6),
+        created_at        TIMESTAMPTZ  NOT NULL DEFAULT now()
+    """,
+    "llm_usage_daily": """
+        day               DATE           NOT NULL,
+        branch_id         UUID           NOT NULL REFERENCES branches (id) ON DELETE CASCADE,
+        model             VARCHAR(127)   NOT NULL,
+        company_id        UUID           NOT NULL REFERENCES companies (id) ON DELETE CASCADE,
+        calls             INTEGER        NOT NULL DEFAULT 0,
+        prompt_tokens     INTEGER        NOT NULL DEFAULT 0,
+        completion_tokens INTEGER        NOT NULL DEFAULT 0,
+        cached_tokens     INTEGER        NOT NULL DEFAULT 0,
+        cost              NUMERIC(12, 6) NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, branch_id, model)
+    """,
+    "analytics_daily": """
+        company_id                      UUID           NOT NULL REFERENCES companies (id) ON DELETE CASCADE,
+        day                             DATE           NOT NULL,
+        branch_id                       UUID           NOT NULL REFERENCES branches (id) ON DELETE CASCADE,
+        bookings_agent                  INTEGER        NOT NULL DEFAULT 0,
+        bookings_member                 INTEGER        NOT NULL DEFAULT 0,
+        revenue_agent                   NUMERIC(12, 2) NOT NULL DEFAULT 0,
+        revenue_member                  NUMERIC(12, 2) NOT NULL DEFAULT 0,
+        conversations                   INTEGER        NOT NULL DEFAULT 0,
+        conversations_active            INTEGER        NOT NULL DEFAULT 0,
+        conversations_escalated         INTEGER        NOT NULL DEFAULT 0,
+        conversations_resolved_by_ai    INTEGER        NOT NULL DEFAULT 0,
+        conversations_resolved_by_human INTEGER        NOT NULL DEFAULT 0,
+        conversations_with_bookings     INTEGER        NOT NULL DEFAULT 0,
+        messages_customer               INTEGER        NOT NULL DEFAULT 0,
+        messages_agent                  INTEGER        NOT NULL DEFAULT 0,
+        messages_member                 INTEGER        NOT NULL DEFAULT 0,
+        PRIMARY KEY (company_id, day, branch_id)
+    """,
+    "conversation_funnels": """
+        conversation_id UUID        PRIMARY KEY REFERENCES conversations (id) ON DELETE CASCADE,
+        company_id      UUID        NOT NULL REFERENCES companies (id) ON DELETE CASCADE,
+        branch_id       UUID        NOT NULL REFERENCES branches (id) ON DELETE CASCADE,
+        day             DATE        NOT NULL,
+        first_reply_ms  INTEGER,
+        escalation_ms   INTEGER,
+        booking_ms      INTEGER,
+        agent_reply_ms  INTEGER[]   NOT NULL DEFAULT '{}',
+        tool_ms         INTEGER[]   NOT NULL DEFAULT '{}',
+        updated_at      TIMESTAMPTZ NOT NULL DEFAULT now()
+    """,
+    "analytics_rollup_state": """
+        name      VARCHAR(63) PRIMARY KEY,
+        watermark TIMESTAMPTZ
+    """,
+}
+
+INDEXES = [
+    "idx_turn_traces_conversation_id ON turn_traces (conversation_id, created_at)",
+    "idx_llm_calls_conversation_id ON llm_calls (conversation_id)",
+    "idx_llm_calls_branch_id_created ON llm_calls (branch_id, created_at)",
+    "idx_llm_usage_daily_company_day ON llm_usage_daily (company_id, day)",
+    "idx_conversation_funnels_company_day ON conversation_funnels (company_id, day)",
+    # Change detection for the analytics rollup sweep
+    "idx_bookings_updated_at ON bookings (updated_at)",
+    "idx_conversations_updated_at ON conversations (updated_at)",
+    "idx_messages_created_at ON messages (created_at)",
+    "idx_tool_executions_created ON tool_executions (created_at)",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for column, definition in AGENT_COLUMNS:
+        op.execute(f"ALTER TABLE agents ADD COLUMN IF NOT EXISTS {column} {definition}")
+    for table, columns in TABLES.items():
+        op.execute(f"CREATE TABLE IF NOT EXISTS {table} ({columns})")
+    for index in INDEXES:
+        op.execute(f"CREATE INDEX IF NOT EXISTS {index}")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for index in reversed(INDEXES):
+        op.execute(f"DROP INDEX IF EXISTS {index.split()[0]}")
+    for table in reversed(TABLES):
+        op.execute(f"DROP TABLE IF EXISTS {table}")
+    for column, _ in reversed(AGENT_COLUMNS):
+        op.execute(f"ALTER TABLE agents DROP COLUMN IF EXISTS {column}")
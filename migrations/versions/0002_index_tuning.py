@@ -0,0 +1,60 @@
+"""Composite indexes for hot pipeline, booking and analytics queries.
+
+Each new index covers the full filter (and sort) of a repository query; the
+single-column indexes they make redundant are dropped. Built CONCURRENTLY so
+the tables stay writable; IF [NOT] EXISTS keeps reruns after a failed
+concurrent build safe. scripts/check_query_plans.py verifies the planner uses
+them.
+
+Revision ID: 0002_index_tuning
+Revises: 0001a_agent_analytics_tables
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_index_tuning"
+down_revision: Union[str, Sequence[str], None] = "0001a_agent_analytics_tables"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, index it supersedes)
+INDEXES = [
+    # MessageRepository.get_recent: WHERE conversation_id ORDER BY created_at DESC LIMIT n
+    ("idx_messages_conversation_created", "messages", ["conversation_id", "created_at"],
+     "idx_messages_conversation_id"),
+    # MessageRepository.count_by_role
+    ("idx_messages_conversation_role", "messages", ["conversation_id", "role"], None),
+    # CustomerProfileRepository.rebuild (a customer's bookings within a company)
+    ("idx_bookings_company_phone_date", "bookings", ["company_id", "customer_phone", "date"], None),
+    # BookingRepository.list_by_customer_phone(_with_relations): branch + phone, newest first
+    ("idx_bookings_branch_phone_date", "bookings", ["branch_id", "customer_phone", "date"], None),
+    # Analytics trends and exports: company bookings by creation time
+    ("idx_bookings_company_created", "bookings", ["company_id", "created_at"], "idx_bookings_company_id"),
+    # AvailabilityOverrideRepository.get_for_staff_branch_date
+    ("idx_availability_overrides_staff_branch_date", "availability_overrides", ["staff_id", "branch_id", "date"],
+     "idx_availability_overrides_staff_id"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns, superseded in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+            if superseded:
+                op.drop_index(superseded, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns, superseded in reversed(INDEXES):
+            if superseded:
+                op.create_index(
+                    superseded, table, columns[:1], postgresql_concurrently=True, if_not_exists=True
+                )
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,150 @@
+"""Partition messages and tool_executions by month on created_at.
+
+Each table is rebuilt as a range-partitioned table with one partition per
+month of existing data (plus the months the maintenance job would premake)
+and a default partition, then the rows are copied across. The primary keys
+become (id, created_at); the foreign keys pointing at messages.id are
+dropped, since a partitioned table can only be referenced by its full key.
+The unique channel_message_id index can't survive either, so webhook dedup
+moves to a small processed_channel_messages table, seeded with the last
+7 days of message ids.
+The copy holds an exclusive lock on both tables: run it in a maintenance
+window.
+
+Revision ID: 0003_partition_messages
+Revises: 0002_index_tuning
+Create Date: 2026-10-19 00:00:00
+
+"""
+import datetime
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.config import Config
+from app.db.partitions import add_months, create_partition_sql, month_start
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_partition_messages"
+down_revision: Union[str, Sequence[str], None] = "0002_index_tuning"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = {
+    "messages": """
+        id                 UUID         NOT NULL DEFAULT gen_random_uuid(),
+        conversation_id    UUID         NOT NULL REFERENCES conversations (id) ON DELETE CASCADE,
+        role               message_role NOT NULL,
+        content            TEXT         NOT NULL,
+        channel_message_id VARCHAR(255),
+        created_at         TIMESTAMPTZ  NOT NULL DEFAULT now()
+    """,
+    "tool_executions": """
+        id              UUID                  NOT NULL DEFAULT gen_random_uuid(),
+        conversation_id UUID                  NOT NULL REFERENCES conversations (id) ON DELETE CASCADE,
+        message_id      UUID,
+        tool            VARCHAR(63)           NOT NULL,
+        input           JSONB                 NOT NULL,
+        output          JSONB                 NOT NULL,
+        status          tool_execution_status NOT NULL,
+        duration_ms     INTEGER,
+        created_at      TIMESTAMPTZ           NOT NULL DEFAULT now()
+    """,
+}
+
+INDEXES = {
+    "messages": [
+        "CREATE INDEX idx_messages_conversation_created ON messages (conversation_id, created_at)",
+        "CREATE INDEX idx_messages_conversation_role ON messages (conversation_id, role)",
+        "CREATE INDEX idx_messages_created_at ON messages (created_at)",
+    ],
+    "tool_executions": [
+        "CREATE INDEX idx_tool_executions_conversation_id ON tool_executions (conversation_id)",
+        "CREATE INDEX idx_tool_executions_message_id ON tool_executions (message_id)",
+        "CREATE INDEX idx_tool_executions_created ON tool_executions (created_at)",
+    ],
+}
+
+CHANNEL_MESSAGE_ID = "ON messages (channel_message_id) WHERE channel_message_id IS NOT NULL"
+MESSAGE_FKS = [
+    ("turn_traces", "turn_traces_message_id_fkey"),
+    ("tool_executions", "tool_executions_message_id_fkey"),
+]
+
+
+def _swap_out(table: str) -> str:
+    """Rename the current table (and its pkey/index names) out of the way; returns the old name."""
+    old = f"{table}_unpartitioned"
+    op.execute(f"ALTER TABLE {table} RENAME TO {old}")
+    op.execute(f"ALTER TABLE {old} RENAME CONSTRAINT {table}_pkey TO {old}_pkey")
+    for statement in INDEXES[table]:
+        op.execute(f"DROP INDEX IF EXISTS {statement.split()[2]}")
+    return old
+
+
+def _copy(table: str, old: str) -> None:
+    columns = ", ".join(line.split()[0] for line in COLUMNS[table].strip().splitlines())
+    op.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {old}")
+    op.execute(f"DROP TABLE {old}")
+    for statement in INDEXES[table]:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, constraint in MESSAGE_FKS:
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {constraint}")
+    op.execute("DROP INDEX IF EXISTS uq_messages_channel_message_id")
+
+    bind = op.get_bind()
+    current = month_start(datetime.date.today())
+    for table in COLUMNS:
+        old = _swap_out(table)
+        op.execute(
+            f"CREATE TABLE {table} ({COLUMNS[table]}, PRIMARY KEY (id, created_at)) "
+            "PARTITION BY RANGE (created_at)"
+        )
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+        oldest = bind.execute(sa.text(f"SELECT min(created_at) FROM {old}")).scalar()
+        month = month_start(oldest.astimezone(datetime.timezone.utc).date()) if oldest else current
+        while month <= add_months(current, Config.PARTITION_PREMAKE_MONTHS):
+            op.execute(create_partition_sql(table, month))
+            month = add_months(month, 1)
+
+        _copy(table, old)
+
+    op.execute(f"CREATE INDEX idx_messages_channel_message_id {CHANNEL_MESSAGE_ID}")
+
+    op.execute(
+        "CREATE TABLE processed_channel_messages ("
+        "channel_message_id VARCHAR(255) PRIMARY KEY, created_at TIMESTAMPTZ NOT NULL DEFAULT now())"
+    )
+    op.execute(
+        "CREATE INDEX idx_processed_channel_messages_created_at ON processed_channel_messages (created_at)"
+    )
+    op.execute(
+        "INSERT INTO processed_channel_messages (channel_message_id, created_at) "
+        "SELECT channel_message_id, max(created_at) FROM messages "
+        "WHERE channel_message_id IS NOT NULL AND created_at >= now() - interval '7 days' "
+        "GROUP BY channel_message_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TABLE IF EXISTS processed_channel_messages")
+    op.execute("DROP INDEX IF EXISTS idx_messages_channel_message_id")
+    for table in COLUMNS:
+        old = _swap_out(table)
+        op.execute(f"CREATE TABLE {table} ({COLUMNS[table]}, PRIMARY KEY (id))")
+        # Dropping the partitioned table drops every partition with it
+        _copy(table, old)
+
+    op.execute(f"CREATE UNIQUE INDEX uq_messages_channel_message_id {CHANNEL_MESSAGE_ID}")
+    for table, constraint in MESSAGE_FKS:
+        op.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {constraint} "
+            "FOREIGN KEY (message_id) REFERENCES messages (id) ON DELETE SET NULL"
+        )
@@ -0,0 +1,45 @@
+"""Build customer_profiles from existing bookings.
+
+Run once after creating the customer_profiles table on a database that already
+has bookings; afterwards profiles are kept up to date as bookings change status.
+Every customer who has ever booked gets a profile carrying the name from their
+latest booking, as remember_name would have given them; visit counts come from
+completed bookings only.
+
+    python -m scripts.backfill_customer_profiles
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+from sqlalchemy import select
+
+from app.db.base import dispose_db, get_session_factory, init_db
+from app.domains.company.models import Booking
+from app.domains.company.repositories.customer_profile import CustomerProfileRepository
+
+
+async def main() -> None:
+    init_db("postgres")
+    try:
+        async with get_session_factory()() as session:
+            # Latest booking per customer, for the name they last booked under
+            customers = (await session.execute(
+                select(Booking.company_id, Booking.customer_phone, Booking.customer_name)
+                .distinct(Booking.company_id, Booking.customer_phone)
+                .order_by(Booking.company_id, Booking.customer_phone, Booking.created_at.desc())
+            )).all()
+            profiles = CustomerProfileRepository(session)
+            for company_id, phone, name in customers:
+                await profiles.rebuild(company_id, phone)
+                # After the rebuild, so the latest booking's name wins as it does live
+                await profiles.remember_name(company_id, phone, name)
+            await session.commit()
+        print(f"Rebuilt {len(customers)} customer profiles")
+    finally:
+        await dispose_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
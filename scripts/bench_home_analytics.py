@@ -0,0 +1,169 @@
+"""Time the home dashboard query against a seeded company.
+
+    python -m scripts.bench_home_analytics --seed --messages 1000000
+    python -m scripts.bench_home_analytics --company-id <uuid> --runs 50
+
+--seed creates a throwaway company ("bench-…") with one branch, a year of
+conversations, the requested number of messages and a booking for every third
+conversation, all with set-based INSERTs. Without --company-id the most recent
+seeded company is used. Each mode runs a few warm-up calls and then --runs
+timed calls of AnalyticsService.get_home_analytics:
+
+    live    the CTE/FILTER statements over bookings, conversations and messages
+    rollup  analytics_daily (the rollup is swept first if it has never run)
+
+Delete the seeded data with --drop (cascades from the company row).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import math
+import time
+import uuid
+from unittest import mock
+
+from sqlalchemy import text
+
+from app.config import Config
+from app.db.base import dispose_db, get_session_factory, init_db
+from app.domains.analytics.rollup import AnalyticsRollup
+from app.domains.analytics.service import AnalyticsService
+
+_WARMUP_RUNS = 3
+_MESSAGES_PER_CONVERSATION = 20
+
+
+async def seed(messages: int) -> uuid.UUID:
+    company_id = uuid.uuid4()
+    conversations = max(1, messages // _MESSAGES_PER_CONVERSATION)
+    params = {"company_id": company_id, "slug": f"bench-{company_id.hex[:12]}", "conversations": conversations}
+    statements = [
+        "INSERT INTO companies (id, name, slug) VALUES (:company_id, 'Bench', :slug)",
+        "INSERT INTO branches (company_id, name, address, timezone, operating_hours) "
+        "VALUES (:company_id, 'Bench branch', 'Nowhere', 'UTC', '{}')",
+        "INSERT INTO services (company_id, name, default_price, default_duration_minutes) "
+        "VALUES (:company_id, 'Massage', 80, 60)",
+        "INSERT INTO staff (company_id, name) VALUES (:company_id, 'Bench staff')",
+        "INSERT INTO contacts (company_id, phone) "
+        "SELECT :company_id, '1555' || lpad(g::text, 8, '0') FROM generate_series(1, :conversations) g",
+        # One conversation per contact; 10% still active, 10% escalated, the rest resolved
+        """
+        INSERT INTO conversations (branch_id, company_id, contact_id, channel, status, escalated_at, created_at)
+        SELECT b.id, :company_id, c.id, 'whatsapp',
+               (CASE WHEN n % 10 = 0 THEN 'active' WHEN n % 10 = 1 THEN 'escalated' ELSE 'resolved' END)::conversation_status,
+               CASE WHEN n % 10 IN (1, 2) THEN now() END,
+               now() - (n % 365) * interval '1 day'
+        FROM (SELECT id, row_number() OVER () AS n FROM contacts WHERE company_id = :company_id) c
+        CROSS JOIN (SELECT id FROM branches WHERE company_id = :company_id) b
+        """,
+        f"""
+        INSERT INTO messages (conversation_id, role, content, created_at)
+        SELECT c.id, (ARRAY['customer', 'agent', 'member'])[1 + g % 3]::message_role, 'bench message',
+               c.created_at + g * interval '1 minute'
+        FROM conversations c CROSS JOIN generate_series(1, {_MESSAGES_PER_CONVERSATION}) g
+        WHERE c.company_id = :company_id
+        """,
+        """
+        INSERT INTO bookings (company_id, branch_id, staff_id, service_id, customer_phone, date,
+                              start_time, end_time, duration_minutes, price, currency, status,
+                              booked_via, conversation_id, created_at)
+        SELECT :company_id, c.branch_id, st.id, sv.id, '1555', c.created_at::date + 1,
+               '10:00', '11:00', 60, 80, 'SGD',
+               (CASE WHEN c.n % 9 = 0 THEN 'cancelled' ELSE 'completed' END)::booking_status,
+               (CASE WHEN c.n % 2 = 0 THEN 'agent' ELSE 'member' END)::booked_via,
+               c.id, c.created_at
+        FROM (SELECT id, branch_id, created_at, row_number() OVER () AS n
+              FROM conversations WHERE company_id = :company_id) c
+        CROSS JOIN (SELECT id FROM staff WHERE company_id = :company_id) st
+        CROSS JOIN (SELECT id FROM services WHERE company_id = :company_id) sv
+        WHERE c.n % 3 = 0
+        """,
+    ]
+    async with get_session_factory()() as session:
+        for statement in statements:
+            await session.execute(text(statement), params)
+        await session.commit()
+        await session.execute(text("ANALYZE companies, conversations, messages, bookings"))
+    return company_id
+
+
+async def latest_seeded_company() -> uuid.UUID | None:
+    async with get_session_factory()() as session:
+        return (await session.execute(
+            text("SELECT id FROM companies WHERE slug LIKE 'bench-%' ORDER BY created_at DESC LIMIT 1")
+        )).scalar_one_or_none()
+
+
+async def time_mode(company_id: uuid.UUID, mode: str, runs: int) -> list[float]:
+    timings: list[float] = []
+    with mock.patch.object(Config, "ANALYTICS_ROLLUP_ENABLED", mode == "rollup"):
+        for i in range(_WARMUP_RUNS + runs):
+            async with get_session_factory()() as session:
+                start = time.perf_counter()
+                await AnalyticsService(session).get_home_analytics(company_id)
+                elapsed_ms = (time.perf_counter() - start) * 1000
+            if i >= _WARMUP_RUNS:
+                timings.append(elapsed_ms)
+    return sorted(timings)
+
+
+async def ensure_rollup() -> None:
+    async with get_session_factory()() as session:
+        rollup = AnalyticsRollup(session)
+        if not await rollup.is_ready():
+            start = time.perf_counter()
+            rebuilt = await rollup.sweep()
+            await session.commit()
+            print(f"rollup backfill  {rebuilt} buckets in {time.perf_counter() - start:.1f}s")
+
+
+def summarize(mode: str, timings: list[float]) -> str:
+    def pct(p: float) -> float:
+        return timings[max(0, math.ceil(p / 100 * len(timings)) - 1)]
+
+    return (f"{mode:<7} p50 {pct(50):8.1f} ms  p95 {pct(95):8.1f} ms  "
+            f"max {timings[-1]:8.1f} ms  ({len(timings)} runs)")
+
+
+async def main(args: argparse.Namespace) -> None:
+    init_db("postgres")
+    try:
+        if args.seed:
+            start = time.perf_counter()
+            company_id = await seed(args.messages)
+            print(f"seeded company {company_id} in {time.perf_counter() - start:.1f}s")
+        else:
+            company_id = args.company_id or await latest_seeded_company()
+        if company_id is None:
+            raise SystemExit("No company: pass --company-id or --seed")
+
+        if args.drop:
+            async with get_session_factory()() as session:
+                await session.execute(text("DELETE FROM companies WHERE id = :id"), {"id": company_id})
+                await session.commit()
+            print(f"dropped company {company_id}")
+            return
+
+        for mode in args.modes:
+            if mode == "rollup":
+                await ensure_rollup()
+            print(summarize(mode, await time_mode(company_id, mode, args.runs)))
+    finally:
+        await dispose_db()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", action="store_true", help="create a synthetic company first")
+    parser.add_argument("--messages", type=int, default=1_000_000, help="messages to seed")
+    parser.add_argument("--company-id", type=uuid.UUID)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--modes", nargs="+", choices=["live", "rollup"], default=["live", "rollup"])
+    parser.add_argument("--drop", action="store_true", help="delete the seeded company and exit")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,144 @@
+"""Query-plan regression check: every hot repository query must use its index.
+
+    python -m scripts.check_query_plans
+
+Each case calls a repository method with a session that records the SQL
+instead of running it, then EXPLAINs that statement on the real database
+(with sequential scans disabled, so tiny dev tables don't hide a missing
+index) and fails if the expected index is absent from the plan. Exits 1 on
+any failure, so it can gate CI against a migrated database.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import json
+import sys
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from app.db.base import dispose_db, get_session_factory, init_db
+from app.domains.analytics.service import AnalyticsService
+from app.domains.company.repositories.availability_override import AvailabilityOverrideRepository
+from app.domains.company.repositories.booking import BookingRepository
+from app.domains.company.repositories.customer_profile import CustomerProfileRepository
+from app.domains.messaging.models import MessageRole
+from app.domains.messaging.repositories.message import MessageRepository
+
+
+class _Captured(Exception):
+    pass
+
+
+class _RecordingSession:
+    """Stands in for AsyncSession: records statements and stops at the one under test."""
+
+    def __init__(self, stop_at: int) -> None:
+        self.statements: list = []
+        self._stop_at = stop_at
+
+    async def execute(self, stmt, *args, **kwargs):
+        self.statements.append(stmt)
+        if len(self.statements) > self._stop_at:
+            raise _Captured
+        return _EmptyResult()
+
+    async def get(self, *args, **kwargs):
+        return None
+
+
+class _EmptyResult:
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    def __iter__(self):
+        return iter(())
+
+
+@dataclass
+class Case:
+    name: str
+    call: Callable[[_RecordingSession], Awaitable]
+    index: str
+    # Which of the method's statements to explain (0 = first)
+    statement: int = 0
+
+
+_ID = uuid.uuid4()
+_TODAY = datetime.date.today()
+
+CASES = [
+    Case("MessageRepository.get_recent",
+         lambda s: MessageRepository(s).get_recent(_ID),
+         "idx_messages_conversation_created"),
+    Case("MessageRepository.count_by_role",
+         lambda s: MessageRepository(s).count_by_role(_ID, MessageRole.agent),
+         "idx_messages_conversation_role"),
+    Case("BookingRepository.list_by_customer_phone",
+         lambda s: BookingRepository(s).list_by_customer_phone(_ID, "15550000000"),
+         "idx_bookings_branch_phone_date"),
+    Case("CustomerProfileRepository.rebuild",
+         lambda s: CustomerProfileRepository(s).rebuild(_ID, "15550000000"),
+         "idx_bookings_company_phone_date"),
+    Case("AvailabilityOverrideRepository.get_for_staff_branch_date",
+         lambda s: AvailabilityOverrideRepository(s).get_for_staff_branch_date(_ID, _ID, _TODAY),
+         "idx_availability_overrides_staff_branch_date"),
+    Case("AnalyticsService live booking trend",
+         lambda s: AnalyticsService(s)._live_home_rows(_ID, None),
+         "idx_bookings_company_created", statement=1),
+]
+
+
+async def capture(case: Case) -> str:
+    session = _RecordingSession(case.statement)
+    try:
+        await case.call(session)
+    except _Captured:
+        pass
+    stmt = session.statements[case.statement]
+    return str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def plan_indexes(plan: dict) -> set[str]:
+    found = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        found |= plan_indexes(child)
+    return found
+
+
+async def parent_index(session, name: str) -> str:
+    """The partitioned index a partition's index belongs to (plans name the partition's own index)."""
+    parent = (await session.execute(
+        text("SELECT CAST(inhparent AS regclass)::text FROM pg_inherits WHERE inhrelid = CAST(:name AS regclass)"),
+        {"name": name},
+    )).scalar_one_or_none()
+    return parent or name
+
+
+async def main() -> int:
+    init_db("postgres")
+    failures = 0
+    try:
+        async with get_session_factory()() as session:
+            await session.execute(text("SET LOCAL enable_seqscan = off"))
+            for case in CASES:
+                sql = await capture(case)
+                raw = (await session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))).scalar_one()
+                plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+                used = {await parent_index(session, name) for name in plan_indexes(plan)}
+                ok = case.index in used
+                failures += not ok
+                print(f"{'ok  ' if ok else 'FAIL'} {case.name}: expected {case.index}, plan uses {sorted(used) or 'no index'}")
+            await session.rollback()
+    finally:
+        await dispose_db()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
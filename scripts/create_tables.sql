@@ -142,7 +142,7 @@ CREATE TABLE availability_overrides (
     updated_at TIMESTAMPTZ   NOT NULL DEFAULT now()
 );
 
-CREATE INDEX idx_availability_overrides_staff_id  ON availability_overrides (staff_id);
+CREATE INDEX idx_availability_overrides_staff_branch_date ON availability_overrides (staff_id, branch_id, date);
 CREATE INDEX idx_availability_overrides_branch_id ON availability_overrides (branch_id);
 
 
@@ -171,13 +171,30 @@ CREATE TABLE bookings (
     CONSTRAINT ck_booking_time_order CHECK (start_time < end_time)
 );
 
-CREATE INDEX idx_bookings_company_id ON bookings (company_id);
+CREATE INDEX idx_bookings_company_created ON bookings (company_id, created_at);
+CREATE INDEX idx_bookings_company_phone_date ON bookings (company_id, customer_phone, date);
+CREATE INDEX idx_bookings_branch_phone_date  ON bookings (branch_id, customer_phone, date);
 CREATE INDEX idx_bookings_branch_id  ON bookings (branch_id);
 CREATE INDEX idx_bookings_staff_id   ON bookings (staff_id);
 CREATE INDEX idx_bookings_service_id ON bookings (service_id);
 CREATE INDEX idx_bookings_date       ON bookings (date);
 CREATE INDEX idx_bookings_staff_date ON bookings (staff_id, date) WHERE status = 'confirmed';
 
+-- Per-customer aggregate of completed visits, updated as bookings change status
+CREATE TABLE customer_profiles (
+    company_id      UUID         NOT NULL REFERENCES companies (id) ON DELETE CASCADE,
+    customer_phone  VARCHAR(31)  NOT NULL,
+    customer_name   VARCHAR(255),
+    visit_count     INTEGER      NOT NULL DEFAULT 0,
+    last_visit_date DATE,
+    service_counts  JSONB        NOT NULL DEFAULT '{}',
+    staff_counts    JSONB        NOT NULL DEFAULT '{}',
+    weekday_counts  JSONB        NOT NULL DEFAULT '{}',
+    updated_at      TIMESTAMPTZ  NOT NULL DEFAULT now(),
+
+    PRIMARY KEY (company_id, customer_phone)
+);
+
 
 CREATE TABLE members (
     id         UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -275,20 +292,52 @@ CREATE UNIQUE INDEX uq_conversations_open_per_customer
     WHERE status IN ('active', 'escalated');
 
 
+-- Range-partitioned by month on created_at. Monthly partitions
+-- (messages_YYYY_MM) are created ahead of time and expired by the
+-- partition_maintenance job (app/db/partitions.py); the default partition only
+-- catches rows if that job has not run yet.
 CREATE TABLE messages (
-    id                 UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id                 UUID         NOT NULL DEFAULT gen_random_uuid(),
     conversation_id    UUID         NOT NULL REFERENCES conversations (id) ON DELETE CASCADE,
     role               message_role NOT NULL,
     content            TEXT         NOT NULL,
     channel_message_id VARCHAR(255),
-    created_at         TIMESTAMPTZ  NOT NULL DEFAULT now()
-);
+    created_at         TIMESTAMPTZ  NOT NULL DEFAULT now(),
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
 
-CREATE INDEX idx_messages_conversation_id ON messages (conversation_id);
-CREATE UNIQUE INDEX uq_messages_channel_message_id
+CREATE TABLE messages_default PARTITION OF messages DEFAULT;
+
+CREATE INDEX idx_messages_conversation_created ON messages (conversation_id, created_at);
+CREATE INDEX idx_messages_conversation_role    ON messages (conversation_id, role);
+-- Not unique: a unique index on a partitioned table must include created_at.
+-- Redelivered webhooks are rejected by processed_channel_messages instead.
+CREATE INDEX idx_messages_channel_message_id
     ON messages (channel_message_id)
     WHERE channel_message_id IS NOT NULL;
 
+-- Dedup gate for inbound webhooks (INSERT ... ON CONFLICT DO NOTHING);
+-- ids older than WhatsApp's 7-day redelivery window are pruned.
+CREATE TABLE processed_channel_messages (
+    channel_message_id VARCHAR(255) PRIMARY KEY,
+    created_at         TIMESTAMPTZ  NOT NULL DEFAULT now()
+);
+
+CREATE INDEX idx_processed_channel_messages_created_at ON processed_channel_messages (created_at);
+
+
+CREATE TABLE turn_traces (
+    id              UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    conversation_id UUID        NOT NULL REFERENCES conversations (id) ON DELETE CASCADE,
+    message_id      UUID,
+    total_ms        INTEGER     NOT NULL,
+    query_count     INTEGER     NOT NULL,
+    spans           JSONB       NOT NULL,
+    created_at      TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX idx_turn_traces_conversation_id ON turn_traces (conversation_id, created_at);
+
 
 -- ── Agent Domain ────────────────────────────────────────────────────────
 
@@ -300,6 +349,11 @@ CREATE TABLE agents (
     system_prompt TEXT         NOT NULL,
     model         VARCHAR(127) NOT NULL,
     tools_enabled JSONB        NOT NULL DEFAULT '{}',
+    model_policy  JSONB,
+    fallback_models JSONB      NOT NULL DEFAULT '[]',
+    max_tool_rounds INTEGER,
+    response_cache_enabled BOOLEAN NOT NULL DEFAULT false,
+    template_replies_enabled BOOLEAN NOT NULL DEFAULT false,
     status        agent_status NOT NULL DEFAULT 'active',
     created_at    TIMESTAMPTZ  NOT NULL DEFAULT now(),
     updated_at    TIMESTAMPTZ  NOT NULL DEFAULT now()
@@ -340,22 +394,118 @@ CREATE TABLE knowledge_entries (
 CREATE INDEX idx_knowledge_entries_agent_id ON knowledge_entries (agent_id);
 
 
+CREATE TABLE knowledge_indexes (
+    agent_id   UUID PRIMARY KEY REFERENCES agents (id) ON DELETE CASCADE,
+    data       JSONB       NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+
+-- Partitioned by month like messages
 CREATE TABLE tool_executions (
-    id              UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id              UUID                  NOT NULL DEFAULT gen_random_uuid(),
     conversation_id UUID                  NOT NULL REFERENCES conversations (id) ON DELETE CASCADE,
-    message_id      UUID                  REFERENCES messages (id) ON DELETE SET NULL,
+    message_id      UUID,
     tool            VARCHAR(63)           NOT NULL,
     input           JSONB                 NOT NULL,
     output          JSONB                 NOT NULL,
     status          tool_execution_status NOT NULL,
     duration_ms     INTEGER,
-    created_at      TIMESTAMPTZ           NOT NULL DEFAULT now()
-);
+    created_at      TIMESTAMPTZ           NOT NULL DEFAULT now(),
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE tool_executions_default PARTITION OF tool_executions DEFAULT;
 
 CREATE INDEX idx_tool_executions_conversation_id ON tool_executions (conversation_id);
 CREATE INDEX idx_tool_executions_message_id      ON tool_executions (message_id);
 
 
+CREATE TABLE llm_calls (
+    id                UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    conversation_id   UUID         NOT NULL REFERENCES conversations (id) ON DELETE CASCADE,
+    branch_id         UUID         NOT NULL REFERENCES branches (id) ON DELETE CASCADE,
+    company_id        UUID         NOT NULL REFERENCES companies (id) ON DELETE CASCADE,
+    round             INTEGER      NOT NULL,
+    model             VARCHAR(127) NOT NULL,
+    reason            VARCHAR(31)  NOT NULL,
+    latency_ms        INTEGER      NOT NULL,
+    prompt_tokens     INTEGER,
+    completion_tokens INTEGER,
+    cached_tokens     INTEGER,
+    cost              NUMERIC(12, 6),
+    created_at        TIMESTAMPTZ  NOT NULL DEFAULT now()
+);
+
+CREATE INDEX idx_llm_calls_conversation_id    ON llm_calls (conversation_id);
+CREATE INDEX idx_llm_calls_branch_id_created  ON llm_calls (branch_id, created_at);
+
+
+CREATE TABLE llm_usage_daily (
+    day               DATE           NOT NULL,
+    branch_id         UUID           NOT NULL REFERENCES branches (id) ON DELETE CASCADE,
+    model             VARCHAR(127)   NOT NULL,
+    company_id        UUID           NOT NULL REFERENCES companies (id) ON DELETE CASCADE,
+    calls             INTEGER        NOT NULL DEFAULT 0,
+    prompt_tokens     INTEGER        NOT NULL DEFAULT 0,
+    completion_tokens INTEGER        NOT NULL DEFAULT 0,
+    cached_tokens     INTEGER        NOT NULL DEFAULT 0,
+    cost              NUMERIC(12, 6) NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, branch_id, model)
+);
+
+CREATE INDEX idx_llm_usage_daily_company_day ON llm_usage_daily (company_id, day);
+
+
+-- ── Analytics rollups ───────────────────────────────────────────────────
+
+CREATE TABLE analytics_daily (
+    company_id                      UUID           NOT NULL REFERENCES companies (id) ON DELETE CASCADE,
+    day                             DATE           NOT NULL,
+    branch_id                       UUID           NOT NULL REFERENCES branches (id) ON DELETE CASCADE,
+    bookings_agent                  INTEGER        NOT NULL DEFAULT 0,
+    bookings_member                 INTEGER        NOT NULL DEFAULT 0,
+    revenue_agent                   NUMERIC(12, 2) NOT NULL DEFAULT 0,
+    revenue_member                  NUMERIC(12, 2) NOT NULL DEFAULT 0,
+    conversations                   INTEGER        NOT NULL DEFAULT 0,
+    conversations_active            INTEGER        NOT NULL DEFAULT 0,
+    conversations_escalated         INTEGER        NOT NULL DEFAULT 0,
+    conversations_resolved_by_ai    INTEGER        NOT NULL DEFAULT 0,
+    conversations_resolved_by_human INTEGER        NOT NULL DEFAULT 0,
+    conversations_with_bookings     INTEGER        NOT NULL DEFAULT 0,
+    messages_customer               INTEGER        NOT NULL DEFAULT 0,
+    messages_agent                  INTEGER        NOT NULL DEFAULT 0,
+    messages_member                 INTEGER        NOT NULL DEFAULT 0,
+    PRIMARY KEY (company_id, day, branch_id)
+);
+
+CREATE TABLE conversation_funnels (
+    conversation_id UUID        PRIMARY KEY REFERENCES conversations (id) ON DELETE CASCADE,
+    company_id      UUID        NOT NULL REFERENCES companies (id) ON DELETE CASCADE,
+    branch_id       UUID        NOT NULL REFERENCES branches (id) ON DELETE CASCADE,
+    day             DATE        NOT NULL,
+    first_reply_ms  INTEGER,
+    escalation_ms   INTEGER,
+    booking_ms      INTEGER,
+    agent_reply_ms  INTEGER[]   NOT NULL DEFAULT '{}',
+    tool_ms         INTEGER[]   NOT NULL DEFAULT '{}',
+    updated_at      TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX idx_conversation_funnels_company_day ON conversation_funnels (company_id, day);
+
+CREATE TABLE analytics_rollup_state (
+    name      VARCHAR(63) PRIMARY KEY,
+    watermark TIMESTAMPTZ
+);
+
+-- Change detection for the rollup sweep
+CREATE INDEX idx_bookings_updated_at      ON bookings (updated_at);
+CREATE INDEX idx_conversations_updated_at ON conversations (updated_at);
+CREATE INDEX idx_messages_created_at      ON messages (created_at);
+CREATE INDEX idx_tool_executions_created  ON tool_executions (created_at);
+
+
 -- ── Cross-domain FK (bookings → conversations) ─────────────────────────
 
 ALTER TABLE bookings
@@ -368,16 +518,25 @@ ALTER TABLE bookings
 -- (leaf tables first, root tables last)
 -- ==========================================================================
 
+DROP TABLE IF EXISTS "analytics_rollup_state" CASCADE;
+DROP TABLE IF EXISTS "conversation_funnels" CASCADE;
+DROP TABLE IF EXISTS "analytics_daily" CASCADE;
+DROP TABLE IF EXISTS "llm_usage_daily" CASCADE;
+DROP TABLE IF EXISTS "llm_calls" CASCADE;
 DROP TABLE IF EXISTS "tool_executions" CASCADE;
+DROP TABLE IF EXISTS "knowledge_indexes" CASCADE;
 DROP TABLE IF EXISTS "knowledge_entries" CASCADE;
 DROP TABLE IF EXISTS "reply_templates" CASCADE;
 DROP TABLE IF EXISTS "agents" CASCADE;
+DROP TABLE IF EXISTS "processed_channel_messages" CASCADE;
+DROP TABLE IF EXISTS "turn_traces" CASCADE;
 DROP TABLE IF EXISTS "messages" CASCADE;
 DROP TABLE IF EXISTS "conversations" CASCADE;
 DROP TABLE IF EXISTS "contacts" CASCADE;
 DROP TABLE IF EXISTS "whatsapp_accounts" CASCADE;
 DROP TABLE IF EXISTS "whatsapp_config" CASCADE;
 DROP TABLE IF EXISTS "invites" CASCADE;
+DROP TABLE IF EXISTS "customer_profiles" CASCADE;
 DROP TABLE IF EXISTS "bookings" CASCADE;
 DROP TABLE IF EXISTS "availability_overrides" CASCADE;
 DROP TABLE IF EXISTS "staff_availabilities" CASCADE;
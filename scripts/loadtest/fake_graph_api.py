@@ -0,0 +1,78 @@
+"""Local stand-in for graph.facebook.com (WhatsApp Cloud API) for load tests.
+
+Point the API at it with WHATSAPP_GRAPH_API_BASE=http://localhost:8090 and run:
+
+    python scripts/loadtest/fake_graph_api.py --latency-ms 120 --error-rate 0.01
+
+Outbound messages and read receipts are counted, not delivered; GET /stats
+returns the counts (the replay script reads them for its report).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import uuid
+from collections import Counter
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+app = FastAPI(title="fake-graph-api")
+settings = argparse.Namespace()
+counts: Counter[str] = Counter()
+
+
+@app.post("/{version}/{phone_number_id}/messages")
+async def post_message(phone_number_id: str, request: Request):
+    body = await request.json()
+    kind = "read" if body.get("status") == "read" else "send"
+
+    await asyncio.sleep(max(0.0, random.gauss(settings.latency_ms, settings.jitter_ms)) / 1000)
+    if random.random() < settings.error_rate:
+        counts[f"{kind}_error"] += 1
+        return JSONResponse(
+            {"error": {"message": "Service temporarily unavailable", "type": "OAuthException", "code": 2}},
+            status_code=503,
+        )
+
+    counts[kind] += 1
+    if kind == "read":
+        return {"success": True}
+    return {
+        "messaging_product": "whatsapp",
+        "contacts": [{"input": body.get("to"), "wa_id": body.get("to")}],
+        "messages": [{"id": f"wamid.{uuid.uuid4().hex}"}],
+    }
+
+
+@app.api_route("/{version}/{waba_id}/subscribed_apps", methods=["GET", "POST", "DELETE"])
+async def subscribed_apps(waba_id: str):
+    return {"success": True, "data": []}
+
+
+@app.get("/stats")
+async def stats() -> dict:
+    return dict(counts)
+
+
+@app.delete("/stats", status_code=204)
+async def reset_stats() -> None:
+    counts.clear()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency-ms", type=float, default=100, help="mean response latency")
+    parser.add_argument("--jitter-ms", type=float, default=30, help="latency standard deviation")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that return 503")
+    parser.parse_args(namespace=settings)
+    uvicorn.run(app, host=settings.host, port=settings.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""Local OpenAI-compatible chat completions server for load tests and resilience checks.
+
+Point the API at it with OPENROUTER_BASE_URL=http://localhost:8089/v1 and run:
+
+    python scripts/loadtest/fake_llm_server.py --latency-ms 400 --slow-rate 0.05 --slow-ms 8000 --error-rate 0.05
+
+Requests for a model listed in --broken-models always fail with a 503, which is
+useful for checking per-agent fallback models.
+
+With --script the server plays scripted conversations instead of echoing: the
+first rule whose "match" regex matches the latest customer message is used, and
+its steps are returned one per LLM round (tool-call rounds since that message).
+A step is either {"tool_calls": [{"name": ..., "arguments": {...}}]} or
+{"content": "..."}. String arguments may use {today}, {tomorrow}, {date+N} and
+any --var NAME=VALUE (e.g. --var service_id=<uuid> for {service_id}).
+See scripts/loadtest/llm_script.json. Streaming requests (stream=true) get SSE chunks.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+import json
+import random
+import re
+import time
+import uuid
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+app = FastAPI(title="fake-llm")
+settings = argparse.Namespace()
+rules: list[dict] = []
+
+_DATE_PLACEHOLDER = re.compile(r"\{(today|tomorrow|date\+(\d+))\}")
+_STREAM_CHUNK_CHARS = 16
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    model = body.get("model", "fake")
+    messages = body.get("messages", [])
+
+    delay_ms = max(0.0, random.gauss(settings.latency_ms, settings.jitter_ms))
+    if random.random() < settings.slow_rate:
+        delay_ms = settings.slow_ms
+    await asyncio.sleep(delay_ms / 1000)
+
+    if model in settings.broken_models or random.random() < settings.error_rate:
+        return JSONResponse({"error": {"message": "upstream unavailable", "type": "server_error"}}, status_code=503)
+
+    message = _scripted_message(messages) or _echo_message(model, messages)
+    prompt_tokens = sum(len(str(m.get("content") or "")) for m in messages) // 4
+    completion_tokens = len(json.dumps(message)) // 4
+    usage = {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+    finish_reason = "tool_calls" if message.get("tool_calls") else "stop"
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+
+    if body.get("stream"):
+        include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+        return StreamingResponse(
+            _stream(completion_id, model, message, finish_reason, usage if include_usage else None),
+            media_type="text/event-stream",
+        )
+
+    return {
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+        "usage": usage,
+    }
+
+
+def _echo_message(model: str, messages: list[dict]) -> dict:
+    return {"role": "assistant", "content": f"[{model}] You said: {_last_user_text(messages)[:200]}"}
+
+
+def _scripted_message(messages: list[dict]) -> dict | None:
+    if not rules:
+        return None
+    text = _last_user_text(messages)
+    rule = next((r for r in rules if re.search(r["match"], text, re.IGNORECASE)), None)
+    if rule is None:
+        return None
+
+    steps = rule["steps"]
+    step = steps[min(_rounds_since_user(messages), len(steps) - 1)]
+    if "tool_calls" not in step:
+        return {"role": "assistant", "content": step["content"]}
+    return {
+        "role": "assistant",
+        "content": None,
+        "tool_calls": [
+            {
+                "id": f"call_{uuid.uuid4().hex[:24]}",
+                "type": "function",
+                "function": {"name": call["name"], "arguments": json.dumps(_fill(call.get("arguments", {})))},
+            }
+            for call in step["tool_calls"]
+        ],
+    }
+
+
+def _last_user_text(messages: list[dict]) -> str:
+    return next((m.get("content") or "" for m in reversed(messages) if m.get("role") == "user"), "")
+
+
+def _rounds_since_user(messages: list[dict]) -> int:
+    rounds = 0
+    for m in reversed(messages):
+        if m.get("role") == "user":
+            break
+        if m.get("role") == "assistant" and m.get("tool_calls"):
+            rounds += 1
+    return rounds
+
+
+def _fill(value):
+    if isinstance(value, dict):
+        return {k: _fill(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_fill(v) for v in value]
+    if not isinstance(value, str):
+        return value
+    for name, replacement in settings.vars.items():
+        value = value.replace(f"{{{name}}}", replacement)
+
+    def replace(match: re.Match) -> str:
+        offset = {"today": 0, "tomorrow": 1}.get(match.group(1))
+        if offset is None:
+            offset = int(match.group(2))
+        return (datetime.date.today() + datetime.timedelta(days=offset)).isoformat()
+
+    return _DATE_PLACEHOLDER.sub(replace, value)
+
+
+async def _stream(completion_id: str, model: str, message: dict, finish_reason: str, usage: dict | None):
+    def chunk(delta: dict, finish: str | None = None, **extra) -> str:
+        payload = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+            **extra,
+        }
+        return f"data: {json.dumps(payload)}\n\n"
+
+    yield chunk({"role": "assistant", "content": ""})
+    if message.get("tool_calls"):
+        for index, call in enumerate(message["tool_calls"]):
+            yield chunk({"tool_calls": [{"index": index, **call}]})
+    else:
+        content = message["content"]
+        for start in range(0, len(content), _STREAM_CHUNK_CHARS):
+            await asyncio.sleep(settings.chunk_ms / 1000)
+            yield chunk({"content": content[start:start + _STREAM_CHUNK_CHARS]})
+    yield chunk({}, finish_reason)
+    if usage is not None:
+        payload = {"id": completion_id, "object": "chat.completion.chunk", "model": model, "choices": [], "usage": usage}
+        yield f"data: {json.dumps(payload)}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=300, help="mean response latency")
+    parser.add_argument("--jitter-ms", type=float, default=100, help="latency standard deviation")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="fraction of requests that stall")
+    parser.add_argument("--slow-ms", type=float, default=10000, help="latency of stalled requests")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that return 503")
+    parser.add_argument("--broken-models", nargs="*", default=[], help="models that always fail")
+    parser.add_argument("--script", help="JSON file of scripted conversation rules")
+    parser.add_argument("--var", action="append", default=[], metavar="NAME=VALUE", help="script placeholder value")
+    parser.add_argument("--chunk-ms", type=float, default=20, help="delay between streamed content chunks")
+    parser.parse_args(namespace=settings)
+    settings.vars = dict(item.split("=", 1) for item in settings.var)
+    if settings.script:
+        with open(settings.script, encoding="utf-8") as f:
+            rules.extend(json.load(f))
+    uvicorn.run(app, host=settings.host, port=settings.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
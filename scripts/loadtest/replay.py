@@ -0,0 +1,228 @@
+"""Replay recorded WhatsApp webhooks against a running API and report how the pipeline holds up.
+
+The API runs for real (own Postgres) with the LLM and Graph API replaced by the
+local fakes in this directory:
+
+    python scripts/loadtest/fake_llm_server.py --script scripts/loadtest/llm_script.json --var service_id=<uuid>
+    python scripts/loadtest/fake_graph_api.py
+    OPENROUTER_BASE_URL=http://127.0.0.1:8089/v1 WHATSAPP_GRAPH_API_BASE=http://127.0.0.1:8090 \\
+        uvicorn app.main:app --port 8000
+    python scripts/loadtest/replay.py --phone-number-id <id of a connected account> --rate 20 --duration 60
+
+Payloads are webhook bodies, one per line; record real traffic with
+WEBHOOK_RECORD_PATH or start from payloads/sample_webhooks.jsonl. Every replayed
+message gets a fresh message id (the pipeline drops duplicates) and, with
+--customers, one of N synthetic sender numbers so conversations spread out.
+
+Requests are sent open-loop at --rate, independent of how fast the API answers,
+so queueing shows up as latency rather than as a lower send rate. The webhook
+runs the pipeline inline, so its response time is the turn latency.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import copy
+import json
+import math
+import time
+import uuid
+
+import httpx
+
+_PHONE_PLACEHOLDER = "LOADTEST_PHONE_NUMBER_ID"
+_POOL_SAMPLE_SECONDS = 0.5
+
+
+def load_payloads(path: str) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def prepare(payload: dict, seq: int, args: argparse.Namespace) -> dict:
+    """Copy a recorded payload with a unique message id and optionally a new sender/account."""
+    body = copy.deepcopy(payload)
+    sender = f"1555{seq % args.customers:07d}" if args.customers else None
+    for entry in body.get("entry", []):
+        for change in entry.get("changes", []):
+            value = change.get("value", {})
+            metadata = value.get("metadata", {})
+            if args.phone_number_id and (args.force_account or metadata.get("phone_number_id") == _PHONE_PLACEHOLDER):
+                metadata["phone_number_id"] = args.phone_number_id
+            for msg in value.get("messages", []):
+                msg["id"] = f"wamid.replay.{uuid.uuid4().hex}"
+                if sender:
+                    msg["from"] = sender
+            if sender:
+                for contact in value.get("contacts", []):
+                    contact["wa_id"] = sender
+    return body
+
+
+def percentile(ordered: list[float], pct: float) -> float | None:
+    if not ordered:
+        return None
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class Run:
+    def __init__(self) -> None:
+        self.latencies_ms: list[float] = []
+        self.statuses: dict[str, int] = {}
+        self.pool_samples: list[dict] = []
+
+    def record(self, outcome: str, latency_ms: float | None = None) -> None:
+        self.statuses[outcome] = self.statuses.get(outcome, 0) + 1
+        if latency_ms is not None:
+            self.latencies_ms.append(latency_ms)
+
+
+async def send(client: httpx.AsyncClient, body: dict, run: Run, in_flight: asyncio.Semaphore) -> None:
+    async with in_flight:
+        start = time.monotonic()
+        try:
+            resp = await client.post("/webhook", json=body)
+        except httpx.HTTPError as exc:
+            run.record(type(exc).__name__)
+            return
+        run.record(str(resp.status_code), (time.monotonic() - start) * 1000)
+
+
+async def sample_pool(client: httpx.AsyncClient, run: Run, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        try:
+            resp = await client.get("/api/v1/admin/metrics")
+            if resp.status_code == 200:
+                run.pool_samples.append(resp.json().get("db_pool", {}))
+        except httpx.HTTPError:
+            pass
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=_POOL_SAMPLE_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def main(args: argparse.Namespace) -> None:
+    payloads = load_payloads(args.payloads)
+    total = args.count or int(args.rate * args.duration)
+    admin_headers = {"Authorization": f"Bearer {args.admin_key}"}
+
+    async with (
+        httpx.AsyncClient(base_url=args.api, timeout=args.timeout) as client,
+        httpx.AsyncClient(base_url=args.api, headers=admin_headers, timeout=5) as admin,
+        httpx.AsyncClient(base_url=args.graph, timeout=5) as graph,
+    ):
+        await admin.delete("/api/v1/admin/metrics")
+        await _ignore_errors(graph.delete("/stats"))
+
+        run = Run()
+        stop_sampling = asyncio.Event()
+        sampler = asyncio.create_task(sample_pool(admin, run, stop_sampling))
+        in_flight = asyncio.Semaphore(args.max_in_flight)
+
+        started = time.monotonic()
+        tasks = []
+        for seq in range(total):
+            delay = started + seq / args.rate - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            body = prepare(payloads[seq % len(payloads)], seq, args)
+            tasks.append(asyncio.create_task(send(client, body, run, in_flight)))
+        send_seconds = time.monotonic() - started
+        await asyncio.gather(*tasks)
+        elapsed = time.monotonic() - started
+
+        stop_sampling.set()
+        await sampler
+        app_metrics = (await admin.get("/api/v1/admin/metrics")).json()
+        graph_stats = await _ignore_errors(graph.get("/stats"))
+
+    report = build_report(run, total, send_seconds, elapsed, app_metrics, graph_stats.json() if graph_stats else {})
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+def build_report(run: Run, total: int, send_seconds: float, elapsed: float, app_metrics: dict, graph_stats: dict) -> dict:
+    ordered = sorted(run.latencies_ms)
+    ok = run.statuses.get("200", 0)
+    counters = app_metrics.get("counters", {})
+    turns = app_metrics.get("timings", {}).get("pipeline.turn_ms", {})
+    # overflow() counts from -size, so size + overflow is the number of open connections
+    open_connections = [s.get("size", 0) + s.get("overflow", 0) for s in run.pool_samples if s]
+    checked_out = [s.get("checked_out", 0) for s in run.pool_samples if s]
+    pipeline_errors = counters.get("pipeline.failed", 0) + counters.get("pipeline.agent_failed", 0)
+
+    return {
+        "requests": total,
+        "offered_rate": round(total / send_seconds, 2) if send_seconds else None,
+        "throughput": round(ok / elapsed, 2) if elapsed else None,
+        "elapsed_s": round(elapsed, 1),
+        "http_statuses": run.statuses,
+        "http_error_rate": round(1 - ok / total, 4) if total else 0.0,
+        "latency_ms": {
+            f"p{pct}": round(value, 1) if (value := percentile(ordered, pct)) is not None else None
+            for pct in (50, 90, 95, 99)
+        } | {"max": round(ordered[-1], 1) if ordered else None},
+        "pipeline": {
+            "turn_ms": turns,
+            "agent_turns": counters.get("pipeline.agent_turns", 0),
+            "intent_bypass": counters.get("pipeline.intent_bypass", 0),
+            "errors": pipeline_errors,
+            "error_rate": round(pipeline_errors / total, 4) if total else 0.0,
+        },
+        "db_pool": {
+            "peak_checked_out": max(checked_out, default=None),
+            "mean_checked_out": round(sum(checked_out) / len(checked_out), 1) if checked_out else None,
+            "peak_open": max(open_connections, default=None),
+            "samples": len(checked_out),
+        },
+        "graph_api": graph_stats,
+    }
+
+
+def print_report(report: dict) -> None:
+    latency = report["latency_ms"]
+    pipeline = report["pipeline"]
+    pool = report["db_pool"]
+    print(f"requests        {report['requests']} in {report['elapsed_s']}s "
+          f"(offered {report['offered_rate']}/s, completed {report['throughput']}/s)")
+    print(f"http statuses   {report['http_statuses']} error rate {report['http_error_rate']:.2%}")
+    print(f"latency ms      p50 {latency['p50']}  p90 {latency['p90']}  p95 {latency['p95']}  "
+          f"p99 {latency['p99']}  max {latency['max']}")
+    print(f"pipeline        turn_ms {pipeline['turn_ms']} agent turns {pipeline['agent_turns']} "
+          f"intent bypass {pipeline['intent_bypass']} errors {pipeline['errors']} ({pipeline['error_rate']:.2%})")
+    print(f"db pool         peak {pool['peak_checked_out']} checked out of {pool['peak_open']} open, "
+          f"mean {pool['mean_checked_out']} ({pool['samples']} samples)")
+    print(f"graph api       {report['graph_api']}")
+
+
+async def _ignore_errors(request):
+    try:
+        return await request
+    except httpx.HTTPError:
+        return None
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--api", default="http://127.0.0.1:8000")
+    parser.add_argument("--graph", default="http://127.0.0.1:8090", help="fake Graph API, for delivery counts")
+    parser.add_argument("--admin-key", default="super-secret-admin-key")
+    parser.add_argument("--payloads", default="scripts/loadtest/payloads/sample_webhooks.jsonl")
+    parser.add_argument("--phone-number-id", help="replaces the placeholder phone_number_id in payloads")
+    parser.add_argument("--force-account", action="store_true", help="replace recorded phone_number_ids too")
+    parser.add_argument("--customers", type=int, default=50, help="number of synthetic senders (0 keeps recorded)")
+    parser.add_argument("--rate", type=float, default=10, help="requests per second")
+    parser.add_argument("--duration", type=float, default=30, help="seconds to send for")
+    parser.add_argument("--count", type=int, help="total requests (overrides --duration)")
+    parser.add_argument("--max-in-flight", type=int, default=1000)
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,47 @@
+import unittest
+import uuid
+from types import SimpleNamespace
+
+from app.domains.agent.services.agent_runner import _is_personalised
+from app.domains.agent.services.response_cache import ResponseCache
+
+
+def _ctx(customer_name=None, is_returning=False):
+    history = SimpleNamespace(is_returning=is_returning)
+    # An opening message: the loader marks every conversation without an agent reply as new
+    return SimpleNamespace(customer_name=customer_name, customer_history=history, is_new_conversation=True)
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = ResponseCache(threshold=0.8, ttl_seconds=3600, max_entries_per_agent=10, min_tokens=3)
+        self.agent_id, self.branch_id, self.company_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+    def _lookup(self, question, standalone=True):
+        return self.cache.lookup(self.agent_id, self.branch_id, self.company_id, question, [], standalone)
+
+    def _store(self, question, answer, standalone=True):
+        self.cache.store(self.agent_id, self.branch_id, self.company_id, question, answer, standalone)
+
+    def test_standalone_faq_answer_is_served_to_the_next_conversation(self):
+        question = "Is there parking near the salon?"
+        answer = "Hi! Yes, there is free parking behind the building."
+        self.assertFalse(_is_personalised(_ctx(customer_name="Dana"), answer))
+        self._store(question, answer)
+
+        self.assertEqual(self._lookup("is there parking near the salon"), answer)
+
+    def test_follow_up_is_neither_stored_nor_served(self):
+        self._store("Is there parking near the salon?", "Yes, behind the building.", standalone=False)
+        self.assertIsNone(self._lookup("Is there parking near the salon?"))
+
+        self._store("Is there parking near the salon?", "Yes, behind the building.")
+        self.assertIsNone(self._lookup("Is there parking near the salon?", standalone=False))
+
+    def test_personalised_replies_are_detected(self):
+        self.assertTrue(_is_personalised(_ctx(customer_name="Dana"), "Hi Dana, yes there is parking."))
+        self.assertTrue(_is_personalised(_ctx(is_returning=True), "Welcome back! Yes, there is parking."))
+
+
+if __name__ == "__main__":
+    unittest.main()